@@ -52,8 +52,13 @@ q = snapshots["q"]
 # Here we use list comprehension to iterate through the snapshots in the dataset
 # and generate structure functions for each snapshot. [0] ensures that we are selecting
 # the top layer in this dataset since u and v have shape [2, 128, 128].
+# prefetch_snapshots reads the next snapshots from the file on a background thread
+# while the structure functions of the current snapshot are calculated.
 sfs_list = [
-    fluidsf.generate_structure_functions_2d(u[d][0], v[d][0], x, y) for d in u.keys()
+    fluidsf.generate_structure_functions_2d(u_snapshot, v_snapshot, x, y)
+    for u_snapshot, v_snapshot in fluidsf.prefetch_snapshots(
+        u.keys(), read=lambda d: (u[d][0], v[d][0])
+    )
 ]
 
 
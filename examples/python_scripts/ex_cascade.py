@@ -20,9 +20,7 @@ import warnings
 import fluidsf
 import h5py
 import matplotlib.pyplot as plt
-import numpy as np
 import pooch
-from scipy.stats import bootstrap
 
 # Ignore warnings for the purpose of this tutorial
 warnings.filterwarnings("ignore")
@@ -82,39 +80,28 @@ sfs_list = [
 ]
 
 # Bootstrap structure functions
-# We are using scipy's bootstrapping method here, though other methods of estimating
-# error and variability are possible. We will use a confidence level of 90%.
-
-# Reformat single sfs_list for ease of boostrapping
-sf_ASF_x = []
-sf_ASF_y = []
-sf_LLL_x = []
-sf_LLL_y = []
-
-for sf in sfs_list:
-    sf_ASF_x.append(sf["SF_advection_velocity_x"])
-    sf_ASF_y.append(sf["SF_advection_velocity_y"])
-    sf_LLL_x.append(sf["SF_LLL_x"])
-    sf_LLL_y.append(sf["SF_LLL_y"])
-
-# Bootstrap the structure functions with 90% confidence levels
-boot_ASF_x = bootstrap((sf_ASF_x,), np.mean, confidence_level=0.5, axis=0)
-boot_ASF_y = bootstrap((sf_ASF_y,), np.mean, confidence_level=0.5, axis=0)
-boot_LLL_x = bootstrap((sf_LLL_x,), np.mean, confidence_level=0.5, axis=0)
-boot_LLL_y = bootstrap((sf_LLL_y,), np.mean, confidence_level=0.5, axis=0)
-
-# Generate the confidence intervals for structure functions, still at 90%
-boot_ASF_x_conf = boot_ASF_x.confidence_interval
-boot_ASF_y_conf = boot_ASF_y.confidence_interval
-boot_LLL_x_conf = boot_LLL_x.confidence_interval
-boot_LLL_y_conf = boot_LLL_y.confidence_interval
-
-# Compute the mean -- this can also be accomplished with a Python mean function
-# and will return the same result
-boot_ASF_x_mean = boot_ASF_x.bootstrap_distribution.mean(axis=1)
-boot_ASF_y_mean = boot_ASF_y.bootstrap_distribution.mean(axis=1)
-boot_LLL_x_mean = boot_LLL_x.bootstrap_distribution.mean(axis=1)
-boot_LLL_y_mean = boot_LLL_y.bootstrap_distribution.mean(axis=1)
+# We are using fluidsf's bootstrapping method here, which resamples all structure
+# functions of all snapshots at once, though other methods of estimating error and
+# variability are possible. We will use a confidence level of 50%.
+boot = fluidsf.bootstrap_structure_functions(sfs_list, confidence_level=0.5)
+
+# Collect the confidence intervals of the structure functions
+boot_ASF_x_conf = (
+    boot["SF_advection_velocity_x_ci_low"],
+    boot["SF_advection_velocity_x_ci_high"],
+)
+boot_ASF_y_conf = (
+    boot["SF_advection_velocity_y_ci_low"],
+    boot["SF_advection_velocity_y_ci_high"],
+)
+boot_LLL_x_conf = (boot["SF_LLL_x_ci_low"], boot["SF_LLL_x_ci_high"])
+boot_LLL_y_conf = (boot["SF_LLL_y_ci_low"], boot["SF_LLL_y_ci_high"])
+
+# The mean over snapshots of each structure function
+boot_ASF_x_mean = boot["SF_advection_velocity_x"]
+boot_ASF_y_mean = boot["SF_advection_velocity_y"]
+boot_LLL_x_mean = boot["SF_LLL_x"]
+boot_LLL_y_mean = boot["SF_LLL_y"]
 
 # Estimate cascade rates
 # Different types of structure functions have different relationships to properties of
@@ -4,18 +4,56 @@ This package calculates structure functions from ocean velocity data.
 """
 
 from .bin_data import bin_data
+from .bin_sf_maps_polar import bin_sf_maps_polar
+from .bootstrap_structure_functions import bootstrap_structure_functions
 from .calculate_advection_2d import calculate_advection_2d
 from .calculate_advection_3d import calculate_advection_3d
+from .calculate_decorrelation_length import calculate_decorrelation_length
 from .calculate_separation_distances import calculate_separation_distances
 from .calculate_separation_distances_3d import calculate_separation_distances_3d
 from .calculate_sf_maps_2d import calculate_sf_maps_2d
 from .calculate_structure_function_1d import calculate_structure_function_1d
+from .calculate_structure_function_1d_vectorized import (
+    calculate_structure_function_1d_vectorized,
+)
 from .calculate_structure_function_2d import calculate_structure_function_2d
 from .calculate_structure_function_3d import calculate_structure_function_3d
+from .calculate_structure_function_fft import calculate_structure_function_fft
+from .calculate_structure_function_moments import (
+    calculate_structure_function_moments,
+)
+from .calculate_structure_function_montecarlo import (
+    calculate_structure_function_montecarlo,
+)
+from .calculate_structure_function_nd import calculate_structure_function_nd
+from .calculate_tile_bootstrap import calculate_tile_bootstrap
+from .coarsen_array import coarsen_array
+from .destagger_array import destagger_array
+from .evaluate_sf_terms import evaluate_sf_terms
+from .expand_sf_terms import expand_sf_terms
+from .generate_cached import generate_cached
 from .generate_sf_maps_2d import generate_sf_maps_2d
+from .generate_sf_maps_3d import generate_sf_maps_3d
 from .generate_structure_functions_1d import generate_structure_functions_1d
+from .generate_structure_functions_1d_batch import (
+    generate_structure_functions_1d_batch,
+)
 from .generate_structure_functions_2d import generate_structure_functions_2d
 from .generate_structure_functions_3d import generate_structure_functions_3d
+from .generate_structure_functions_xarray import (
+    generate_structure_functions_xarray,
+)
+from .get_sf_terms import get_sf_terms
+from .hash_inputs import hash_inputs
+from .polar_bins import polar_bins
+from .prefetch_snapshots import prefetch_snapshots
+from .read_mds import read_mds
+from .select_coarsening_factors import select_coarsening_factors
+from .select_direction_lags import select_direction_lags
+from .select_separations import select_separations
+from .sf_checkpoint import SFCheckpoint
+from .sf_plan import SFPlan
+from .sf_result import SFResult
 from .shift_array_1d import shift_array_1d
 from .shift_array_2d import shift_array_2d
 from .shift_array_3d import shift_array_3d
@@ -24,21 +62,49 @@ from .shift_array_xy import shift_array_xy
 __version__ = "0.2.2"
 
 __all__ = (
-    "generate_sf_maps_2d",
-    "generate_structure_functions_1d",
-    "generate_structure_functions_2d",
-    "generate_structure_functions_3d",
-    "calculate_sf_maps_2d",
-    "calculate_structure_function_1d",
-    "calculate_structure_function_2d",
-    "calculate_structure_function_3d",
+    "SFCheckpoint",
+    "SFPlan",
+    "SFResult",
+    "bin_data",
+    "bin_sf_maps_polar",
+    "bootstrap_structure_functions",
     "calculate_advection_2d",
     "calculate_advection_3d",
+    "calculate_decorrelation_length",
     "calculate_separation_distances",
     "calculate_separation_distances_3d",
+    "calculate_sf_maps_2d",
+    "calculate_structure_function_1d",
+    "calculate_structure_function_1d_vectorized",
+    "calculate_structure_function_2d",
+    "calculate_structure_function_3d",
+    "calculate_structure_function_fft",
+    "calculate_structure_function_moments",
+    "calculate_structure_function_montecarlo",
+    "calculate_structure_function_nd",
+    "calculate_tile_bootstrap",
+    "coarsen_array",
+    "destagger_array",
+    "evaluate_sf_terms",
+    "expand_sf_terms",
+    "generate_cached",
+    "generate_sf_maps_2d",
+    "generate_sf_maps_3d",
+    "generate_structure_functions_1d",
+    "generate_structure_functions_1d_batch",
+    "generate_structure_functions_2d",
+    "generate_structure_functions_3d",
+    "generate_structure_functions_xarray",
+    "get_sf_terms",
+    "hash_inputs",
+    "polar_bins",
+    "prefetch_snapshots",
+    "read_mds",
+    "select_coarsening_factors",
+    "select_direction_lags",
+    "select_separations",
     "shift_array_1d",
     "shift_array_2d",
     "shift_array_3d",
     "shift_array_xy",
-    "bin_data",
 )
@@ -1,7 +1,7 @@
 import pandas as pd
 
 
-def bin_data(dd, sf, nbins):
+def bin_data(dd, sf, nbins, statistic="mean"):
     """
     Bins the data based on the separation distances and calculates the bin-averaged
     structure functions.
@@ -14,17 +14,24 @@ def bin_data(dd, sf, nbins):
         The structure functions that will be bin-averaged.
     nbins: int
         The number of bins to create.
+    statistic: str, optional
+        Either "mean" to average sf over each bin or "sum" to add it up over each
+        bin, e.g. for sample sizes. Separation distances are always averaged.
+        Defaults to "mean".
 
     Returns
     -------
     tuple:
         A tuple containing the binned separation distances and the bin-averaged
-        structure functions.
+        (or bin-summed) structure functions.
     """
+    if statistic not in ["mean", "sum"]:
+        raise ValueError("statistic must be 'mean' or 'sum'.")
+
     tmp = {"dd": dd, "sf": sf}
     df = pd.DataFrame(tmp)
-    means = df.groupby(pd.cut(df["dd"], nbins, duplicates="drop"), observed=True).mean()
-    dd = means["dd"].values
-    sf = means["sf"].values
+    groups = df.groupby(pd.cut(df["dd"], nbins, duplicates="drop"), observed=True)
+    dd = groups["dd"].mean().values
+    sf = groups["sf"].sum().values if statistic == "sum" else groups["sf"].mean().values
 
     return (dd, sf)
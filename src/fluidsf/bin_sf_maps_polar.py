@@ -0,0 +1,158 @@
+import numpy as np
+
+from .polar_bins import polar_bins
+
+
+def bin_sf_maps_polar(  # noqa: C901, D417
+    sf_maps, nbins=None, nangles=None, harmonics=None, bins=None
+):
+    """
+    Bin 2D maps of structure functions by separation distance, and optionally by
+    separation angle, to obtain isotropic structure functions, structure functions
+    in angular sectors and the anisotropic harmonics of the structure functions.
+    All structure functions of all maps are binned together with np.bincount, so
+    many maps of the same grid (e.g. one per snapshot) can be binned in one call,
+    and the bins of a grid can be calculated once with polar_bins and passed to
+    every call on that grid.
+
+    Parameters
+    ----------
+        sf_maps: dict or list
+            Dictionary of structure function maps as returned by generate_sf_maps_2d,
+            or a list of such dictionaries calculated on the same grid. The maps in
+            a dictionary can also be stacked along leading axes, e.g. one per
+            snapshot, as long as separation_distances and separation_angles are
+            the 2D arrays of a single map.
+        nbins: int or array_like, optional
+            Number of equal-width separation distance bins, or an array of bin
+            edges. Required unless bins is given. Defaults to None.
+        nangles: int, optional
+            Number of equal-width angular sectors covering half a turn, since the
+            separation vectors of the maps only cover half of the plane. Ignored
+            if bins is given. Defaults to None, i.e. structure functions are not
+            binned by angle.
+        harmonics: array_like, optional
+            Orders m of the angular harmonics to calculate, e.g. (2, 4). Only even
+            orders are defined for maps of half of the plane. Defaults to None,
+            i.e. harmonics are not calculated.
+        bins: dict, optional
+            Bins of the map grid as returned by polar_bins, used instead of nbins
+            and nangles. Defaults to None, i.e. the bins are calculated.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the binned structure functions. For each
+            structure function map, e.g. **SF_LL_xy**, the dictionary contains:
+
+                **SF_LL_iso**: The isotropic structure function, i.e. the mean over
+                each distance bin, with one value per bin along the last axis.
+
+                **SF_LL_sectors**: The mean over each distance bin and angular
+                sector, with the sectors along the last axis. Only returned if
+                nangles is given.
+
+                **SF_LL_harmonics**: The complex mean of the structure function
+                times exp(-i m theta) over each distance bin for each order m in
+                harmonics, with the orders along the last axis. Only returned if
+                harmonics is given.
+
+            The dictionary also contains the mean separation distance of each bin
+            under **separation_distances**, the number of map entries in each bin
+            under **bin_counts** and, if nangles is given, the central angle of
+            each sector under **separation_angles**. Map entries that are NaN, and
+            the zero separation, are not included in the bins.
+    """
+    if isinstance(sf_maps, list | tuple):
+        sf_maps = {
+            key: (
+                np.stack([sf_map[key] for sf_map in sf_maps])
+                if key.startswith("SF_")
+                else sf_maps[0][key]
+            )
+            for key in sf_maps[0]
+        }
+    if harmonics is not None and np.any(np.mod(harmonics, 2) != 0):
+        raise ValueError("Only even harmonics are defined for maps of half the plane.")
+
+    distances = np.asarray(sf_maps["separation_distances"], dtype=float)
+    angles = np.asarray(sf_maps["separation_angles"], dtype=float)
+    if bins is None:
+        if nbins is None:
+            raise ValueError("Either nbins or bins must be provided.")
+        bins = polar_bins(distances, angles, nbins, nangles)
+    elif bins["shape"] != distances.shape:
+        raise ValueError("bins were calculated for a map grid of a different shape.")
+    nangles = bins["nangles"]
+    n_bins = len(bins["edges"]) - 1
+    n_sectors = 1 if nangles is None else nangles
+    radial_index = bins["radial_index"]
+    angular_index = bins["angular_index"]
+    in_bin = radial_index >= 0
+    radial_index = radial_index[in_bin]
+    sector_index = radial_index * n_sectors + angular_index[in_bin]
+    flat_angles = angles.ravel()[in_bin]
+
+    def bin_sum(values, index, n):
+        # Sum over the entries of each bin for all leading axes at once
+        values = values.reshape(-1, values.shape[-1])
+        offsets = n * np.arange(values.shape[0])[:, None]
+        return np.bincount(
+            (index + offsets).ravel(), weights=values.ravel(), minlength=n * len(values)
+        ).reshape(len(values), n)
+
+    data = {}
+    for key, value in sf_maps.items():
+        if not key.startswith("SF_"):
+            continue
+        value = np.asarray(value, dtype=float)
+        batch_shape = value.shape[: value.ndim - distances.ndim]
+        value = value.reshape(*batch_shape, -1)[..., in_bin]
+        valid = ~np.isnan(value)
+        value = np.where(valid, value, 0.0)
+        name = key.removesuffix("_xy")
+
+        counts = bin_sum(valid.astype(float), radial_index, n_bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            data[name + "_iso"] = (
+                bin_sum(value, radial_index, n_bins) / counts
+            ).reshape(*batch_shape, n_bins)
+            if nangles is not None:
+                n = n_bins * n_sectors
+                data[name + "_sectors"] = (
+                    bin_sum(value, sector_index, n)
+                    / bin_sum(valid.astype(float), sector_index, n)
+                ).reshape(*batch_shape, n_bins, n_sectors)
+            if harmonics is not None:
+                data[name + "_harmonics"] = np.stack(
+                    [
+                        (
+                            bin_sum(
+                                value * np.cos(m * flat_angles), radial_index, n_bins
+                            )
+                            - 1j
+                            * bin_sum(
+                                value * np.sin(m * flat_angles), radial_index, n_bins
+                            )
+                        )
+                        / counts
+                        for m in harmonics
+                    ],
+                    axis=-1,
+                ).reshape(*batch_shape, n_bins, len(harmonics))
+
+    bin_counts = np.bincount(radial_index, minlength=n_bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        data["separation_distances"] = (
+            np.bincount(
+                radial_index, weights=distances.ravel()[in_bin], minlength=n_bins
+            )
+            / bin_counts
+        )
+    data["bin_counts"] = bin_counts
+    if nangles is not None:
+        data["separation_angles"] = (np.arange(nangles) + 0.5) * np.pi / nangles - (
+            np.pi / 2
+        )
+
+    return data
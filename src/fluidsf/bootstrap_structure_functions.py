@@ -0,0 +1,130 @@
+import concurrent.futures
+import warnings
+
+import numpy as np
+
+
+def bootstrap_structure_functions(  # noqa: D417
+    sfs,
+    n_resamples=9999,
+    confidence_level=0.9,
+    block_length=None,
+    seed=None,
+    workers=None,
+):
+    """
+    Bootstrap the mean structure functions of an ensemble of snapshots. Every
+    structure function of every snapshot is resampled with the same matrix of
+    resampled snapshot indices, so the means of all resamples of all structure
+    functions are calculated together as one weighted sum of the stacked
+    structure functions. Resamples can be drawn in blocks of consecutive snapshots
+    for autocorrelated time series (moving block bootstrap), and the weighted sums
+    can be split across threads.
+
+    Parameters
+    ----------
+        sfs: list or dict
+            List of dictionaries returned by one of the generate_structure_functions
+            modules, one per snapshot, or a dictionary of the structure functions of
+            all snapshots stacked along the first axis.
+        n_resamples: int, optional
+            Number of bootstrap resamples. Defaults to 9999.
+        confidence_level: float, optional
+            Confidence level of the percentile confidence intervals. Defaults to
+            0.9.
+        block_length: int, optional
+            Number of consecutive snapshots in each resampled block. Defaults to
+            None, i.e. snapshots are resampled independently.
+        seed: int, optional
+            Seed of the random number generator used to draw the resamples.
+            Defaults to None.
+        workers: int, optional
+            Number of threads used to calculate the resampled means. Defaults to
+            None, i.e. the resamples are calculated in the calling thread.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the mean over snapshots of each structure
+            function (keys starting with "SF_"), with the lower and upper bounds of
+            its confidence interval and the standard deviation of its bootstrap
+            distribution under its key with a "_ci_low", "_ci_high" and "_stderr"
+            suffix, e.g. **SF_LL_x_ci_low**. NaNs are ignored in the means. All
+            other entries, e.g. the separation distances, are taken from the first
+            snapshot.
+    """
+    if isinstance(sfs, list | tuple):
+        sfs = {
+            key: (
+                np.stack([sf[key] for sf in sfs])
+                if key.startswith("SF_")
+                else sfs[0][key]
+            )
+            for key in sfs[0]
+        }
+    sf_keys = [key for key in sfs if key.startswith("SF_")]
+    if len(sf_keys) == 0:
+        raise ValueError("No structure functions (keys starting with 'SF_') found.")
+    n_snapshots = len(sfs[sf_keys[0]])
+    if block_length is not None and not 1 <= block_length <= n_snapshots:
+        raise ValueError("block_length must be between 1 and the number of snapshots.")
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1.")
+
+    # Stack all structure functions of each snapshot into one row
+    stacked = [np.asarray(sfs[key], dtype=float) for key in sf_keys]
+    sizes = [int(np.prod(values.shape[1:])) for values in stacked]
+    values = np.concatenate(
+        [values.reshape(n_snapshots, -1) for values in stacked], axis=1
+    )
+    valid = ~np.isnan(values)
+    values = np.where(valid, values, 0.0)
+
+    # One matrix of resampled snapshot indices for all structure functions
+    rng = np.random.default_rng(seed)
+    if block_length is None:
+        indices = rng.integers(0, n_snapshots, (n_resamples, n_snapshots))
+    else:
+        n_blocks = -(-n_snapshots // block_length)
+        starts = rng.integers(
+            0, n_snapshots - block_length + 1, (n_resamples, n_blocks)
+        )
+        indices = (starts[:, :, None] + np.arange(block_length)).reshape(
+            n_resamples, -1
+        )[:, :n_snapshots]
+    weights = np.zeros((n_resamples, n_snapshots))
+    np.add.at(weights, (np.arange(n_resamples)[:, None], indices), 1)
+
+    def resample_means(chunk):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (weights[chunk] @ values) / (weights[chunk] @ valid)
+
+    chunks = np.array_split(np.arange(n_resamples), max(1, workers or 1))
+    if workers is None:
+        distribution = resample_means(chunks[0])
+    else:
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            distribution = np.concatenate(list(executor.map(resample_means, chunks)))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = values.sum(axis=0) / valid.sum(axis=0)
+    alpha = (1 - confidence_level) / 2
+    with warnings.catch_warnings():
+        # Structure functions that are NaN in every snapshot stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        quantile = np.nanquantile if np.isnan(distribution).any() else np.quantile
+        ci_low, ci_high = quantile(distribution, [alpha, 1 - alpha], axis=0)
+        stderr = np.nanstd(distribution, axis=0, ddof=1)
+
+    data = {key: value for key, value in sfs.items() if not key.startswith("SF_")}
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    for key, key_values, start, stop in zip(
+        sf_keys, stacked, offsets[:-1], offsets[1:], strict=True
+    ):
+        shape = key_values.shape[1:]
+        data[key] = means[start:stop].reshape(shape)
+        data[key + "_ci_low"] = ci_low[start:stop].reshape(shape)
+        data[key + "_ci_high"] = ci_high[start:stop].reshape(shape)
+        data[key + "_stderr"] = stderr[start:stop].reshape(shape)
+
+    return data
@@ -1,5 +1,7 @@
 import numpy as np
 
+from .destagger_array import destagger_array
+
 
 def calculate_advection_2d(  # noqa: D417
     u,
@@ -10,6 +12,9 @@ def calculate_advection_2d(  # noqa: D417
     dy=None,
     grid_type="uniform",
     scalar=None,
+    staggered=False,
+    axes=(1, 0),
+    periodic=False,
 ):
     """
     Calculate the advection for a velocity field or scalar field. The velocity field
@@ -36,6 +41,25 @@ def calculate_advection_2d(  # noqa: D417
             The type of grid. Defaults to "uniform".
         scalar: ndarray, optional
             Array of scalar values. Defaults to None.
+        staggered: bool, optional
+            Whether u and v are on an Arakawa C-grid, i.e. u on the x-faces and v
+            on the y-faces of the cells centered on x, y and scalar (see
+            destagger_array for the supported layouts). du/dx and dv/dy are then
+            differenced across the faces of each cell, and the other gradients
+            and the advection are calculated from u and v averaged to the cell
+            centers, without interpolating u and v beforehand. Defaults to False.
+        axes: tuple, optional
+            Axes of the x- and y-direction in u, v and scalar, e.g. (0, 1) for
+            arrays ordered (x, y) such as Fortran-ordered model output. The arrays
+            are not copied, and the advection has the same layout, with one point
+            per cell center along each axis (the shape of u unless u is
+            staggered). Defaults to (1, 0).
+        periodic: bool or tuple, optional
+            Whether the x- and y-directions are periodic, either a bool for both
+            or a tuple (periodic_x, periodic_y). Only used if staggered is True,
+            to wrap the face missing at the end of a periodic axis around instead
+            of extrapolating it (see destagger_array), like the generate_ modules
+            do for the boundary of the data. Defaults to False.
 
     Returns
     -------
@@ -43,12 +67,29 @@ def calculate_advection_2d(  # noqa: D417
             A tuple of advection components (x and y) if scalar is not provided,
             otherwise returns an ndarray of scalar advection.
     """
+    # Views with the axes ordered (y, x), so that arrays in other layouts are not
+    # copied
+    u = np.moveaxis(u, axes, (1, 0))
+    v = np.moveaxis(v, axes, (1, 0))
+    if scalar is not None:
+        scalar = np.moveaxis(scalar, axes, (1, 0))
+
+    if staggered:
+        periodic_x, periodic_y = np.broadcast_to(periodic, 2)
+        u, du = destagger_array(u, 1, np.shape(x)[-1], periodic_x)
+        v, dv = destagger_array(v, 0, np.shape(y)[0], periodic_y)
+
     if grid_type == "uniform":
         dx = np.abs(x[0] - x[1])
         dy = np.abs(y[0] - y[1])
 
         if scalar is not None:
             dsdx, dsdy = np.gradient(scalar, dx, dy, axis=(1, 0))
+        elif staggered:
+            dudx = du / dx
+            dudy = np.gradient(u, dy, axis=0)
+            dvdx = np.gradient(v, dx, axis=1)
+            dvdy = dv / dy
         else:
             dudx, dudy = np.gradient(u, dx, dy, axis=(1, 0))
             dvdx, dvdy = np.gradient(v, dx, dy, axis=(1, 0))
@@ -59,15 +100,25 @@ def calculate_advection_2d(  # noqa: D417
 
         if scalar is not None:
             dsdx, dsdy = np.gradient(scalar, xcoords, ycoords, axis=(1, 0))
+        elif staggered:
+            # Width of each cell, i.e. the spacing of the faces halfway between
+            # the centers, so the first entry of dx and dy is not used
+            dudx = du / np.gradient(xcoords)
+            dudy = np.gradient(u, ycoords, axis=0)
+            dvdx = np.gradient(v, xcoords, axis=1)
+            dvdy = dv / np.gradient(ycoords)[:, None]
         else:
             dudx, dudy = np.gradient(u, xcoords, ycoords, axis=(1, 0))
             dvdx, dvdy = np.gradient(v, xcoords, ycoords, axis=(1, 0))
 
     if scalar is not None:
-        advection = u * dsdx + v * dsdy
+        advection = np.moveaxis(u * dsdx + v * dsdy, (1, 0), axes)
     else:
         x_advection = u * dudx + v * dudy
         y_advection = u * dvdx + v * dvdy
-        advection = (x_advection, y_advection)
+        advection = (
+            np.moveaxis(x_advection, (1, 0), axes),
+            np.moveaxis(y_advection, (1, 0), axes),
+        )
 
     return advection
@@ -1,5 +1,7 @@
 import numpy as np
 
+from .destagger_array import destagger_array
+
 
 def calculate_advection_3d(  # noqa: D417
     u,
@@ -9,6 +11,9 @@ def calculate_advection_3d(  # noqa: D417
     y,
     z,
     scalar=None,
+    staggered=False,
+    axes=(2, 1, 0),
+    periodic=False,
 ):
     """
     Calculate the advection for a velocity field or scalar field. The velocity field
@@ -33,6 +38,27 @@ def calculate_advection_3d(  # noqa: D417
             The z-coordinates of the grid.
         scalar: ndarray, optional
             Array of scalar values. Defaults to None.
+        staggered: bool, optional
+            Whether u, v and w are on an Arakawa C-grid, i.e. u on the x-faces, v
+            on the y-faces and w on the z-faces of the cells centered on x, y, z
+            and scalar (see destagger_array for the supported layouts). du/dx,
+            dv/dy and dw/dz are then differenced across the faces of each cell,
+            and the other gradients and the advection are calculated from the
+            velocities averaged to the cell centers, without interpolating the
+            velocities beforehand. Defaults to False.
+        axes: tuple, optional
+            Axes of the x-, y- and z-direction in u, v, w and scalar, e.g.
+            (0, 1, 2) for arrays ordered (x, y, z) such as Fortran-ordered model
+            output. The arrays are not copied, and the advection has the same
+            layout, with one point per cell center along each axis (the shape of
+            u unless u is staggered). Defaults to (2, 1, 0).
+        periodic: bool or tuple, optional
+            Whether the x-, y- and z-directions are periodic, either a bool for
+            all or a tuple (periodic_x, periodic_y, periodic_z). Only used if
+            staggered is True, to wrap the face missing at the end of a periodic
+            axis around instead of extrapolating it (see destagger_array), like
+            the generate_ modules do for the boundary of the data. Defaults to
+            False.
 
     Returns
     -------
@@ -44,20 +70,46 @@ def calculate_advection_3d(  # noqa: D417
     dy = np.abs(y[0] - y[1])
     dz = np.abs(z[0] - z[1])
 
+    # Views with the axes ordered (z, y, x), so that arrays in other layouts are not
+    # copied
+    u = np.moveaxis(u, axes, (2, 1, 0))
+    v = np.moveaxis(v, axes, (2, 1, 0))
+    w = np.moveaxis(w, axes, (2, 1, 0))
+    if scalar is not None:
+        scalar = np.moveaxis(scalar, axes, (2, 1, 0))
+
+    if staggered:
+        periodic_x, periodic_y, periodic_z = np.broadcast_to(periodic, 3)
+        u, du = destagger_array(u, 2, len(x), periodic_x)
+        v, dv = destagger_array(v, 1, len(y), periodic_y)
+        w, dw = destagger_array(w, 0, len(z), periodic_z)
+
     if scalar is not None:
         dsdx, dsdy, dsdz = np.gradient(scalar, dx, dy, dz, axis=(2, 1, 0))
 
-        advection = u * dsdx + v * dsdy + w * dsdz
+        advection = np.moveaxis(u * dsdx + v * dsdy + w * dsdz, (2, 1, 0), axes)
 
     else:
-        dudx, dudy, dudz = np.gradient(u, dx, dy, dz, axis=(2, 1, 0))
-        dvdx, dvdy, dvdz = np.gradient(v, dx, dy, dz, axis=(2, 1, 0))
-        dwdx, dwdy, dwdz = np.gradient(w, dx, dy, dz, axis=(2, 1, 0))
+        if staggered:
+            # Gradients across the faces of each cell are the face differences
+            dudy, dudz = np.gradient(u, dy, dz, axis=(1, 0))
+            dvdx, dvdz = np.gradient(v, dx, dz, axis=(2, 0))
+            dwdx, dwdy = np.gradient(w, dx, dy, axis=(2, 1))
+            dudx = du / dx
+            dvdy = dv / dy
+            dwdz = dw / dz
+        else:
+            dudx, dudy, dudz = np.gradient(u, dx, dy, dz, axis=(2, 1, 0))
+            dvdx, dvdy, dvdz = np.gradient(v, dx, dy, dz, axis=(2, 1, 0))
+            dwdx, dwdy, dwdz = np.gradient(w, dx, dy, dz, axis=(2, 1, 0))
 
         u_advection = u * dudx + v * dudy + w * dudz
         v_advection = u * dvdx + v * dvdy + w * dvdz
         w_advection = u * dwdx + v * dwdy + w * dwdz
 
-        advection = (u_advection, v_advection, w_advection)
+        advection = tuple(
+            np.moveaxis(component, (2, 1, 0), axes)
+            for component in (u_advection, v_advection, w_advection)
+        )
 
     return advection
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def calculate_decorrelation_length(field, axis, periodic):  # noqa: D417
+    """
+    Calculate the decorrelation length of a field along one array axis, as the
+    integral of its autocorrelation, 1 + 2 * sum(rho(k)), summed over separations k
+    up to the first separation where the autocorrelation rho is no longer positive.
+    The autocorrelation is calculated with FFTs and averaged over the other axes,
+    ignoring NaNs. The number of independent samples along the axis is about the
+    number of points divided by the decorrelation length.
+
+    Parameters
+    ----------
+        field: ndarray
+            Array of field values.
+        axis: int
+            Array axis along which the decorrelation length is calculated.
+        periodic: bool
+            Whether the field is periodic along axis.
+
+    Returns
+    -------
+        float:
+            Decorrelation length in grid points, at least 1.
+    """
+    field = np.asarray(field, dtype=float)
+    n = field.shape[axis]
+    nfft = n if periodic else 2 * n
+    mask = ~np.isnan(field)
+    values = np.where(mask, field, 0.0)
+    values = values - mask * (values.sum() / max(mask.sum(), 1))
+
+    def correlate(values):
+        spectrum = np.fft.rfft(values, nfft, axis=axis)
+        correlation = np.fft.irfft(np.conj(spectrum) * spectrum, nfft, axis=axis)
+        correlation = np.moveaxis(correlation, axis, 0)
+        return correlation.reshape(nfft, -1).sum(axis=1)[: n // 2 + 1]
+
+    counts = np.rint(correlate(mask.astype(float)))
+    covariance = correlate(values)
+    if counts[0] == 0 or covariance[0] <= 0:
+        return 1.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        autocorrelation = np.where(counts > 0, covariance / counts, 0) / (
+            covariance[0] / counts[0]
+        )
+
+    not_positive = np.nonzero(autocorrelation[1:] <= 0)[0]
+    cutoff = not_positive[0] + 1 if len(not_positive) > 0 else len(autocorrelation)
+    return max(1.0, 1 + 2 * float(np.sum(autocorrelation[1:cutoff])))
@@ -15,6 +15,7 @@ def calculate_sf_maps_2d(  # noqa: D417, C901
     sf_type,
     scalar=None,
     adv_scalar=None,
+    shifted_inputs=None,
 ):
     """
     Calculate structure functions, including advective structure functions.
@@ -47,6 +48,11 @@ def calculate_sf_maps_2d(  # noqa: D417, C901
             Array of scalar values. Defaults to None.
         adv_scalar: ndarray, optional
             Array of scalar advection values. Defaults to None.
+        shifted_inputs: dict, optional
+            Dictionary of the inputs already shifted by shift_in_x and shift_in_y,
+            keyed by the input name with a "_xy_shift" suffix, e.g. "u_xy_shift".
+            Used to avoid allocating new shifted arrays for every separation.
+            Defaults to None, i.e. the inputs are shifted with shift_array_xy.
 
     Returns
     -------
@@ -90,19 +96,20 @@ def calculate_sf_maps_2d(  # noqa: D417, C901
         "adv_scalar": adv_scalar,
     }
 
-    shifted_inputs = {}
+    if shifted_inputs is None:
+        shifted_inputs = {}
 
-    for key, value in inputs.items():
-        if value is not None:
-            xy_shift = shift_array_xy(
-                inputs[key], x_shift=shift_in_x, y_shift=shift_in_y
-            )
+        for key, value in inputs.items():
+            if value is not None:
+                xy_shift = shift_array_xy(
+                    inputs[key], x_shift=shift_in_x, y_shift=shift_in_y
+                )
 
-            shifted_inputs.update(
-                {
-                    key + "_xy_shift": xy_shift,
-                }
-            )
+                shifted_inputs.update(
+                    {
+                        key + "_xy_shift": xy_shift,
+                    }
+                )
 
     inputs.update(shifted_inputs)
     SF_dict = {}
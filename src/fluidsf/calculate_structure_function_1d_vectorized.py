@@ -0,0 +1,98 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .evaluate_sf_terms import evaluate_sf_terms
+from .get_sf_terms import get_sf_terms
+
+
+def calculate_structure_function_1d_vectorized(  # noqa: D417
+    u,
+    separations,
+    sf_type,
+    v=None,
+    scalar=None,
+    boundary="Periodic",
+    lag_block=None,
+):
+    """
+    Calculate traditional structure functions for many separations of 1D data at
+    once. The data are extended by wrapping (periodic) or NaN padding, and the
+    shifted copies for a block of separations are read from a sliding window view
+    of the extended data, so that each block of separations is calculated with a
+    few array operations. Pairs that contain NaNs are ignored.
+
+    Parameters
+    ----------
+        u: ndarray
+            1D array of u velocities.
+        separations: ndarray
+            1D array of integer separations (lags) to calculate.
+        sf_type: list
+            List of traditional structure function types to calculate.
+            Accepted list entries must be one or more of the following strings:
+            "LL", "TT", "SS", "LLL", "LTT", "LSS".
+        v: ndarray, optional
+            1D array of v velocities. Defaults to None.
+        scalar: ndarray, optional
+            1D array of scalar values. Defaults to None.
+        boundary: str, optional
+            Boundary condition of the data, either "Periodic" or None.
+            Defaults to "Periodic".
+        lag_block: int, optional
+            Number of separations calculated together, which bounds the memory use
+            to a few arrays of lag_block times the data length. Defaults to None,
+            i.e. blocks of about 4 million pairs.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the requested structure functions, each an array
+            with one value per separation, keyed by "SF_LL", "SF_TT", "SF_SS",
+            "SF_LLL", "SF_LTT" and "SF_LSS".
+    """
+    separations = np.asarray(separations, dtype=int)
+    n = len(u)
+    if lag_block is None:
+        lag_block = max(1, 2**22 // max(n, 1))
+    if not isinstance(lag_block, int | np.integer) or lag_block < 1:
+        raise ValueError("lag_block must be a positive integer.")
+
+    terms = {
+        key: key_terms
+        for key, key_terms in get_sf_terms(sf_type, (1, 0)).items()
+        if key[3:] in sf_type
+    }
+    fields = {"u": u, "v": v, "scalar": scalar}
+
+    # Extend each field so that the window starting at index s is the field
+    # shifted by s
+    max_lag = separations.max(initial=0)
+    windows = {}
+    for key, value in fields.items():
+        if value is None:
+            continue
+        value = np.asarray(value, dtype=float)
+        if boundary == "Periodic":
+            extension = np.resize(value, max_lag)
+        else:
+            extension = np.full(max_lag, np.nan)
+        windows[key] = sliding_window_view(np.concatenate((value, extension)), n)
+
+    SF_dict = {key: np.zeros(len(separations)) for key in terms}
+    for start in range(0, len(separations), lag_block):
+        block = separations[start : start + lag_block]
+        increments = {
+            key: window[block] - np.asarray(fields[key], dtype=float)
+            for key, window in windows.items()
+        }
+        for key, key_terms in terms.items():
+            values = evaluate_sf_terms(key_terms, increments)
+            valid = ~np.isnan(values)
+            counts = valid.sum(axis=1)
+            sums = np.where(valid, values, 0).sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                SF_dict[key][start : start + lag_block] = np.where(
+                    counts > 0, sums / counts, np.nan
+                )
+
+    return SF_dict
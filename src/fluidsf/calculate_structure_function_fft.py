@@ -0,0 +1,104 @@
+import numpy as np
+
+from .expand_sf_terms import expand_sf_terms
+
+
+def calculate_structure_function_fft(  # noqa: C901, D417
+    fields, terms, axis, periodic, separations, keep_axes=(), return_counts=False
+):
+    """
+    Calculate structure functions for many separations along one array axis at once
+    using FFT correlations. Each structure function is expanded into correlations of
+    products of the fields at the two points of each pair (see expand_sf_terms),
+    which are calculated for every separation with FFTs along the axis and summed
+    over the other axes. Non-periodic axes are zero-padded so that the correlations
+    do not wrap. Points where any field of a structure function is NaN are masked
+    out of both the sums and the pair counts, so the result matches averaging the
+    increments over the pairs without NaNs.
+
+    Parameters
+    ----------
+        fields: dict
+            Dictionary of equally-shaped arrays keyed by field name, e.g. "u", "v",
+            "adv_x" and "scalar".
+        terms: dict
+            Dictionary of structure function terms keyed by output name, as
+            returned by get_sf_terms.
+        axis: int
+            Array axis along which the separations are taken.
+        periodic: bool
+            Whether the data are periodic along axis.
+        separations: ndarray
+            1D array of non-negative integer separations (lags) along axis.
+        keep_axes: tuple, optional
+            Array axes that are not averaged over, e.g. the track axis of a batch
+            of padded 1D tracks. Defaults to (), i.e. all other axes are averaged
+            over.
+        return_counts: bool, optional
+            Whether to also return the number of pairs without NaNs at each
+            separation. Defaults to False.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the structure functions keyed by the names in
+            terms, each an array with one value per separation (along the last
+            axis, after any axes in keep_axes). If return_counts is True, the
+            dictionary also contains the number of pairs of each structure
+            function under its key with a "_counts" suffix.
+    """
+    separations = np.asarray(separations, dtype=int)
+    n = np.shape(next(iter(fields.values())))[axis]
+    nfft = n if periodic else 2 * n
+    other_axes = tuple(
+        i
+        for i in range(np.ndim(next(iter(fields.values()))))
+        if i != axis and i not in keep_axes
+    )
+
+    def correlate(anchor_spectrum, partner_spectrum):
+        # Sum over anchors of anchor(i) * partner(i + separation)
+        correlation = np.fft.irfft(
+            np.conj(anchor_spectrum) * partner_spectrum, nfft, axis=axis
+        )
+        correlation = np.moveaxis(correlation, axis, -1).sum(
+            axis=tuple(i if i < axis else i - 1 for i in other_axes)
+        )
+        return np.take(correlation, separations, axis=-1)
+
+    SF_dict = {}
+    for key, key_terms in terms.items():
+        expanded = expand_sf_terms(key_terms)
+        key_fields = sorted({f for monomials in expanded for m in monomials for f in m})
+
+        # Remove the mean of each field to reduce round-off in the correlations;
+        # increments do not depend on it
+        mask = np.ones(np.shape(fields[key_fields[0]]), dtype=bool)
+        for field in key_fields:
+            mask &= ~np.isnan(fields[field])
+        centered = {}
+        for field in key_fields:
+            values = np.where(mask, fields[field], 0.0)
+            centered[field] = values - mask * (values.sum() / max(mask.sum(), 1))
+
+        # FFT of the masked product of fields for each anchor or partner monomial
+        spectra = {}
+        for monomials in expanded:
+            for monomial in (*monomials, ()):
+                if monomial not in spectra:
+                    values = mask.astype(float)
+                    for field in monomial:
+                        values = values * centered[field]
+                    spectra[monomial] = np.fft.rfft(values, nfft, axis=axis)
+
+        counts = np.rint(correlate(spectra[()], spectra[()]))
+        sums = np.zeros(np.shape(counts))
+        for (anchor_fields, partner_fields), coeff in expanded.items():
+            sums += coeff * correlate(spectra[anchor_fields], spectra[partner_fields])
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            SF_dict[key] = np.where(counts > 0, sums / counts, np.nan)
+        if return_counts:
+            SF_dict[key + "_counts"] = counts
+
+    return SF_dict
@@ -0,0 +1,120 @@
+import numpy as np
+
+from .expand_sf_terms import expand_sf_terms
+
+
+def calculate_structure_function_moments(  # noqa: C901, D417
+    fields, terms, axis, periodic, separations
+):
+    """
+    Calculate structure functions for many separations along one array axis using
+    the moment expansion of each structure function (see expand_sf_terms), without
+    shifting the data. Terms that only involve one point of each pair are sums of
+    a field product over the overlap window, which come from cumulative sums in
+    O(1) per separation. Cross terms are dot products of contiguous views of the
+    data at the two points. Points where any field of a structure function is NaN
+    are masked out; if there are any, the one-point terms also become dot products
+    with the mask.
+
+    Parameters
+    ----------
+        fields: dict
+            Dictionary of equally-shaped arrays keyed by field name, e.g. "u", "v",
+            "adv_x" and "scalar".
+        terms: dict
+            Dictionary of structure function terms keyed by output name, as
+            returned by get_sf_terms.
+        axis: int
+            Array axis along which the separations are taken.
+        periodic: bool
+            Whether the data are periodic along axis.
+        separations: ndarray
+            1D array of positive integer separations (lags) along axis.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the structure functions keyed by the names in
+            terms, each an array with one value per separation.
+    """
+    separations = np.asarray(separations, dtype=int)
+    shape = np.shape(next(iter(fields.values())))
+    n = shape[axis]
+    points_per_slice = int(np.prod(shape)) // max(n, 1)
+
+    def pair_sum(anchor, partner, separation):
+        # Sum over anchors of anchor(i) * partner(i + separation), with the
+        # separation axis first so that the overlapping windows are contiguous
+        total = np.dot(anchor[: n - separation].ravel(), partner[separation:].ravel())
+        if periodic:
+            total += np.dot(
+                anchor[n - separation :].ravel(), partner[:separation].ravel()
+            )
+        return total
+
+    SF_dict = {}
+    for key, key_terms in terms.items():
+        expanded = expand_sf_terms(key_terms)
+        key_fields = sorted({f for monomials in expanded for m in monomials for f in m})
+
+        # Remove the mean of each field to reduce round-off in the expansion;
+        # increments do not depend on it
+        mask = np.ones(shape, dtype=bool)
+        for field in key_fields:
+            mask &= ~np.isnan(fields[field])
+        has_nans = not mask.all()
+        centered = {}
+        for field in key_fields:
+            values = np.where(mask, fields[field], 0.0)
+            centered[field] = values - mask * (values.sum() / max(mask.sum(), 1))
+
+        # Masked product of fields for each anchor or partner monomial
+        products = {}
+        for monomials in expanded:
+            for monomial in (*monomials, ()):
+                if monomial not in products:
+                    values = mask.astype(float)
+                    for field in monomial:
+                        values = values * centered[field]
+                    products[monomial] = np.ascontiguousarray(
+                        np.moveaxis(values, axis, 0)
+                    )
+
+        # Cumulative sums along the axis for the one-point terms
+        cumulative = {
+            monomial: np.concatenate(
+                ([0.0], np.cumsum(values.reshape(n, -1).sum(axis=1)))
+            )
+            for monomial, values in products.items()
+        }
+
+        sums = np.zeros(len(separations))
+        counts = np.zeros(len(separations))
+        for index, separation in enumerate(separations):
+            if has_nans:
+                counts[index] = pair_sum(products[()], products[()], separation)
+            elif periodic:
+                counts[index] = n * points_per_slice
+            else:
+                counts[index] = (n - separation) * points_per_slice
+
+            for (anchor_fields, partner_fields), coeff in expanded.items():
+                if has_nans or (anchor_fields and partner_fields):
+                    total = pair_sum(
+                        products[anchor_fields], products[partner_fields], separation
+                    )
+                elif periodic:
+                    total = cumulative[anchor_fields or partner_fields][n]
+                elif partner_fields:
+                    total = (
+                        cumulative[partner_fields][n]
+                        - cumulative[partner_fields][separation]
+                    )
+                else:
+                    total = cumulative[anchor_fields][n - separation]
+                sums[index] += coeff * total
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            SF_dict[key] = np.where(counts > 0, sums / np.rint(counts), np.nan)
+
+    return SF_dict
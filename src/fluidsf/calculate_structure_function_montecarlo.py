@@ -0,0 +1,143 @@
+import numpy as np
+
+from .evaluate_sf_terms import evaluate_sf_terms
+
+
+def calculate_structure_function_montecarlo(  # noqa: D417
+    fields,
+    terms,
+    shift,
+    periodic,
+    rng,
+    rtol=0.01,
+    max_samples=None,
+    batch_size=1024,
+):
+    """
+    Estimate structure functions for a single separation vector from randomly
+    sampled pairs of points. Pairs are drawn in batches until the standard error of
+    every structure function is at most rtol times the mean magnitude of the
+    sampled values (e.g. of du**3 for SF_LLL), or until max_samples pairs have been
+    drawn. For positive structure functions, e.g. SF_LL, this is the magnitude of
+    the structure function, and odd-order structure functions with means near zero
+    converge to the same fraction of the typical magnitude of their values. Pairs
+    that contain NaNs are ignored.
+
+    Parameters
+    ----------
+        fields: dict
+            Dictionary of equally-shaped arrays keyed by field name, e.g. "u", "v",
+            "adv_x" and "scalar".
+        terms: dict
+            Dictionary of structure function terms keyed by output name, as
+            returned by get_sf_terms.
+        shift: tuple
+            Integer shift of the separation vector along each array axis.
+        periodic: tuple
+            Whether each array axis is periodic. Pairs wrap around periodic axes
+            and are restricted to the domain along other axes.
+        rng: numpy.random.Generator
+            Random number generator used to draw the pairs.
+        rtol: float, optional
+            Target standard error relative to the mean magnitude of the sampled
+            values of each structure function. Defaults to 0.01.
+        max_samples: int, optional
+            Maximum number of pairs to draw. Defaults to None, i.e. a quarter of
+            the distinct pairs available for this separation vector (at least
+            batch_size, and at most all pairs).
+        batch_size: int, optional
+            Number of pairs drawn before the stopping criterion is checked.
+            Defaults to 1024.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the estimated structure functions keyed by the
+            names in terms, and their standard errors under the same names with a
+            "_stderr" suffix.
+    """
+    shape = np.shape(next(iter(fields.values())))
+
+    # Range of anchor points that have a partner inside the domain
+    starts = []
+    stops = []
+    for n, s, p in zip(shape, shift, periodic, strict=True):
+        if p:
+            starts.append(0)
+            stops.append(n)
+        else:
+            starts.append(max(0, -s))
+            stops.append(min(n, n - s))
+    n_pairs = int(np.prod([max(0, b - a) for a, b in zip(starts, stops, strict=True)]))
+    if max_samples is None:
+        max_samples = min(n_pairs, max(batch_size, n_pairs // 4))
+
+    needed_fields = {
+        field
+        for key_terms in terms.values()
+        for coeff, factors in key_terms
+        for combination in factors
+        for field, weight in combination
+    }
+
+    # Running mean and sum of squared deviations, merged batch-wise (Chan et al.),
+    # and running mean magnitude used as the scale of the tolerance
+    counts = dict.fromkeys(terms, 0)
+    means = dict.fromkeys(terms, 0.0)
+    sq_devs = dict.fromkeys(terms, 0.0)
+    magnitudes = dict.fromkeys(terms, 0.0)
+
+    n_drawn = 0
+    while n_pairs > 0 and n_drawn < max_samples:
+        n_batch = min(batch_size, max_samples - n_drawn)
+        anchor = tuple(
+            rng.integers(a, b, n_batch) for a, b in zip(starts, stops, strict=True)
+        )
+        partner = tuple(
+            (i + s) % n if p else i + s
+            for i, s, n, p in zip(anchor, shift, shape, periodic, strict=True)
+        )
+        increments = {
+            field: fields[field][partner] - fields[field][anchor]
+            for field in needed_fields
+        }
+        n_drawn += n_batch
+
+        converged = True
+        for key, key_terms in terms.items():
+            values = evaluate_sf_terms(key_terms, increments)
+            values = values[~np.isnan(values)]
+            if values.size > 0:
+                batch_mean = np.mean(values)
+                delta = batch_mean - means[key]
+                total = counts[key] + values.size
+                means[key] += delta * values.size / total
+                magnitudes[key] += (
+                    (np.mean(np.abs(values)) - magnitudes[key]) * values.size / total
+                )
+                sq_devs[key] += (
+                    np.sum((values - batch_mean) ** 2)
+                    + delta**2 * counts[key] * values.size / total
+                )
+                counts[key] = total
+
+            if (
+                counts[key] < 2
+                or np.sqrt(sq_devs[key] / (counts[key] - 1) / counts[key])
+                > rtol * magnitudes[key]
+            ):
+                converged = False
+
+        if converged:
+            break
+
+    SF_dict = {}
+    for key in terms:
+        SF_dict[key] = means[key] if counts[key] > 0 else np.nan
+        SF_dict[key + "_stderr"] = (
+            np.sqrt(sq_devs[key] / (counts[key] - 1) / counts[key])
+            if counts[key] > 1
+            else np.nan
+        )
+
+    return SF_dict
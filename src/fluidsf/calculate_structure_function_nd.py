@@ -0,0 +1,105 @@
+import numpy as np
+
+from .evaluate_sf_terms import evaluate_sf_terms
+
+
+def calculate_structure_function_nd(  # noqa: D417
+    fields,
+    terms,
+    shift,
+    periodic,
+    return_variance=False,
+    tile_index=None,
+):
+    """
+    Calculate structure functions for a single separation vector in data of any
+    dimension. Pairs wrap around periodic axes and are restricted to the overlap of
+    the domain and its shifted copy along other axes. Pairs that contain NaNs are
+    ignored. Optionally, the variance of the integrand over pairs is also
+    calculated from the same values.
+
+    Parameters
+    ----------
+        fields: dict
+            Dictionary of equally-shaped arrays keyed by field name, e.g. "u", "v",
+            "adv_x" and "scalar".
+        terms: dict
+            Dictionary of structure function terms keyed by output name, as
+            returned by get_sf_terms.
+        shift: tuple
+            Integer shift of the separation vector along each array axis.
+        periodic: tuple
+            Whether each array axis is periodic.
+        return_variance: bool, optional
+            Whether to also return the variance and number of pairs of the
+            integrand of each structure function. Defaults to False.
+        tile_index: ndarray, optional
+            Integer array with the same shape as the fields that assigns every
+            point to a tile, e.g. for a spatial block bootstrap. If given, the sum
+            of the integrand and the number of pairs without NaNs are also
+            returned for each tile of the first point of each pair. Defaults to
+            None.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the structure functions keyed by the names in
+            terms. If return_variance is True, the dictionary also contains the
+            sample variance of the integrand under the same names with a
+            "_variance" suffix and the number of pairs without NaNs with a
+            "_counts" suffix. If tile_index is given, the dictionary also
+            contains the sums and numbers of pairs of each tile with a
+            "_tile_sums" and "_tile_counts" suffix.
+    """
+    anchor_slices = []
+    partner_slices = []
+    for n, s, p in zip(
+        np.shape(next(iter(fields.values()))), shift, periodic, strict=True
+    ):
+        if p:
+            anchor_slices.append(slice(None))
+            partner_slices.append(slice(None))
+        else:
+            anchor_slices.append(slice(max(0, -s), max(0, n - max(0, s))))
+            partner_slices.append(slice(max(0, s), max(0, n + min(0, s))))
+
+    needed_fields = {
+        field
+        for key_terms in terms.values()
+        for coeff, factors in key_terms
+        for combination in factors
+        for field, weight in combination
+    }
+
+    increments = {}
+    for field in needed_fields:
+        partner = fields[field][tuple(partner_slices)]
+        for axis, (s, p) in enumerate(zip(shift, periodic, strict=True)):
+            if p and s != 0:
+                partner = np.roll(partner, -s, axis=axis)
+        increments[field] = partner - fields[field][tuple(anchor_slices)]
+
+    SF_dict = {}
+    for key, key_terms in terms.items():
+        values = evaluate_sf_terms(key_terms, increments)
+        if tile_index is not None:
+            tiles = np.ravel(np.asarray(tile_index)[tuple(anchor_slices)])
+            valid = ~np.isnan(np.ravel(values))
+            n_tiles = int(np.max(tile_index)) + 1
+            SF_dict[key + "_tile_sums"] = np.bincount(
+                tiles[valid], weights=np.ravel(values)[valid], minlength=n_tiles
+            )
+            SF_dict[key + "_tile_counts"] = np.bincount(tiles[valid], minlength=n_tiles)
+        if return_variance:
+            count = int(np.count_nonzero(~np.isnan(values)))
+            SF_dict[key] = np.nanmean(values) if count > 0 else np.nan
+            SF_dict[key + "_variance"] = (
+                np.nanvar(values, ddof=1) if count > 1 else np.nan
+            )
+            SF_dict[key + "_counts"] = count
+        elif np.size(values) == 0 or np.all(np.isnan(values)):
+            SF_dict[key] = np.nan
+        else:
+            SF_dict[key] = np.nanmean(values)
+
+    return SF_dict
@@ -0,0 +1,74 @@
+import warnings
+
+import numpy as np
+
+
+def calculate_tile_bootstrap(  # noqa: D417
+    tile_sums,
+    tile_counts,
+    rng,
+    n_resamples=1000,
+    confidence_level=0.9,
+    averaging=None,
+):
+    """
+    Bootstrap structure functions by resampling tiles of the domain, using the sums
+    of the integrand and the numbers of pairs of every tile at every separation.
+    The structure functions of a resample are the sums over the resampled tiles
+    divided by the numbers of pairs, so the data are never revisited. All
+    structure functions are resampled with the same tiles.
+
+    Parameters
+    ----------
+        tile_sums: dict
+            Dictionary of arrays of the sums of the integrand of each structure
+            function, with one row per separation and one column per tile.
+        tile_counts: dict
+            Dictionary of arrays of the numbers of pairs, keyed and shaped like
+            tile_sums.
+        rng: numpy.random.Generator
+            Random number generator used to draw the resampled tiles.
+        n_resamples: int, optional
+            Number of bootstrap resamples. Defaults to 1000.
+        confidence_level: float, optional
+            Confidence level of the percentile confidence intervals. Defaults to
+            0.9.
+        averaging: dict, optional
+            Dictionary of matrices keyed like tile_sums, each with one row per
+            separation, that average the resampled structure functions over
+            separations, e.g. into distance bins. Defaults to None, i.e. no
+            averaging.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the lower and upper bounds of the confidence
+            interval and the standard deviation of the bootstrap distribution of
+            each structure function under its key with a "_ci_low", "_ci_high" and
+            "_stderr" suffix.
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1.")
+    n_tiles = np.shape(next(iter(tile_sums.values())))[1]
+    indices = rng.integers(0, n_tiles, (n_resamples, n_tiles))
+    weights = np.zeros((n_resamples, n_tiles))
+    np.add.at(weights, (np.arange(n_resamples)[:, None], indices), 1)
+
+    alpha = (1 - confidence_level) / 2
+    data = {}
+    for key, sums in tile_sums.items():
+        with np.errstate(invalid="ignore", divide="ignore"):
+            distribution = (weights @ np.transpose(sums)) / (
+                weights @ np.transpose(tile_counts[key])
+            )
+        if averaging is not None:
+            distribution = distribution @ averaging[key]
+        with warnings.catch_warnings():
+            # Separations without pairs in any tile stay NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            data[key + "_ci_low"], data[key + "_ci_high"] = np.nanquantile(
+                distribution, [alpha, 1 - alpha], axis=0
+            )
+            data[key + "_stderr"] = np.nanstd(distribution, axis=0, ddof=1)
+
+    return data
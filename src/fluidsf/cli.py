@@ -0,0 +1,340 @@
+import argparse
+import concurrent.futures
+import glob
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .calculate_advection_2d import calculate_advection_2d
+from .calculate_advection_3d import calculate_advection_3d
+from .calculate_structure_function_fft import calculate_structure_function_fft
+from .generate_structure_functions_1d import generate_structure_functions_1d
+from .generate_structure_functions_2d import generate_structure_functions_2d
+from .generate_structure_functions_3d import generate_structure_functions_3d
+from .get_sf_terms import get_sf_terms
+from .sf_result import SFResult
+
+NETCDF_SUFFIXES = (".nc", ".nc4", ".cdf", ".netcdf")
+
+
+def _read_variables(path, names, transpose=False):
+    # Read variables from a NetCDF, HDF5 or JLD2 file. NetCDF files are read with
+    # xarray if it is installed, and all other files (JLD2 files are HDF5 files)
+    # with h5py. JLD2 arrays are stored in column-major order, so their axes are
+    # always reversed, and transpose reverses the axes of other files.
+    transpose = transpose or path.suffix == ".jld2"
+    if path.suffix in NETCDF_SUFFIXES:
+        try:
+            import xarray as xr
+        except ImportError:
+            xr = None
+        if xr is not None:
+            with xr.open_dataset(path) as dataset:
+                arrays = [np.asarray(dataset[name].values) for name in names]
+            return [array.T if transpose else array for array in arrays]
+    try:
+        import h5py
+    except ImportError as error:
+        raise ImportError(
+            f"Reading {path.name} requires h5py (or xarray for NetCDF files)."
+        ) from error
+    with h5py.File(path, "r") as file:
+        arrays = [np.asarray(file[name][()]) for name in names]
+    return [array.T if transpose else array for array in arrays]
+
+
+def _missing_fields(velocities, scalar, coords, sf_type):
+    # Fields that are NaN where the data are missing and zero elsewhere, named like
+    # get_sf_terms. Advection fields are calculated from the missing velocities, so
+    # they are also missing next to missing velocities.
+    fields = {
+        name: np.where(np.isnan(velocity), np.nan, 0.0)
+        for name, velocity in zip("uvw", velocities, strict=False)
+    }
+    if scalar is not None:
+        fields["scalar"] = np.where(np.isnan(scalar), np.nan, 0.0)
+    velocities = [fields[name] for name in "uvw"[: len(velocities)]]
+    calculate_advection = (
+        calculate_advection_3d if len(velocities) == 3 else calculate_advection_2d
+    )
+    if any("ASF_V" in t for t in sf_type):
+        advection = calculate_advection(*velocities, *coords)
+        fields.update(zip(["adv_x", "adv_y", "adv_z"], advection, strict=False))
+    if any("ASF_S" in t for t in sf_type):
+        fields["adv_scalar"] = calculate_advection(
+            *velocities, *coords, scalar=fields["scalar"]
+        )
+    return fields
+
+
+def _pair_counts(fields, sf_type, periodic, n_lags):
+    # Number of pairs without NaNs in the fields of each structure function at each
+    # lag along each axis, keyed like the generators with the axes ordered
+    # (z, y, x). The counts come from the FFT correlations of the masks of the
+    # fields, as in the "fft" engine.
+    n_dims = len(periodic)
+    counts = {}
+    for axis, direction in enumerate("zyx"[3 - n_dims :]):
+        vector = np.zeros(max(n_dims, 2))
+        vector[n_dims - 1 - axis] = 1
+        suffix = "" if n_dims == 1 else "_" + direction
+        for key, key_terms in get_sf_terms(sf_type, tuple(vector)).items():
+            key_fields = sorted(
+                {
+                    field
+                    for coeff, factors in key_terms
+                    for combination in factors
+                    for field, weight in combination
+                }
+            )
+            # Increments of the sum of the fields, which are NaN if any field is
+            presence = {key: [(1.0, (tuple((field, 1.0) for field in key_fields),))]}
+            counts[key + suffix] = calculate_structure_function_fft(
+                fields,
+                presence,
+                axis,
+                periodic[axis],
+                np.arange(n_lags[direction]),
+                return_counts=True,
+            )[key + "_counts"]
+    return counts
+
+
+def _process_file(path, options):
+    # Calculate the mean structure functions over the snapshots of a file, i.e.
+    # over all leading axes beyond the spatial axes
+    start = time.perf_counter()
+    n_dims = len(options["variables"])
+    names = list(options["variables"])
+    if options["scalar"] is not None:
+        names.append(options["scalar"])
+    arrays = _read_variables(path, names, options["transpose"])
+    if options["coords"] is not None:
+        coords = _read_variables(path, options["coords"], False)
+        coords = [np.ravel(coord) for coord in coords]
+    else:
+        # Spatial axes are ordered (z, y, x), so x is the last axis
+        coords = [np.arange(n) for n in reversed(arrays[0].shape[-n_dims:])]
+
+    spatial_shape = arrays[0].shape[arrays[0].ndim - n_dims :]
+    arrays = [array.reshape(-1, *spatial_shape) for array in arrays]
+    n_bytes = sum(array.nbytes for array in arrays)
+
+    # Structure functions are calculated at every lag and binned lazily by
+    # SFResult, so the pair counts of the lags in each bin are summed
+    kwargs = {"sf_type": options["sf_type"]}
+    if options["engine"] is not None:
+        kwargs["engine"] = options["engine"]
+    boundary = "Periodic" if n_dims == 1 else "periodic-all"
+    if options["boundary"] is not None:
+        boundary = None if options["boundary"] == "none" else options["boundary"]
+        kwargs["boundary"] = boundary
+    if n_dims == 1:
+        periodic = (boundary == "Periodic",)
+    else:
+        periodic = tuple(
+            boundary is not None
+            and ("periodic-all" in boundary or f"periodic-{direction}" in boundary)
+            for direction in "zyx"[3 - n_dims :]
+        )
+
+    results = []
+    missing = None
+    for snapshot in range(len(arrays[0])):
+        fields = [array[snapshot] for array in arrays]
+        scalar = fields.pop() if options["scalar"] is not None else None
+        if n_dims == 1:
+            data = generate_structure_functions_1d(
+                fields[0], coords[0], scalar=scalar, **kwargs
+            )
+        elif n_dims == 2:
+            data = generate_structure_functions_2d(
+                *fields, *coords, scalar=scalar, **kwargs
+            )
+        else:
+            data = generate_structure_functions_3d(
+                *fields, *coords, scalar=scalar, **kwargs
+            )
+        result = SFResult.from_dict(data)
+
+        # Pair counts only change with the missing data, e.g. not for a fixed land
+        # mask, so they are only recalculated if the missing data change
+        snapshot_missing = [
+            np.isnan(field) for field in [*fields, scalar] if field is not None
+        ]
+        if missing is None or not all(
+            np.array_equal(previous, current)
+            for previous, current in zip(missing, snapshot_missing, strict=True)
+        ):
+            missing = snapshot_missing
+            key_counts = _pair_counts(
+                _missing_fields(fields, scalar, coords, options["sf_type"]),
+                options["sf_type"],
+                periodic,
+                {
+                    direction: len(diffs)
+                    for direction, diffs in result.separations.items()
+                },
+            )
+        results.append(
+            SFResult(
+                result.values,
+                result.keys_by_direction,
+                result.separations,
+                {
+                    direction: np.stack([key_counts[key] for key in keys])
+                    for direction, keys in result.keys_by_direction.items()
+                },
+            )
+        )
+
+    # Mean over snapshots, weighted by the number of pairs of each separation
+    result = _aggregate(results).binned(options["nbins"])
+    result.save(options["output_dir"] / (path.stem + ".npz"))
+    return len(results), n_bytes, time.perf_counter() - start
+
+
+def _aggregate(results):
+    # Mean over all snapshots of all files, weighted by the number of pairs of each
+    # separation
+    first = results[0]
+    values = {}
+    counts = {}
+    for direction in first.values:
+        stacked = np.stack([result.values[direction] for result in results])
+        weights = np.stack(
+            [
+                np.broadcast_to(result.counts[direction], stacked.shape[1:])
+                for result in results
+            ]
+        )
+        valid = ~np.isnan(stacked)
+        counts[direction] = np.sum(weights, axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values[direction] = np.sum(
+                np.where(valid, stacked, 0.0) * weights, axis=0
+            ) / np.sum(valid * weights, axis=0)
+    return SFResult(
+        values, first.keys_by_direction, first.separations, counts, first.nbins
+    )
+
+
+def main(argv=None):
+    """
+    Calculate structure functions for every snapshot of a set of NetCDF, HDF5 or
+    JLD2 files. The 1D, 2D or 3D generator is chosen from the number of velocity
+    variables, and leading axes beyond the spatial axes are treated as snapshots.
+    The mean structure functions of each file are saved as an SFResult to the
+    output directory under the name of the file, and the mean over all files to
+    aggregate.npz. Files are processed in a pool of worker processes, files with
+    an existing output are skipped with --resume, and the throughput is printed.
+    Run ``fluidsf --help`` for the arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="fluidsf",
+        description="Calculate structure functions for a set of files.",
+    )
+    parser.add_argument("files", nargs="+", help="Files or glob patterns.")
+    parser.add_argument(
+        "--variables",
+        nargs="+",
+        required=True,
+        help="Names of the velocity variables, e.g. u v w.",
+    )
+    parser.add_argument("--scalar", help="Name of the scalar variable.")
+    parser.add_argument(
+        "--coords",
+        nargs="+",
+        help="Names of the coordinate variables, ordered x y z. Defaults to indices.",
+    )
+    parser.add_argument(
+        "--sf-type", nargs="+", default=["LL"], help="Structure function types."
+    )
+    parser.add_argument("--engine", help="Engine of the generator.")
+    parser.add_argument(
+        "--boundary", help="Boundary condition of the generator, or 'none'."
+    )
+    parser.add_argument("--nbins", type=int, help="Number of distance bins.")
+    parser.add_argument(
+        "--output-dir", default="fluidsf_output", help="Directory of the results."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Skip files with existing results."
+    )
+    parser.add_argument(
+        "--transpose",
+        action="store_true",
+        help="Reverse the axes of the variables (always done for JLD2 files).",
+    )
+    args = parser.parse_args(argv)
+
+    if not 1 <= len(args.variables) <= 3:
+        parser.error("--variables must name one, two or three velocity variables.")
+    if args.coords is not None and len(args.coords) != len(args.variables):
+        parser.error("--coords must name one coordinate per velocity variable.")
+    paths = sorted(
+        {Path(path) for pattern in args.files for path in glob.glob(pattern)}
+    )
+    if len(paths) == 0:
+        parser.error("No files match the given patterns.")
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if len({path.stem for path in paths}) < len(paths):
+        parser.error("Files must have unique names, since results are named by file.")
+
+    options = {
+        "variables": args.variables,
+        "scalar": args.scalar,
+        "coords": args.coords,
+        "sf_type": args.sf_type,
+        "engine": args.engine,
+        "boundary": args.boundary,
+        "nbins": args.nbins,
+        "transpose": args.transpose,
+        "output_dir": output_dir,
+    }
+    pending = [
+        path
+        for path in paths
+        if not (args.resume and (output_dir / (path.stem + ".npz")).exists())
+    ]
+    if len(pending) < len(paths):
+        print(f"Skipping {len(paths) - len(pending)} files with existing results.")
+
+    start = time.perf_counter()
+    n_snapshots = 0
+    n_bytes = 0
+    if args.workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(args.workers) as executor:
+            futures = {
+                executor.submit(_process_file, path, options): path for path in pending
+            }
+            for future in concurrent.futures.as_completed(futures):
+                snapshots, size, seconds = future.result()
+                n_snapshots += snapshots
+                n_bytes += size
+                print(f"{futures[future].name}: {snapshots} snapshots, {seconds:.2f} s")
+    else:
+        for path in pending:
+            snapshots, size, seconds = _process_file(path, options)
+            n_snapshots += snapshots
+            n_bytes += size
+            print(f"{path.name}: {snapshots} snapshots, {seconds:.2f} s")
+    elapsed = time.perf_counter() - start
+
+    aggregate = _aggregate(
+        [SFResult.load(output_dir / (path.stem + ".npz")) for path in paths]
+    )
+    aggregate.save(output_dir / "aggregate.npz")
+    print(
+        f"Processed {len(pending)} files ({n_snapshots} snapshots, "
+        f"{n_bytes / 1e6:.1f} MB) in {elapsed:.2f} s: "
+        f"{len(pending) / max(elapsed, 1e-9):.2f} files/s, "
+        f"{n_snapshots / max(elapsed, 1e-9):.2f} snapshots/s, "
+        f"{n_bytes / 1e6 / max(elapsed, 1e-9):.1f} MB/s."
+    )
+    return 0
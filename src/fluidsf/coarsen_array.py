@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def coarsen_array(input_array, factor, method="mean"):  # noqa: D417
+    """
+    Coarsen an array by an integer factor along every axis. Trailing points that do
+    not fill a complete block are dropped.
+
+    Parameters
+    ----------
+        input_array: array_like
+            Array to be coarsened.
+        factor: int
+            Coarsening factor along every axis.
+        method: str, optional
+            Either "mean" to average each block of factor points per axis, or
+            "decimate" to keep the first point of each block. Blocks that contain
+            NaNs are NaN when averaged. Defaults to "mean".
+
+    Returns
+    -------
+        coarse_array
+            Coarsened array with every axis length divided by factor.
+    """
+    if method not in ["mean", "decimate"]:
+        raise ValueError("Coarsening method must be 'mean' or 'decimate'.")
+    if not isinstance(factor, int | np.integer) or factor < 1:
+        raise ValueError("Coarsening factor must be a positive integer.")
+
+    input_array = np.asarray(input_array)
+    trimmed = input_array[
+        tuple(slice(0, (n // factor) * factor) for n in input_array.shape)
+    ]
+
+    if factor == 1:
+        return trimmed
+    if method == "decimate":
+        return trimmed[tuple(slice(None, None, factor) for n in trimmed.shape)]
+
+    block_shape = []
+    for n in trimmed.shape:
+        block_shape += [n // factor, factor]
+    return trimmed.reshape(block_shape).mean(axis=tuple(range(1, 2 * trimmed.ndim, 2)))
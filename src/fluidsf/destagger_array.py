@@ -0,0 +1,69 @@
+import numpy as np
+
+
+def destagger_array(input_array, axis, size, periodic=False):  # noqa: D417
+    """
+    Average a field stored on the faces of an Arakawa C-grid to the cell centers
+    along one axis, and difference the two faces of each cell in the same pass.
+    The layout of the faces is given by the length of the axis: size + 1 for both
+    faces of every cell, size for the face on the lower-index side of every cell
+    (e.g. MITgcm velocities), or size - 1 for the faces between cells (e.g. ROMS
+    velocities). Missing faces at the ends of the axis are wrapped around if
+    periodic, otherwise extrapolated linearly.
+
+    Parameters
+    ----------
+        input_array: array_like
+            Array on the faces along axis.
+        axis: int
+            Staggered axis of the array.
+        size: int
+            Number of cell centers along axis.
+        periodic: bool, optional
+            Whether the axis is periodic. Only used if the array has one face per
+            cell. Defaults to False.
+
+    Returns
+    -------
+        tuple:
+            The array averaged to the cell centers and the difference between the
+            upper and lower face of each cell, both with size points along axis.
+    """
+    input_array = np.moveaxis(np.asarray(input_array), axis, 0)
+    n_faces = input_array.shape[0]
+    if n_faces not in (size - 1, size, size + 1) or n_faces < 2:
+        raise ValueError(
+            f"A staggered axis must have {size - 1}, {size} or {size + 1} points, "
+            f"not {n_faces}."
+        )
+
+    shape = (size, *input_array.shape[1:])
+    dtype = np.result_type(input_array.dtype, np.float32)
+    centers = np.empty(shape, dtype=dtype)
+    differences = np.empty(shape, dtype=dtype)
+
+    # Cells with both faces in the array, i.e. cell i between faces i - offset and
+    # i - offset + 1
+    offset = {size + 1: 0, size: 0, size - 1: 1}[n_faces]
+    lower = input_array[:-1]
+    upper = input_array[1:]
+    inner = slice(offset, offset + n_faces - 1)
+    np.add(lower, upper, out=centers[inner])
+    np.subtract(upper, lower, out=differences[inner])
+
+    # Cells with a face outside the array at either end
+    if offset == 1:
+        first_lower = 2 * input_array[0] - input_array[1]
+        centers[0] = first_lower + input_array[0]
+        differences[0] = input_array[0] - first_lower
+    if n_faces < size + 1:
+        last_upper = (
+            input_array[0]
+            if periodic and n_faces == size
+            else 2 * input_array[-1] - input_array[-2]
+        )
+        centers[-1] = input_array[-1] + last_upper
+        differences[-1] = last_upper - input_array[-1]
+    centers *= 0.5
+
+    return np.moveaxis(centers, 0, axis), np.moveaxis(differences, 0, axis)
@@ -0,0 +1,29 @@
+def evaluate_sf_terms(terms, increments):  # noqa: D417
+    """
+    Evaluate a structure function integrand from field increments, i.e. the
+    quantity that is averaged over pairs of points to obtain the structure function.
+
+    Parameters
+    ----------
+        terms: list
+            List of (coeff, factors) terms for a single structure function, as
+            returned by get_sf_terms.
+        increments: dict
+            Dictionary of field increments keyed by field name. Each increment is
+            the field at the shifted point minus the field at the original point.
+
+    Returns
+    -------
+        ndarray:
+            Integrand of the structure function for every pair of points.
+    """
+    integrand = 0
+    for coeff, factors in terms:
+        product = coeff
+        for combination in factors:
+            product = product * sum(
+                weight * increments[field] for field, weight in combination
+            )
+        integrand = integrand + product
+
+    return integrand
@@ -0,0 +1,51 @@
+import itertools
+
+
+def expand_sf_terms(terms, tol=1e-12):  # noqa: D417
+    """
+    Expand a structure function from products of field increments into sums of
+    products of the fields at the two points of each pair. Each increment is the
+    field at the shifted (partner) point minus the field at the original (anchor)
+    point, so a product of k increments expands into 2**k products of anchor and
+    partner values. The mean of each expanded term over pairs is a correlation of
+    an anchor product with a partner product, which can be calculated for many
+    separations at once, e.g. with FFTs.
+
+    Parameters
+    ----------
+        terms: list
+            List of (coeff, factors) terms for a single structure function, as
+            returned by get_sf_terms.
+        tol: float, optional
+            Expanded terms whose coefficients are smaller than tol in magnitude are
+            dropped. Defaults to 1e-12.
+
+    Returns
+    -------
+        dict:
+            Dictionary of coefficients keyed by (anchor_fields, partner_fields),
+            where anchor_fields and partner_fields are sorted tuples of the field
+            names multiplied at the anchor and partner points. An empty tuple means
+            the product is one.
+    """
+    expanded = {}
+    for coeff, factors in terms:
+        options = [
+            [(field, weight, True) for field, weight in combination]
+            + [(field, -weight, False) for field, weight in combination]
+            for combination in factors
+        ]
+        for choice in itertools.product(*options):
+            product = coeff
+            anchor_fields = []
+            partner_fields = []
+            for field, weight, is_partner in choice:
+                product *= weight
+                if is_partner:
+                    partner_fields.append(field)
+                else:
+                    anchor_fields.append(field)
+            key = (tuple(sorted(anchor_fields)), tuple(sorted(partner_fields)))
+            expanded[key] = expanded.get(key, 0.0) + product
+
+    return {key: value for key, value in expanded.items() if abs(value) > tol}
@@ -0,0 +1,122 @@
+import inspect
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .hash_inputs import hash_inputs
+from .sf_result import SFResult
+
+
+def _as_sf_result(data):
+    # SFResult of an output, or None if it cannot store every entry of the output
+    # unchanged (e.g. the "pair-counts" of pooled batch outputs become counts)
+    try:
+        result = SFResult.from_dict(data)
+    except ValueError:
+        return None
+    return result if set(result) == set(data) else None
+
+
+def generate_cached(  # noqa: C901, D417
+    generator, *args, cache_dir=None, max_size=2**30, **kwargs
+):
+    """
+    Call a generate_ module, e.g. generate_structure_functions_2d or
+    generate_sf_maps_2d, and store its output in an on-disk cache, so that calling
+    it again with the same data and parameters loads the stored output instead of
+    recalculating it. Outputs are keyed on a hash of the name of the generator, the
+    version of FluidSF, every input array and every parameter including defaults,
+    and are stored in the .npz format of SFResult (or, for outputs that SFResult
+    cannot store unchanged such as 2D maps, as one .npz entry per output). Once
+    the cache exceeds max_size, the least recently used outputs are deleted.
+    Outputs of random estimators without a seed are not cached.
+
+    Parameters
+    ----------
+        generator: function
+            The generate_ module to call.
+        *args:
+            Positional arguments of the generator.
+        cache_dir: str or Path, optional
+            Directory of the cache. Defaults to None, i.e. the FLUIDSF_CACHE_DIR
+            environment variable if set, otherwise fluidsf in the user cache
+            directory (XDG_CACHE_HOME or ~/.cache).
+        max_size: int, optional
+            Maximum total size of the cached outputs in bytes. Defaults to 2**30
+            (1 GiB).
+        **kwargs:
+            Keyword arguments of the generator.
+
+    Returns
+    -------
+        dict:
+            The dictionary returned by the generator.
+    """
+    from . import __version__
+
+    if cache_dir is None:
+        cache_dir = os.environ.get("FLUIDSF_CACHE_DIR") or (
+            Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "fluidsf"
+        )
+    cache_dir = Path(cache_dir)
+    if max_size < 0:
+        raise ValueError("max_size must be non-negative.")
+
+    bound = inspect.signature(generator).bind(*args, **kwargs)
+    bound.apply_defaults()
+    parameters = bound.arguments
+    random = parameters.get("estimator") == "montecarlo" or (
+        parameters.get("bootstrap_tiles") is not None
+    )
+    if random and parameters.get("seed") is None:
+        return generator(*args, **kwargs)
+
+    digest = hash_inputs(
+        (generator.__module__, generator.__qualname__, __version__), dict(parameters)
+    )
+    path = cache_dir / (digest + ".npz")
+
+    if path.exists():
+        try:
+            with np.load(path, allow_pickle=False) as file:
+                if "nbins" in file.files:
+                    data = SFResult.load(path).to_dict()
+                else:
+                    data = {name: file[name] for name in file.files}
+        except (OSError, ValueError, KeyError):
+            # Incomplete or corrupted files are recalculated
+            path.unlink(missing_ok=True)
+        else:
+            os.utime(path)
+            return data
+
+    data = generator(*args, **kwargs)
+
+    # Write to a temporary file first so that other processes never read a
+    # partially written output
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=cache_dir, suffix=".tmp", delete=False
+    ) as file:
+        result = _as_sf_result(data)
+        if result is None:
+            np.savez(file, **data)
+        else:
+            result.save(file)
+    os.replace(file.name, path)
+
+    # Delete the least recently used outputs beyond the maximum size
+    entries = sorted(
+        (entry.stat().st_mtime, entry.stat().st_size, entry)
+        for entry in cache_dir.glob("*.npz")
+    )
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in entries:
+        if total <= max_size:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+
+    return data
@@ -1,9 +1,12 @@
+import concurrent.futures
 import itertools
 
 import numpy as np
 
 from .calculate_advection_2d import calculate_advection_2d
 from .calculate_sf_maps_2d import calculate_sf_maps_2d
+from .select_separations import select_separations
+from .sf_checkpoint import SFCheckpoint
 
 
 def generate_sf_maps_2d(  # noqa: C901, D417
@@ -16,6 +19,13 @@ def generate_sf_maps_2d(  # noqa: C901, D417
     dx=None,
     dy=None,
     grid_type="uniform",
+    separations=None,
+    max_separation=None,
+    engine="direct",
+    workers=None,
+    checkpoint=None,
+    checkpoint_interval=60.0,
+    axes=(1, 0),
 ):
     """
     Full method for generating 2D maps of structure functions for 2D data, either
@@ -47,6 +57,41 @@ def generate_sf_maps_2d(  # noqa: C901, D417
             Grid spacing in the y-direction. Defaults to None.
         grid_type:str, optional
             Type of grid, can only be "uniform" for these maps.
+        separations: array_like or tuple, optional
+            Subset of integer separations (lags) to calculate along each axis of the
+            map, either an array of lags or a tuple ("log", count) for count
+            log-spaced lags. Defaults to None, i.e. every lag is calculated.
+        max_separation: float, optional
+            Maximum separation distance to calculate, in coordinate units. Only
+            separation vectors within this distance are calculated and the map is
+            trimmed to the smallest rectangle containing them. Map entries outside
+            this distance are NaN. Defaults to None, i.e. no cutoff.
+        engine: str, optional
+            Method used to loop over the separation vectors. Either "direct" to
+            calculate one separation vector at a time, or "blocked" to calculate
+            the separation geometry for all vectors at once and each row of
+            separation vectors with the same x-separation in a separate thread,
+            shifting the data into reused buffers. Both engines give identical
+            results. Defaults to "direct".
+        workers: int, optional
+            Number of threads used by the "blocked" engine. Defaults to None, i.e.
+            the default of concurrent.futures.ThreadPoolExecutor.
+        checkpoint: str or Path, optional
+            Path of a checkpoint file (see SFCheckpoint). The map entries of the
+            completed separation vectors (rows of vectors for the "blocked" engine)
+            are written to this file at most every checkpoint_interval seconds. If
+            the file exists, e.g. after the calculation was interrupted, the
+            completed entries are restored from it and skipped, after checking
+            that it was written for the same data and parameters. The file is
+            deleted once the calculation is complete. Defaults to None, i.e. no
+            checkpoint.
+        checkpoint_interval: float, optional
+            Minimum time in seconds between writes of the checkpoint file. Defaults
+            to 60.
+        axes: tuple, optional
+            Axes of the x- and y-direction in u, v and scalar, e.g. (0, 1) for
+            arrays ordered (x, y) such as Fortran-ordered model output. The arrays
+            are not copied. Defaults to (1, 0).
 
     Returns
     -------
@@ -93,6 +138,16 @@ def generate_sf_maps_2d(  # noqa: C901, D417
                 between points in the x-y plane.
 
     """
+    if engine not in ["direct", "blocked"]:
+        raise ValueError("Engine must be 'direct' or 'blocked'.")
+
+    # Views with the axes ordered (y, x), so that arrays in other layouts are not
+    # copied
+    u = np.moveaxis(u, axes, (1, 0))
+    v = np.moveaxis(v, axes, (1, 0))
+    if scalar is not None:
+        scalar = np.moveaxis(scalar, axes, (1, 0))
+
     # Initialize variables as NoneType
     SF_adv = None
     adv_x = None
@@ -110,8 +165,17 @@ def generate_sf_maps_2d(  # noqa: C901, D417
 
     # Define a list of separation distances to iterate over.
     # Periodic is half the length since the calculation will wrap the data.
-    x_shifts = range(0, int(len(x) / 2))
-    y_shifts = range(-int(len(y) / 2), int(len(y) / 2))
+    # The same lags are used for negative and positive y-separations, so that
+    # log-spaced maps are symmetric, with the lag of half the length only negative.
+    x_lags = select_separations(int(len(x) / 2) + 1, separations)
+    y_lags = select_separations(int(len(y) / 2) + 1, separations)
+    x_shifts = np.concatenate(([0], x_lags[x_lags < int(len(x) / 2)]))
+    y_shifts = np.concatenate((-y_lags[::-1], [0], y_lags[y_lags < int(len(y) / 2)]))
+
+    # Restrict the map to separation vectors within the maximum separation
+    if max_separation is not None:
+        x_shifts = x_shifts[np.abs(x_shifts * (x[1] - x[0])) <= max_separation]
+        y_shifts = y_shifts[np.abs(y_shifts * (y[1] - y[0])) <= max_separation]
 
     # Initialize the structure functions and other arrays
 
@@ -122,36 +186,181 @@ def generate_sf_maps_2d(  # noqa: C901, D417
     y_separations = np.zeros([len(x_shifts), len(y_shifts)])
 
     if any("ASF_V" in t for t in sf_type):
-        SF_adv = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_adv = np.full([len(x_shifts), len(y_shifts)], np.nan)
         adv_x, adv_y = calculate_advection_2d(u, v, x, y, dx, dy, grid_type)
     if any("ASF_S" in t for t in sf_type):
-        SF_scalar_adv = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_scalar_adv = np.full([len(x_shifts), len(y_shifts)], np.nan)
         adv_scalar = calculate_advection_2d(u, v, x, y, dx, dy, grid_type, scalar)
     if any("LL" in t for t in sf_type):
-        SF_LL = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_LL = np.full([len(x_shifts), len(y_shifts)], np.nan)
     if any("TT" in t for t in sf_type):
-        SF_TT = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_TT = np.full([len(x_shifts), len(y_shifts)], np.nan)
     if any("SS" in t for t in sf_type):
-        SF_SS = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_SS = np.full([len(x_shifts), len(y_shifts)], np.nan)
     if any("LLL" in t for t in sf_type):
-        SF_LLL = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_LLL = np.full([len(x_shifts), len(y_shifts)], np.nan)
     if any("LTT" in t for t in sf_type):
-        SF_LTT = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_LTT = np.full([len(x_shifts), len(y_shifts)], np.nan)
     if any("LSS" in t for t in sf_type):
-        SF_LSS = np.zeros([len(x_shifts), len(y_shifts)])
+        SF_LSS = np.full([len(x_shifts), len(y_shifts)], np.nan)
+
+    # Restore the completed separation vectors from a checkpoint, and skip them below
+    done = np.zeros([len(x_shifts), len(y_shifts)], dtype=bool)
+    if checkpoint is not None:
+        checkpointer = SFCheckpoint(
+            checkpoint,
+            {
+                "generator": "generate_sf_maps_2d",
+                "fields": [u, v, scalar, x, y, dx, dy],
+                "parameters": [sf_type, grid_type, separations, max_separation, engine],
+            },
+            checkpoint_interval,
+        )
+        checkpointer.track(
+            {
+                "SF_advection_velocity_xy": SF_adv,
+                "SF_advection_scalar_xy": SF_scalar_adv,
+                "SF_LL_xy": SF_LL,
+                "SF_TT_xy": SF_TT,
+                "SF_SS_xy": SF_SS,
+                "SF_LLL_xy": SF_LLL,
+                "SF_LTT_xy": SF_LTT,
+                "SF_LSS_xy": SF_LSS,
+                "done": done,
+            }
+        )
+        if engine == "direct":
+            checkpointer.track(
+                {
+                    "separation_distances": separation_distances,
+                    "separation_angles": separation_angles,
+                    "x_separations": x_separations,
+                    "y_separations": y_separations,
+                }
+            )
+
+    def store(x_index, y_index, sf_dicts):
+        if any("ASF_V" in t for t in sf_type):
+            SF_adv[x_index, y_index] = sf_dicts["SF_advection_velocity_xy"]
+        if any("ASF_S" in t for t in sf_type):
+            SF_scalar_adv[x_index, y_index] = sf_dicts["SF_advection_velocity_xy"]
+        if any("LL" in t for t in sf_type):
+            SF_LL[x_index, y_index] = sf_dicts["SF_LL_xy"]
+        if any("TT" in t for t in sf_type):
+            SF_TT[x_index, y_index] = sf_dicts["SF_TT_xy"]
+        if any("SS" in t for t in sf_type):
+            SF_SS[x_index, y_index] = sf_dicts["SF_SS_xy"]
+        if any("LLL" in t for t in sf_type):
+            SF_LLL[x_index, y_index] = sf_dicts["SF_LLL_xy"]
+        if any("LTT" in t for t in sf_type):
+            SF_LTT[x_index, y_index] = sf_dicts["SF_LTT_xy"]
+        if any("LSS" in t for t in sf_type):
+            SF_LSS[x_index, y_index] = sf_dicts["SF_LSS_xy"]
+
+    # Calculate the separation geometry of all vectors at once and each row of
+    # separation vectors in a separate thread, shifting into reused buffers
+    if engine == "blocked":
+        x_separations, y_separations = np.meshgrid(
+            x_shifts * (x[1] - x[0]), y_shifts * (y[1] - y[0]), indexing="ij"
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            separation_angles = np.where(
+                x_separations == 0,
+                np.sign(y_separations) * np.pi / 2,
+                np.arctan(y_separations / x_separations),
+            )
+        separation_distances = np.sqrt(x_separations**2 + y_separations**2)
+
+        inputs = {
+            key: value
+            for key, value in {
+                "u": u,
+                "v": v,
+                "adv_x": adv_x,
+                "adv_y": adv_y,
+                "scalar": scalar,
+                "adv_scalar": adv_scalar,
+            }.items()
+            if value is not None
+        }
+
+        def calculate_row(x_index):
+            buffers = {
+                key + "_xy_shift": np.empty(np.shape(value))
+                for key, value in inputs.items()
+            }
+            row = {}
+            for y_index, y_shift in enumerate(y_shifts):
+                if (
+                    max_separation is not None
+                    and separation_distances[x_index, y_index] > max_separation
+                ):
+                    continue
+                # Same as shift_array_xy, without allocating a new array
+                ny, nx = np.shape(u)
+                y_roll = y_shift % ny
+                x_roll = x_shifts[x_index] % nx
+                for key, value in inputs.items():
+                    buffer = buffers[key + "_xy_shift"]
+                    buffer[: ny - y_roll, : nx - x_roll] = value[y_roll:, x_roll:]
+                    buffer[: ny - y_roll, nx - x_roll :] = value[y_roll:, :x_roll]
+                    buffer[ny - y_roll :, : nx - x_roll] = value[:y_roll, x_roll:]
+                    buffer[ny - y_roll :, nx - x_roll :] = value[:y_roll, :x_roll]
+                row[y_index] = calculate_sf_maps_2d(
+                    u,
+                    v,
+                    x,
+                    y,
+                    adv_x,
+                    adv_y,
+                    x_shifts[x_index],
+                    y_shift,
+                    sf_type,
+                    scalar,
+                    adv_scalar,
+                    buffers,
+                )
+            return row
+
+        pending = [
+            x_index for x_index in range(len(x_shifts)) if not done[x_index].all()
+        ]
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            for x_index, row in zip(
+                pending, executor.map(calculate_row, pending), strict=True
+            ):
+                for y_index, SF_dicts in row.items():
+                    store(x_index, y_index, SF_dicts)
+                done[x_index] = True
+                if checkpoint is not None:
+                    checkpointer.update()
 
     # Iterate over separations right and down
-    for x_shift, y_shift in itertools.product(x_shifts, y_shifts):
+    for (x_index, x_shift), (y_index, y_shift) in itertools.product(
+        enumerate(x_shifts), enumerate(y_shifts)
+    ):
+        if engine == "blocked" or done[x_index, y_index]:
+            continue
         x_separation = x_shift * (x[1] - x[0])
         y_separation = y_shift * (y[1] - y[0])
         if x_shift == 0:
-            separation_angles[x_shift, y_shift + int(len(y) / 2)] = (
-                np.sign(y_separation) * np.pi / 2
-            )
+            separation_angles[x_index, y_index] = np.sign(y_separation) * np.pi / 2
         else:
-            separation_angles[x_shift, y_shift + int(len(y) / 2)] = np.arctan(
-                y_separation / x_separation
-            )
+            separation_angles[x_index, y_index] = np.arctan(y_separation / x_separation)
+
+        separation_distances[x_index, y_index] = np.sqrt(
+            x_separation**2 + y_separation**2
+        )
+        x_separations[x_index, y_index] = x_separation
+        y_separations[x_index, y_index] = y_separation
+
+        # Skip separation vectors outside the disc of the maximum separation
+        if (
+            max_separation is not None
+            and separation_distances[x_index, y_index] > max_separation
+        ):
+            done[x_index, y_index] = True
+            continue
 
         SF_dicts = calculate_sf_maps_2d(
             u,
@@ -166,33 +375,13 @@ def generate_sf_maps_2d(  # noqa: C901, D417
             scalar,
             adv_scalar,
         )
+        store(x_index, y_index, SF_dicts)
+        done[x_index, y_index] = True
+        if checkpoint is not None:
+            checkpointer.update()
 
-        separation_distances[x_shift, y_shift + int(len(y) / 2)] = np.sqrt(
-            x_separation**2 + y_separation**2
-        )
-        x_separations[x_shift, y_shift + int(len(y) / 2)] = x_separation
-        y_separations[x_shift, y_shift + int(len(y) / 2)] = y_separation
-
-        if any("ASF_V" in t for t in sf_type):
-            SF_adv[x_shift, y_shift + int(len(y) / 2)] = SF_dicts[
-                "SF_advection_velocity_xy"
-            ]
-        if any("ASF_S" in t for t in sf_type):
-            SF_scalar_adv[x_shift, y_shift + int(len(y) / 2)] = SF_dicts[
-                "SF_advection_velocity_xy"
-            ]
-        if any("LL" in t for t in sf_type):
-            SF_LL[x_shift, y_shift + int(len(y) / 2)] = SF_dicts["SF_LL_xy"]
-        if any("TT" in t for t in sf_type):
-            SF_TT[x_shift, y_shift + int(len(y) / 2)] = SF_dicts["SF_TT_xy"]
-        if any("SS" in t for t in sf_type):
-            SF_SS[x_shift, y_shift + int(len(y) / 2)] = SF_dicts["SF_SS_xy"]
-        if any("LLL" in t for t in sf_type):
-            SF_LLL[x_shift, y_shift + int(len(y) / 2)] = SF_dicts["SF_LLL_xy"]
-        if any("LTT" in t for t in sf_type):
-            SF_LTT[x_shift, y_shift + int(len(y) / 2)] = SF_dicts["SF_LTT_xy"]
-        if any("LSS" in t for t in sf_type):
-            SF_LSS[x_shift, y_shift + int(len(y) / 2)] = SF_dicts["SF_LSS_xy"]
+    if checkpoint is not None:
+        checkpointer.finish()
 
     # When saving data, roll y-axis so that y-values go from most negative to most
     # positive. The arrays created above run y-separations of 0, to most positive, then
@@ -0,0 +1,348 @@
+import itertools
+
+import numpy as np
+
+from .calculate_advection_3d import calculate_advection_3d
+from .expand_sf_terms import expand_sf_terms
+from .select_separations import select_separations
+
+
+def generate_sf_maps_3d(  # noqa: C901, D417
+    u,
+    v,
+    w,
+    x,
+    y,
+    z,
+    sf_type=["ASF_V"],  # noqa: B006
+    scalar=None,
+    separations=None,
+    max_separation=None,
+    cylindrical_bins=None,
+    axes=(2, 1, 0),
+):
+    """
+    Full method for generating 3D maps of structure functions for 3D data, either
+    advective or traditional structure functions, as a function of the separation
+    vector. Supports velocity-based and scalar-based structure functions. Defaults
+    to calculating the velocity-based advective structure functions. Can only be
+    used with evenly-spaced and periodic data.
+
+    Each structure function is written as a sum of means of products of field
+    increments, e.g. the second-order longitudinal structure function is the sum of
+    the means of du_i du_j weighted by the direction cosines of the separation
+    vector. The means are calculated for all separation vectors at once with 3D FFT
+    correlations (rfftn) of the fields at the two points of each pair (see
+    expand_sf_terms). Structure functions are even under reversal of the separation
+    vector, so the map is stored for half of the separation vectors, those with
+    non-negative x-separations. Points where any field of a structure function is
+    NaN are ignored.
+
+    Parameters
+    ----------
+        u: ndarray
+            3D array of u velocity components, with axes ordered (z, y, x).
+        v: ndarray
+            3D array of v velocity components.
+        w: ndarray
+            3D array of w velocity components.
+        x: ndarray
+            1D array of x-coordinates.
+        y: ndarray
+            1D array of y-coordinates.
+        z: ndarray
+            1D array of z-coordinates.
+        sf_type: list
+            List of structure function types to calculate. Accepted list entries must
+            be one or more of the following strings:
+            "ASF_V", "ASF_S", "LL", "TT", "SS", "LLL", "LTT", "LSS". Defaults to
+            ["ASF_V"].
+        scalar: ndarray, optional
+            3D array of scalar values. Defaults to None.
+        separations: array_like or tuple, optional
+            Subset of integer separations (lags) to calculate along each axis of the
+            map, either an array of lags or a tuple ("log", count) for count
+            log-spaced lags. Defaults to None, i.e. every lag is calculated.
+        max_separation: float, optional
+            Maximum separation distance to calculate, in coordinate units. The map
+            is trimmed to the smallest box containing the separation vectors within
+            this distance, and map entries outside this distance are NaN. Defaults
+            to None, i.e. no cutoff.
+        cylindrical_bins: int or tuple, optional
+            Number of equal-width bins of horizontal separation distance and of the
+            magnitude of the vertical separation, either an int for both or a tuple
+            (horizontal_bins, vertical_bins). If given, the structure functions are
+            averaged over all nonzero separation vectors in each bin as each
+            correlation is calculated, so the 3D maps are never stored. Defaults to
+            None.
+        axes: tuple, optional
+            Axes of the x-, y- and z-direction in u, v, w and scalar, e.g.
+            (0, 1, 2) for arrays ordered (x, y, z) such as Fortran-ordered model
+            output. The arrays are not copied. Defaults to (2, 1, 0).
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the requested structure functions and separation
+            distances. If cylindrical_bins is None, the returned dictionary may
+            contain the following keys, with some keys removed if the structure
+            function is not calculated:
+
+                **SF_advection_velocity_xyz**: The advective velocity structure
+                function for separation vectors in 3D.
+
+                **SF_advection_scalar_xyz**: The advective scalar structure function
+                for separation vectors in 3D.
+
+                **SF_LL_xyz**: The second-order longitudinal velocity structure
+                function for separation vectors in 3D.
+
+                **SF_TT_xyz**: The second-order transverse velocity structure
+                function (summed over both transverse directions) for separation
+                vectors in 3D.
+
+                **SF_SS_xyz**: The second-order scalar structure function for
+                separation vectors in 3D.
+
+                **SF_LLL_xyz**: The third-order longitudinal velocity structure
+                function for separation vectors in 3D.
+
+                **SF_LTT_xyz**: The third-order longitudinal-transverse-transverse
+                velocity structure function for separation vectors in 3D.
+
+                **SF_LSS_xyz**: The third-order longitudinal-scalar-scalar structure
+                function for separation vectors in 3D.
+
+                **separation_distances**: 3D array of separation distances.
+
+                **x_separations**: 3D array of x-components of the separations.
+
+                **y_separations**: 3D array of y-components of the separations.
+
+                **z_separations**: 3D array of z-components of the separations.
+
+            The maps are indexed (x, y, z), with x-separations increasing from zero
+            and y- and z-separations increasing from most negative to most positive.
+
+            If cylindrical_bins is given, the structure functions are instead keyed
+            with a "_hz" suffix, e.g. **SF_LL_hz**, and are 2D arrays indexed by
+            (horizontal bin, vertical bin), which are NaN for empty bins. The
+            dictionary also contains the mean horizontal and vertical separation
+            distances of each bin under **horizontal_separations** and
+            **vertical_separations**, and the number of separation vectors in each
+            bin under **bin_counts**.
+    """
+    # Views with the axes ordered (z, y, x), so that arrays in other layouts are not
+    # copied
+    u = np.moveaxis(u, axes, (2, 1, 0))
+    v = np.moveaxis(v, axes, (2, 1, 0))
+    w = np.moveaxis(w, axes, (2, 1, 0))
+    if scalar is not None:
+        scalar = np.moveaxis(scalar, axes, (2, 1, 0))
+
+    shape = np.shape(u)
+    x_spacing = x[1] - x[0]
+    y_spacing = y[1] - y[0]
+    z_spacing = z[1] - z[0]
+
+    # Separations along each axis. Periodic data are calculated up to half the
+    # length, and the x-separations are non-negative unless binning, since the
+    # structure functions are even under reversal of the separation vector.
+    # The same lags are used for negative and positive separations, so that
+    # log-spaced maps are symmetric, with the lag of half the length only negative.
+    def signed_shifts(n):
+        lags = select_separations(int(n / 2) + 1, separations)
+        return np.concatenate((-lags[::-1], [0], lags[lags < int(n / 2)]))
+
+    if cylindrical_bins is None:
+        x_lags = select_separations(int(len(x) / 2) + 1, separations)
+        x_shifts = np.concatenate(([0], x_lags[x_lags < int(len(x) / 2)]))
+    else:
+        x_shifts = signed_shifts(len(x))
+    y_shifts = signed_shifts(len(y))
+    z_shifts = signed_shifts(len(z))
+
+    # Restrict the map to separation vectors within the maximum separation
+    if max_separation is not None:
+        x_shifts = x_shifts[np.abs(x_shifts * x_spacing) <= max_separation]
+        y_shifts = y_shifts[np.abs(y_shifts * y_spacing) <= max_separation]
+        z_shifts = z_shifts[np.abs(z_shifts * z_spacing) <= max_separation]
+
+    # Separation vectors on the (z, y, x) grid of the correlations
+    z_separations, y_separations, x_separations = np.meshgrid(
+        z_shifts * z_spacing, y_shifts * y_spacing, x_shifts * x_spacing, indexing="ij"
+    )
+    separation_distances = np.sqrt(
+        x_separations**2 + y_separations**2 + z_separations**2
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cosines = [
+            np.where(separation_distances > 0, s / separation_distances, 0.0)
+            for s in [x_separations, y_separations, z_separations]
+        ]
+    outside = np.zeros(separation_distances.shape, dtype=bool)
+    if max_separation is not None:
+        outside = separation_distances > max_separation
+    grid_index = np.ix_(z_shifts % shape[0], y_shifts % shape[1], x_shifts % shape[2])
+
+    # Each structure function as a list of (coeff, cosine axes, increment fields)
+    # terms, where the coefficient is multiplied by the direction cosines of the
+    # separation vector along the cosine axes and by the mean product of the
+    # increments of the fields
+    velocity = ("u", "v", "w")
+    L = [(1.0, (i,), (velocity[i],)) for i in range(3)]
+    energy = [(1.0, (), (field, field)) for field in velocity]
+
+    def multiply(*factors):
+        return [
+            (
+                np.prod([t[0] for t in combination]),
+                tuple(sorted(a for t in combination for a in t[1])),
+                tuple(sorted(f for t in combination for f in t[2])),
+            )
+            for combination in itertools.product(*factors)
+        ]
+
+    def negate(terms):
+        return [(-coeff, plane_axes, fields) for coeff, plane_axes, fields in terms]
+
+    map_terms = {}
+    if any("ASF_V" in t for t in sf_type):
+        map_terms["SF_advection_velocity"] = [
+            (1.0, (), tuple(sorted((adv, vel))))
+            for adv, vel in zip(("adv_x", "adv_y", "adv_z"), velocity, strict=True)
+        ]
+    if any("ASF_S" in t for t in sf_type):
+        map_terms["SF_advection_scalar"] = [(1.0, (), ("adv_scalar", "scalar"))]
+    if any("LL" in t for t in sf_type):
+        map_terms["SF_LL"] = multiply(L, L)
+    if any("TT" in t for t in sf_type):
+        map_terms["SF_TT"] = energy + negate(multiply(L, L))
+    if any("SS" in t for t in sf_type):
+        map_terms["SF_SS"] = [(1.0, (), ("scalar", "scalar"))]
+    if any("LLL" in t for t in sf_type):
+        map_terms["SF_LLL"] = multiply(L, L, L)
+    if any("LTT" in t for t in sf_type):
+        map_terms["SF_LTT"] = multiply(L, energy) + negate(multiply(L, L, L))
+    if any("LSS" in t for t in sf_type):
+        map_terms["SF_LSS"] = multiply(L, [(1.0, (), ("scalar", "scalar"))])
+
+    fields = {"u": u, "v": v, "w": w}
+    if scalar is not None:
+        fields["scalar"] = scalar
+    if any("ASF_V" in t for t in sf_type):
+        fields["adv_x"], fields["adv_y"], fields["adv_z"] = calculate_advection_3d(
+            u, v, w, x, y, z
+        )
+    if any("ASF_S" in t for t in sf_type):
+        fields["adv_scalar"] = calculate_advection_3d(u, v, w, x, y, z, scalar)
+
+    # Cylindrical bins of horizontal and vertical separation distance
+    if cylindrical_bins is not None:
+        horizontal_bins, vertical_bins = (
+            int(nbins) for nbins in np.broadcast_to(cylindrical_bins, 2)
+        )
+        horizontal_distances = np.hypot(x_separations, y_separations)
+        vertical_distances = np.abs(z_separations)
+        # The zero separation has zero structure functions, so it is left out of
+        # the bins
+        inside = ~outside & (separation_distances > 0)
+        horizontal_edges = np.histogram_bin_edges(
+            horizontal_distances[inside], horizontal_bins
+        )
+        vertical_edges = np.histogram_bin_edges(
+            vertical_distances[inside], vertical_bins
+        )
+        bin_index = (
+            np.digitize(horizontal_distances, horizontal_edges[1:-1]) * vertical_bins
+            + np.digitize(vertical_distances, vertical_edges[1:-1])
+        )[inside]
+
+        def reduce(values):
+            return np.bincount(
+                bin_index,
+                weights=values[inside],
+                minlength=horizontal_bins * vertical_bins,
+            ).reshape(horizontal_bins, vertical_bins)
+
+        bin_counts = reduce(np.ones(inside.shape))
+
+    def correlate(anchor_spectrum, partner_spectrum):
+        # Sum over anchors of anchor(i) * partner(i + separation) on the map
+        correlation = np.fft.irfftn(
+            np.conj(anchor_spectrum) * partner_spectrum, shape, axes=(0, 1, 2)
+        )
+        return correlation[grid_index]
+
+    data = {}
+    for key, key_terms in map_terms.items():
+        key_fields = sorted({f for _, _, term_fields in key_terms for f in term_fields})
+
+        # Remove the mean of each field to reduce round-off in the correlations;
+        # increments do not depend on it
+        mask = np.ones(shape, dtype=bool)
+        for field in key_fields:
+            mask &= ~np.isnan(fields[field])
+        centered = {}
+        for field in key_fields:
+            values = np.where(mask, fields[field], 0.0)
+            centered[field] = values - mask * (values.sum() / max(mask.sum(), 1))
+
+        # Collect the cosine weights of each correlation of an anchor product with a
+        # partner product, so that each correlation is only calculated once
+        correlations = {}
+        for coeff, plane_axes, term_fields in key_terms:
+            increments = tuple(((field, 1.0),) for field in term_fields)
+            for pair, pair_coeff in expand_sf_terms([(coeff, increments)]).items():
+                weights = correlations.setdefault(pair, {})
+                weights[plane_axes] = weights.get(plane_axes, 0.0) + pair_coeff
+
+        # FFT of the masked product of fields for each anchor or partner monomial
+        spectra = {}
+        for monomials in [*correlations, ((), ())]:
+            for monomial in monomials:
+                if monomial not in spectra:
+                    values = mask.astype(float)
+                    for field in monomial:
+                        values = values * centered[field]
+                    spectra[monomial] = np.fft.rfftn(values)
+
+        # Pairs without NaNs at each separation, with the zero separation removed
+        # since its structure functions are zero
+        counts = np.rint(correlate(spectra[()], spectra[()]))
+        valid = counts > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.where(valid & (separation_distances > 0), 1 / counts, 0.0)
+        valid &= ~outside
+
+        SF_sum = 0
+        for (anchor, partner), weights in correlations.items():
+            weight = 0
+            for plane_axes, axes_coeff in weights.items():
+                weight = weight + axes_coeff * np.prod(
+                    [cosines[axis] for axis in plane_axes], axis=0
+                )
+            SF_term = weight * scale * correlate(spectra[anchor], spectra[partner])
+            if cylindrical_bins is None:
+                SF_sum = SF_sum + SF_term
+            else:
+                SF_sum = SF_sum + reduce(SF_term)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if cylindrical_bins is None:
+                data[key + "_xyz"] = np.where(valid, SF_sum, np.nan).transpose(2, 1, 0)
+            else:
+                data[key + "_hz"] = SF_sum / reduce(valid)
+
+    if cylindrical_bins is None:
+        data["separation_distances"] = separation_distances.transpose(2, 1, 0)
+        data["x_separations"] = x_separations.transpose(2, 1, 0)
+        data["y_separations"] = y_separations.transpose(2, 1, 0)
+        data["z_separations"] = z_separations.transpose(2, 1, 0)
+    else:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            data["horizontal_separations"] = reduce(horizontal_distances) / bin_counts
+            data["vertical_separations"] = reduce(vertical_distances) / bin_counts
+        data["bin_counts"] = bin_counts
+
+    return data
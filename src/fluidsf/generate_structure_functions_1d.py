@@ -5,6 +5,15 @@ import numpy as np
 from .bin_data import bin_data
 from .calculate_separation_distances import calculate_separation_distances
 from .calculate_structure_function_1d import calculate_structure_function_1d
+from .calculate_structure_function_1d_vectorized import (
+    calculate_structure_function_1d_vectorized,
+)
+from .calculate_structure_function_fft import calculate_structure_function_fft
+from .calculate_structure_function_moments import (
+    calculate_structure_function_moments,
+)
+from .get_sf_terms import get_sf_terms
+from .select_separations import select_separations
 from .shift_array_1d import shift_array_1d
 
 
@@ -19,6 +28,10 @@ def generate_structure_functions_1d(  # noqa: C901, D417
     boundary="Periodic",
     grid_type="uniform",
     nbins=None,
+    separations=None,
+    max_separation=None,
+    engine="direct",
+    lag_block=None,
 ):
     """
     Full method for generating traditional structure functions for 1D data.
@@ -56,6 +69,29 @@ def generate_structure_functions_1d(  # noqa: C901, D417
         nbins: int, optional
             Number of bins for binning the data. Defaults to None, i.e. does not bin
             data.
+        separations: array_like or tuple, optional
+            Subset of integer separations (lags) to calculate, either an array of
+            lags or a tuple ("log", count) for count log-spaced lags. Defaults to
+            None, i.e. every lag is calculated.
+        max_separation: float, optional
+            Maximum separation distance to calculate, in coordinate units for a
+            uniform grid or meters for a latlon grid. Lags with larger separation
+            distances are skipped. Defaults to None, i.e. no cutoff.
+        engine: str, optional
+            Method used to calculate the structure functions. Either "direct" to
+            shift the data for each separation in turn, "vectorized" to calculate
+            blocks of separations together with array operations, "fft" to
+            calculate all separations together with FFT correlations, or
+            "moments" to expand each structure function into moments that are
+            calculated from cumulative sums and dot products without shifting
+            the data. The "fft" engine scales as N log N and is by far the
+            fastest for long records when many separations are requested. The
+            "fft" and "moments" engines have round-off errors of order 1e-12
+            relative to the variance of the data. Defaults to "direct".
+        lag_block: int, optional
+            Number of separations calculated together when engine is "vectorized".
+            Memory use is a few arrays of lag_block times the data length.
+            Defaults to None, i.e. blocks of about 4 million pairs.
 
     Returns
     -------
@@ -86,6 +122,8 @@ def generate_structure_functions_1d(  # noqa: C901, D417
         raise ValueError("Boundary condition must be 'Periodic' or None.")
     if grid_type not in ["uniform", "latlon"]:
         raise ValueError("Grid type must be 'uniform' or 'latlon'.")
+    if engine not in ["direct", "vectorized", "fft", "moments"]:
+        raise ValueError("Engine must be 'direct', 'vectorized', 'fft' or 'moments'.")
     if grid_type == "latlon" and y is None:
         raise ValueError(
             "If grid_type is 'latlon', y must be provided."
@@ -115,12 +153,30 @@ def generate_structure_functions_1d(  # noqa: C901, D417
     # Define a list of separation distances to iterate over.
     # Periodic is half the length since the calculation will wrap the data.
     if boundary == "Periodic":
-        sep = range(1, int(len(x) / 2))
+        sep = select_separations(int(len(x) / 2), separations)
     else:
-        sep = range(1, int(len(x) - 1))
+        sep = select_separations(int(len(x) - 1), separations)
+
+    # Calculate separation distances along track
+    if grid_type == "uniform":
+        sep_distances = np.asarray(x, dtype=float)[sep] - x[0]
+    else:
+        yroll = shift_array_1d(y, shift_by=1, boundary=boundary)
+        sep_distances = np.zeros(len(sep))
+        for sep_index, sep_id in enumerate(sep):
+            sep_distances[sep_index], tmp = calculate_separation_distances(
+                x[0], y[0], x[sep_id], yroll[0], grid_type
+            )
+
+    # Skip separations beyond the requested maximum
+    if max_separation is not None:
+        within_max = np.abs(sep_distances) <= max_separation
+        sep = sep[within_max]
+        sep_distances = sep_distances[within_max]
 
     # Initialize the separation distance arrays
     xd = np.zeros(len(sep) + 1)
+    xd[1:] = sep_distances
 
     # Initialize the structure function arrays
     if "LL" in sf_type:
@@ -142,49 +198,67 @@ def generate_structure_functions_1d(  # noqa: C901, D417
             stacklevel=2,
         )
 
-    # Iterate over separations
-    for sep_id in sep:
-        if boundary == "Periodic":
-            xroll = shift_array_1d(x, shift_by=sep_id, boundary="Periodic")
-            if y is not None:
-                yroll = shift_array_1d(y, shift_by=1, boundary="Periodic")
-        else:
-            xroll = shift_array_1d(x, shift_by=sep_id, boundary=None)
-            if y is not None:
-                yroll = shift_array_1d(y, shift_by=1, boundary=None)
-
-        SF_dicts = calculate_structure_function_1d(
-            u,
-            sep_id,
-            sf_type,
-            v,
-            scalar,
-            boundary,
-        )
-
-        if "LL" in sf_type:
-            SF_LL[sep_id] = SF_dicts["SF_LL"]
-        if "TT" in sf_type:
-            SF_TT[sep_id] = SF_dicts["SF_TT"]
-        if "SS" in sf_type:
-            SF_SS[sep_id] = SF_dicts["SF_SS"]
-        if "LLL" in sf_type:
-            SF_LLL[sep_id] = SF_dicts["SF_LLL"]
-        if "LTT" in sf_type:
-            SF_LTT[sep_id] = SF_dicts["SF_LTT"]
-        if "LSS" in sf_type and scalar is not None:
-            SF_LSS[sep_id] = SF_dicts["SF_LSS"]
-
-        # Calculate separation distances along track
-        if y is not None:
-            xd[sep_id], tmp = calculate_separation_distances(
-                x[0], y[0], xroll[0], yroll[0], grid_type
+    # Calculate many separations together if requested
+    if engine != "direct":
+        if engine == "vectorized":
+            SF_lags = calculate_structure_function_1d_vectorized(
+                u, sep, sf_type, v, scalar, boundary, lag_block
             )
         else:
-            xd[sep_id], tmp = calculate_separation_distances(
-                x[0], None, xroll[0], None, grid_type
+            if engine == "fft":
+                calculate_all = calculate_structure_function_fft
+            else:
+                calculate_all = calculate_structure_function_moments
+            SF_lags = calculate_all(
+                {
+                    key: np.asarray(value, dtype=float)
+                    for key, value in {"u": u, "v": v, "scalar": scalar}.items()
+                    if value is not None
+                },
+                {
+                    key: terms
+                    for key, terms in get_sf_terms(sf_type, (1, 0)).items()
+                    if key[3:] in sf_type
+                },
+                0,
+                boundary == "Periodic",
+                sep,
+            )
+        for key, value in {
+            "SF_LL": SF_LL,
+            "SF_TT": SF_TT,
+            "SF_SS": SF_SS,
+            "SF_LLL": SF_LLL,
+            "SF_LTT": SF_LTT,
+            "SF_LSS": SF_LSS,
+        }.items():
+            if value is not None:
+                value[1:] = SF_lags[key]
+    else:
+        # Otherwise iterate over separations
+        for sep_index, sep_id in enumerate(sep, start=1):
+            SF_dicts = calculate_structure_function_1d(
+                u,
+                sep_id,
+                sf_type,
+                v,
+                scalar,
+                boundary,
             )
 
+            if "LL" in sf_type:
+                SF_LL[sep_index] = SF_dicts["SF_LL"]
+            if "TT" in sf_type:
+                SF_TT[sep_index] = SF_dicts["SF_TT"]
+            if "SS" in sf_type:
+                SF_SS[sep_index] = SF_dicts["SF_SS"]
+            if "LLL" in sf_type:
+                SF_LLL[sep_index] = SF_dicts["SF_LLL"]
+            if "LTT" in sf_type:
+                SF_LTT[sep_index] = SF_dicts["SF_LTT"]
+            if "LSS" in sf_type and scalar is not None:
+                SF_LSS[sep_index] = SF_dicts["SF_LSS"]
+
     # Bin the data if requested
     if nbins is not None:
         if "LL" in sf_type:
@@ -0,0 +1,255 @@
+import numpy as np
+
+from .calculate_separation_distances import calculate_separation_distances
+from .calculate_structure_function_fft import calculate_structure_function_fft
+from .get_sf_terms import get_sf_terms
+
+
+def generate_structure_functions_1d_batch(  # noqa: C901, D417
+    u,
+    x,
+    offsets=None,
+    sf_type=["LLL"],  # noqa: B006
+    v=None,
+    y=None,
+    scalar=None,
+    boundary=None,
+    grid_type="uniform",
+    pool=False,
+    bins=None,
+):
+    """
+    Generate traditional structure functions for a batch of 1D tracks of different
+    lengths, e.g. ship or glider segments. The tracks are sorted by length and
+    padded into 2D chunks, and all separations (lags) of all tracks in a chunk are
+    calculated together with FFT correlations, so the cost does not grow with the
+    number of Python calls per track. Pairs are only formed within a track, and
+    pairs that contain NaNs are ignored. The
+    structure functions of each track match generate_structure_functions_1d, and
+    can optionally be pooled over all tracks, weighting every pair equally.
+
+    Parameters
+    ----------
+        u: ndarray or list
+            Concatenated 1D array of u velocity components of all tracks, or a list
+            of 1D arrays, one per track.
+        x: ndarray or list
+            Coordinates along the tracks, in the same layout as u. If you have
+            lat-lon data, set x to the latitudes.
+        offsets: array_like, optional
+            CSR-style offsets of the tracks in the concatenated arrays, i.e. track
+            i is u[offsets[i]:offsets[i + 1]]. Required if u is an array and
+            ignored if u is a list. Defaults to None.
+        sf_type: list
+            List of traditional structure function types to calculate.
+            Accepted list entries must be one or more of the following strings:
+            "LL", "TT", "SS", "LLL", "LTT", "LSS". Defaults to ["LLL"].
+        v: ndarray or list, optional
+            v velocity components, in the same layout as u. Defaults to None.
+        y: ndarray or list, optional
+            Coordinates orthogonal to x, in the same layout as u. If you have
+            lat-lon data, set y to the longitudes. Defaults to None.
+        scalar: ndarray or list, optional
+            Scalar values, in the same layout as u. Defaults to None.
+        boundary: str, optional
+            Boundary condition of every track, either "Periodic" or None.
+            Defaults to None.
+        grid_type: str, optional
+            Type of grid, either "uniform" or "latlon". The separation distance of
+            a lag is calculated from the first point of each track with
+            calculate_separation_distances, as in generate_structure_functions_1d,
+            and is in meters for latlon grids. Defaults to "uniform".
+        pool: bool, optional
+            Whether to pool the structure functions of all tracks. Defaults to
+            False, i.e. structure functions are returned per track.
+        bins: int or array_like, optional
+            Number of equal-width distance bins, or an array of bin edges, used to
+            pool the tracks when pool is True. Defaults to None, i.e. the tracks
+            are pooled by lag.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the requested structure functions, keyed by
+            "SF_LL", "SF_TT", "SF_SS", "SF_LLL", "SF_LTT" and "SF_LSS", the
+            separation distances under **x-diffs** and the number of pairs that
+            were formed (including pairs with NaNs) under **pair-counts**.
+
+            If pool is False, each entry is a 2D array with one row per track and
+            one column per lag, starting at lag 0 (which is zero). Lags that a
+            track is too short for are NaN.
+
+            If pool is True, each entry is a 1D array with one value per lag
+            (starting at lag 0) or per non-empty distance bin. Structure functions
+            are averaged over all pairs of all tracks, and distances are averaged
+            with the same weights.
+    """
+    # Error handling
+    if boundary not in ["Periodic", None]:
+        raise ValueError("Boundary condition must be 'Periodic' or None.")
+    if grid_type not in ["uniform", "latlon"]:
+        raise ValueError("Grid type must be 'uniform' or 'latlon'.")
+    if grid_type == "latlon" and y is None:
+        raise ValueError(
+            "If grid_type is 'latlon', y must be provided."
+            " Ensure x is latitude and y is longitude."
+        )
+    if scalar is None and ("SS" in sf_type or "LSS" in sf_type):
+        raise ValueError(
+            "If you include 'SS' or 'LSS' in sf_type, you must provide a scalar array."
+        )
+    if v is None and ("TT" in sf_type or "LTT" in sf_type):
+        raise ValueError(
+            "If you include 'TT' or 'LTT' in sf_type, you must provide a v array."
+        )
+
+    # Concatenate lists of tracks
+    if isinstance(u, list | tuple):
+        offsets = np.concatenate(([0], np.cumsum([len(track) for track in u])))
+        u, x, v, y, scalar = (
+            None if value is None else np.concatenate(value)
+            for value in [u, x, v, y, scalar]
+        )
+    if offsets is None:
+        raise ValueError("offsets must be provided if u is an array.")
+    offsets = np.asarray(offsets, dtype=int)
+    if offsets[0] != 0 or offsets[-1] != len(u) or np.any(np.diff(offsets) < 0):
+        raise ValueError(
+            "offsets must increase from 0 to the length of the concatenated arrays."
+        )
+
+    fields = {
+        key: np.asarray(value, dtype=float)
+        for key, value in {"u": u, "v": v, "scalar": scalar}.items()
+        if value is not None
+    }
+    terms = {
+        key: key_terms
+        for key, key_terms in get_sf_terms(sf_type, (1, 0)).items()
+        if key[3:] in sf_type
+    }
+    x = np.asarray(x, dtype=float)
+    if y is not None:
+        y = np.asarray(y, dtype=float)
+
+    lengths = np.diff(offsets)
+    n_tracks = len(lengths)
+
+    # Largest lag of each track, following generate_structure_functions_1d
+    if boundary == "Periodic":
+        max_lags = lengths // 2 - 1
+    else:
+        max_lags = lengths - 2
+    max_lags = np.maximum(max_lags, 0)
+    n_lags = max_lags.max(initial=0) + 1
+    lags = np.arange(n_lags)
+    within_track = lags <= max_lags[:, None]
+
+    # Sort the tracks by length and pad them with NaNs into chunks of similar
+    # length, so that all lags of a chunk are calculated with FFT correlations.
+    # Periodic tracks wrap around, so each of their chunks has a single length.
+    SF_tracks = {key: np.full((n_tracks, n_lags), np.nan) for key in terms}
+    counts = {key: np.zeros((n_tracks, n_lags)) for key in terms}
+    order = np.argsort(lengths, kind="stable")
+    order = order[max_lags[order] > 0]
+    start = 0
+    while start < len(order):
+        stop = start + 1
+        while (
+            stop < len(order)
+            and (stop - start + 1) * lengths[order[stop]] <= 2**22
+            and (boundary is None or lengths[order[stop]] == lengths[order[start]])
+        ):
+            stop += 1
+        chunk = order[start:stop]
+        chunk_length = lengths[chunk].max()
+        chunk_lags = np.arange(1, max_lags[chunk].max() + 1)
+
+        index = offsets[chunk][:, None] + np.arange(chunk_length)
+        in_track = np.arange(chunk_length) < lengths[chunk][:, None]
+        padded = {
+            key: np.where(in_track, value[np.where(in_track, index, 0)], np.nan)
+            for key, value in fields.items()
+        }
+        SF_chunk = calculate_structure_function_fft(
+            padded,
+            terms,
+            1,
+            boundary == "Periodic",
+            chunk_lags,
+            keep_axes=(0,),
+            return_counts=True,
+        )
+        for key in terms:
+            SF_tracks[key][chunk, 1 : len(chunk_lags) + 1] = SF_chunk[key]
+            counts[key][chunk, 1 : len(chunk_lags) + 1] = SF_chunk[key + "_counts"]
+        start = stop
+
+    for key in terms:
+        SF_tracks[key][~within_track] = np.nan
+        SF_tracks[key][:, 0] = 0
+        counts[key][~within_track] = 0
+
+    # Number of pairs formed at each lag, including pairs with NaNs
+    if boundary == "Periodic":
+        pair_counts = np.where(within_track, lengths[:, None], 0)
+    else:
+        pair_counts = np.where(within_track, lengths[:, None] - lags, 0)
+    pair_counts[:, 0] = 0
+
+    # Separation distances from the first point of each track
+    distances = np.full((n_tracks, n_lags), np.nan)
+    distances[:, 0] = 0
+    for lag in range(1, n_lags):
+        first = offsets[:-1][max_lags >= lag]
+        if grid_type == "latlon":
+            # Same call as generate_structure_functions_1d for each track, with
+            # the second point of the track as the shifted longitude
+            distances[max_lags >= lag, lag] = [
+                calculate_separation_distances(
+                    x[index], y[index], x[index + lag], y[index + 1], grid_type
+                )[0]
+                for index in first
+            ]
+        else:
+            distances[max_lags >= lag, lag] = x[first + lag] - x[first]
+
+    if not pool:
+        data = dict(SF_tracks)
+        data["x-diffs"] = distances
+        data["pair-counts"] = pair_counts
+        return data
+
+    # Pool the tracks by lag or by distance bin, weighting every pair equally
+    pooled = (pair_counts > 0) & ~np.isnan(distances)
+    if bins is None:
+        group = np.broadcast_to(np.arange(n_lags), distances.shape)
+        n_groups = n_lags
+    else:
+        edges = np.histogram_bin_edges(distances[pooled], bins)
+        pooled &= (distances >= edges[0]) & (distances <= edges[-1])
+        group = np.digitize(distances, edges[1:-1])
+        n_groups = len(edges) - 1
+    group = group[pooled]
+
+    def pool_sum(values):
+        return np.bincount(group, weights=values[pooled], minlength=n_groups)
+
+    total_pairs = pool_sum(pair_counts)
+    data = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for key in terms:
+            sums = np.where(counts[key] > 0, SF_tracks[key] * counts[key], 0)
+            data[key] = pool_sum(sums) / pool_sum(counts[key])
+        data["x-diffs"] = pool_sum(distances * pair_counts) / total_pairs
+    data["pair-counts"] = total_pairs
+
+    if bins is None:
+        # Lag 0 is zero, as in generate_structure_functions_1d
+        for key in [*terms, "x-diffs"]:
+            data[key][0] = 0
+    else:
+        for key in data:
+            data[key] = data[key][total_pairs > 0]
+
+    return data
@@ -1,14 +1,31 @@
 import warnings
 
 import numpy as np
+import pandas as pd
+from geopy.distance import great_circle
 
 from .bin_data import bin_data
 from .calculate_advection_2d import calculate_advection_2d
+from .calculate_decorrelation_length import calculate_decorrelation_length
 from .calculate_separation_distances import calculate_separation_distances
 from .calculate_structure_function_2d import (
     calculate_structure_function_2d,
 )
-from .shift_array_1d import shift_array_1d
+from .calculate_structure_function_fft import calculate_structure_function_fft
+from .calculate_structure_function_moments import (
+    calculate_structure_function_moments,
+)
+from .calculate_structure_function_montecarlo import (
+    calculate_structure_function_montecarlo,
+)
+from .calculate_structure_function_nd import calculate_structure_function_nd
+from .calculate_tile_bootstrap import calculate_tile_bootstrap
+from .coarsen_array import coarsen_array
+from .destagger_array import destagger_array
+from .get_sf_terms import get_sf_terms
+from .select_coarsening_factors import select_coarsening_factors
+from .select_direction_lags import select_direction_lags
+from .select_separations import select_separations
 
 
 def generate_structure_functions_2d(  # noqa: C901, D417
@@ -23,6 +40,22 @@ def generate_structure_functions_2d(  # noqa: C901, D417
     boundary="periodic-all",
     grid_type="uniform",
     nbins=None,
+    separations=None,
+    max_separation=None,
+    estimator="direct",
+    rtol=0.01,
+    max_samples=None,
+    seed=None,
+    native_lags=16,
+    coarsen="mean",
+    engine="direct",
+    directions=None,
+    uncertainty=False,
+    bootstrap_tiles=None,
+    n_resamples=1000,
+    confidence_level=0.9,
+    staggered=False,
+    axes=(1, 0),
 ):
     """
     Full method for generating structure functions for 2D data, including advective
@@ -59,6 +92,93 @@ def generate_structure_functions_2d(  # noqa: C901, D417
         nbins: int, optional
             Number of bins for binning the data. Defaults to None, i.e. does not bin
             data.
+        separations: array_like or tuple, optional
+            Subset of integer separations (lags) to calculate in each direction,
+            either an array of lags or a tuple ("log", count) for count log-spaced
+            lags. Defaults to None, i.e. every lag is calculated.
+        max_separation: float, optional
+            Maximum separation distance to calculate, in coordinate units for a
+            uniform grid or meters for a latlon grid. Lags with larger separation
+            distances are skipped. Defaults to None, i.e. no cutoff.
+        estimator: str, optional
+            Method used to average over pairs of points. Either "direct" to use
+            every pair, "montecarlo" to estimate each structure function from
+            randomly sampled pairs, or "multiresolution" to calculate larger
+            separations on successively coarsened copies of the data.
+            Defaults to "direct".
+        rtol: float, optional
+            Target standard error relative to the mean magnitude of the sampled
+            values of each structure function (e.g. of du**3 for SF_LLL) when
+            estimator is "montecarlo", so odd-order structure functions with means
+            near zero also converge. Sampling at a separation stops once every
+            structure function meets this target. Defaults to 0.01.
+        max_samples: int, optional
+            Maximum number of pairs sampled per separation when estimator is
+            "montecarlo". Defaults to None, i.e. a quarter of the available pairs.
+        seed: int, optional
+            Seed for the random number generator when estimator is "montecarlo".
+            Defaults to None.
+        native_lags: int, optional
+            Largest separation (in grid points) calculated on the native grid when
+            estimator is "multiresolution". Each following band of separations,
+            twice as long as the previous one, is calculated on a grid coarsened
+            by a further factor of two, and separations are rounded to multiples
+            of their coarsening factor. Defaults to 16.
+        coarsen: str, optional
+            How the data are coarsened when estimator is "multiresolution", either
+            "mean" for block averages or "decimate" to subsample. Defaults to
+            "mean".
+        engine: str, optional
+            Method used to calculate the structure functions when estimator is
+            "direct". Either "direct" to shift the data for each separation in
+            turn, "fft" to calculate all separations in each direction at once
+            with FFT correlations of the fields and of their NaN mask, or
+            "moments" to expand each structure function into moments that are
+            calculated from cumulative sums and dot products without shifting
+            the data. Non-periodic directions are zero-padded for "fft", so NaNs
+            (e.g. land) and non-periodic boundaries give the same result as the
+            "direct" engine with either engine, up to round-off errors of order
+            1e-12 relative to the variance of the data. Defaults to "direct".
+        directions: list, optional
+            List of additional separation directions, each an integer lattice
+            vector (dx, dy) such as (1, 1) or (2, -1). Structure functions are
+            calculated for integer multiples of each vector, with the longitudinal
+            and transverse components projected onto the direction. Requires
+            estimator "direct", and the engine is not used for these directions.
+            Defaults to None, i.e. only axis-aligned directions are calculated.
+        uncertainty: bool, optional
+            Whether to also calculate the variance of the integrand of each
+            structure function over pairs, in the same pass as its mean, and the
+            effective number of independent pairs, i.e. the number of pairs divided
+            by the decorrelation lengths of the fields along each axis (see
+            calculate_decorrelation_length). Only supported for the x- and y-directions
+            with estimator and engine "direct". Defaults to False.
+        bootstrap_tiles: int or tuple, optional
+            Number of tiles along each axis, or a tuple (x_tiles, y_tiles), used to
+            bootstrap the structure functions of a single snapshot. The sums and
+            numbers of pairs of each tile are accumulated in the same pass as the
+            structure functions, with each pair assigned to the tile of its first
+            point, and tiles are then resampled with replacement from these
+            partial sums without recalculating the structure functions (see
+            calculate_tile_bootstrap). Only supported for the x- and y-directions
+            with estimator and engine "direct". Defaults to None, i.e. no
+            bootstrap.
+        n_resamples: int, optional
+            Number of bootstrap resamples of the tiles. Defaults to 1000.
+        confidence_level: float, optional
+            Confidence level of the bootstrap confidence intervals. Defaults to 0.9.
+        staggered: bool, optional
+            Whether u and v are on an Arakawa C-grid, i.e. u on the x-faces and v
+            on the y-faces of the cells centered on x, y and scalar, e.g. MITgcm
+            or ROMS velocities (see destagger_array for the supported layouts).
+            The advection is calculated on the native layout (see
+            calculate_advection_2d), and u and v are averaged to the cell centers
+            for the velocity structure functions, wrapping around periodic
+            boundaries. Defaults to False.
+        axes: tuple, optional
+            Axes of the x- and y-direction in u, v and scalar, e.g. (0, 1) for
+            arrays ordered (x, y) such as Fortran-ordered model output. The arrays
+            are not copied. Defaults to (1, 0).
 
     Returns
     -------
@@ -120,6 +240,39 @@ def generate_structure_functions_2d(  # noqa: C901, D417
 
                 **y-diffs**: The separation distances in the y direction.
 
+            If directions are provided, the dictionary also contains the structure
+            functions and separation distances for each direction, with the
+            components of the direction joined by underscores as the suffix, e.g.
+            **SF_LL_1_1** and **1_1-diffs**.
+
+            If uncertainty is True, the dictionary also contains the variance of the
+            integrand, the effective sample size and the standard error of the mean
+            of each structure function under its key with a "_variance", "_ess" and
+            "_stderr" suffix, e.g. **SF_LL_x_variance**, **SF_LL_x_ess** and
+            **SF_LL_x_stderr**. Binned variances are averaged over each bin, binned
+            effective sample sizes are summed over each bin, and binned standard
+            errors are calculated from both.
+
+            If bootstrap_tiles is given, the dictionary also contains the lower and
+            upper bounds of the confidence interval and the standard deviation of
+            the bootstrap distribution of each structure function under its key
+            with a "_ci_low", "_ci_high" and "_bootstrap_stderr" suffix, e.g.
+            **SF_LL_x_ci_low**. Binned resamples are averaged over each bin before
+            the confidence intervals are calculated.
+
+            If estimator is "montecarlo", the dictionary also contains the standard
+            error of each structure function under its key with a "_stderr" suffix,
+            e.g. **SF_LL_x_stderr**. Binned standard errors are the root mean
+            square of the standard errors in each bin, which is a conservative
+            estimate.
+
+            If estimator is "multiresolution", the dictionary also contains the
+            coarsening factor used at each separation under **x-coarsening** and
+            **y-coarsening**, and a bias estimate of each structure function under
+            its key with a "_bias" suffix, e.g. **SF_LL_x_bias**. The bias of a
+            band is the difference between the coarsened and the next finer grid at
+            the first separation of the band, accumulated over all coarser bands.
+
     """
     # Error handling
 
@@ -144,6 +297,33 @@ def generate_structure_functions_2d(  # noqa: C901, D417
         )
     if grid_type not in ["uniform", "latlon"]:
         raise ValueError("Grid type must be 'uniform' or 'latlon'.")
+    if estimator not in ["direct", "montecarlo", "multiresolution"]:
+        raise ValueError(
+            "Estimator must be 'direct', 'montecarlo' or 'multiresolution'."
+        )
+    if engine not in ["direct", "fft", "moments"]:
+        raise ValueError("Engine must be 'direct', 'fft' or 'moments'.")
+    if engine != "direct" and estimator != "direct":
+        raise ValueError("Engine can only be changed if estimator is 'direct'.")
+    if directions is not None and estimator != "direct":
+        raise ValueError("Directions can only be used if estimator is 'direct'.")
+    if uncertainty and (estimator != "direct" or engine != "direct"):
+        raise ValueError(
+            "Uncertainty can only be calculated if estimator and engine are 'direct'."
+        )
+    if bootstrap_tiles is not None and (estimator != "direct" or engine != "direct"):
+        raise ValueError(
+            "Bootstrap tiles can only be used if estimator and engine are 'direct'."
+        )
+    if bootstrap_tiles is not None:
+        x_tiles, y_tiles = np.broadcast_to(bootstrap_tiles, 2)
+        if not 1 <= x_tiles <= len(x) or not 1 <= y_tiles <= len(y):
+            raise ValueError(
+                "bootstrap_tiles must be between 1 and the number of points along "
+                "each axis."
+            )
+        if x_tiles * y_tiles < 2:
+            raise ValueError("At least two tiles are required to bootstrap.")
 
     if grid_type == "latlon" and (
         isinstance(dx, int | float | None) or isinstance(dy, int | float | None)
@@ -167,6 +347,13 @@ def generate_structure_functions_2d(  # noqa: C901, D417
             "a scalar array."
         )
 
+    # Views with the axes ordered (y, x), so that arrays in other layouts are not
+    # copied
+    u = np.moveaxis(u, axes, (1, 0))
+    v = np.moveaxis(v, axes, (1, 0))
+    if scalar is not None:
+        scalar = np.moveaxis(scalar, axes, (1, 0))
+
     # Initialize variables as NoneType
     SF_adv_x = None
     SF_adv_y = None
@@ -191,31 +378,93 @@ def generate_structure_functions_2d(  # noqa: C901, D417
     # Define a list of separation distances to iterate over.
     # Periodic is half the length since the calculation will wrap the data.
     if boundary == "periodic-all":
-        sep_x = range(1, int(len(x) / 2))
-        sep_y = range(1, int(len(y) / 2))
+        sep_x = select_separations(int(len(x) / 2), separations)
+        sep_y = select_separations(int(len(y) / 2), separations)
     elif boundary == "periodic-x":
-        sep_x = range(1, int(len(x) / 2))
-        sep_y = range(1, int(len(y) - 1))
+        sep_x = select_separations(int(len(x) / 2), separations)
+        sep_y = select_separations(int(len(y) - 1), separations)
     elif boundary == "periodic-y":
-        sep_x = range(1, int(len(x) - 1))
-        sep_y = range(1, int(len(y) / 2))
+        sep_x = select_separations(int(len(x) - 1), separations)
+        sep_y = select_separations(int(len(y) / 2), separations)
     elif boundary is None:
-        sep_x = range(1, int(len(x) - 1))
-        sep_y = range(1, int(len(y) - 1))
+        sep_x = select_separations(int(len(x) - 1), separations)
+        sep_y = select_separations(int(len(y) - 1), separations)
+    periodic_x = boundary in ["periodic-all", "periodic-x"]
+    periodic_y = boundary in ["periodic-all", "periodic-y"]
+
+    # Calculate larger separations on coarsened grids if requested
+    x_coarsening = np.ones(len(sep_x), dtype=int)
+    y_coarsening = np.ones(len(sep_y), dtype=int)
+    if estimator == "multiresolution":
+        sep_x, x_coarsening = select_coarsening_factors(
+            sep_x, native_lags, len(x), periodic_x
+        )
+        sep_y, y_coarsening = select_coarsening_factors(
+            sep_y, native_lags, len(y), periodic_y
+        )
+
+    # Calculate separation distances in x and y
+    x_distances = np.zeros(len(sep_x))
+    y_distances = np.zeros(len(sep_y))
+    for x_index, x_shift in enumerate(sep_x):
+        x_distances[x_index], tmp = calculate_separation_distances(
+            x[0], y[0], x[x_shift], y[0], grid_type
+        )
+    for y_index, y_shift in enumerate(sep_y):
+        tmp, y_distances[y_index] = calculate_separation_distances(
+            x[0], y[0], x[0], y[y_shift], grid_type
+        )
+
+    # Skip separations beyond the requested maximum
+    if max_separation is not None:
+        x_within_max = np.abs(x_distances) <= max_separation
+        y_within_max = np.abs(y_distances) <= max_separation
+        sep_x = sep_x[x_within_max]
+        x_distances = x_distances[x_within_max]
+        x_coarsening = x_coarsening[x_within_max]
+        sep_y = sep_y[y_within_max]
+        y_distances = y_distances[y_within_max]
+        y_coarsening = y_coarsening[y_within_max]
 
     # Initialize the separation distance arrays
     xd = np.zeros(len(sep_x) + 1)
     yd = np.zeros(len(sep_y) + 1)
+    xd[1:] = x_distances
+    yd[1:] = y_distances
 
     # Calculate advection if requested
     if any("ASF_V" in t for t in sf_type):
         SF_adv_x = np.zeros(len(sep_x) + 1)
         SF_adv_y = np.zeros(len(sep_y) + 1)
-        adv_x, adv_y = calculate_advection_2d(u, v, x, y, dx, dy, grid_type)
+        adv_x, adv_y = calculate_advection_2d(
+            u,
+            v,
+            x,
+            y,
+            dx,
+            dy,
+            grid_type,
+            staggered=staggered,
+            periodic=(periodic_x, periodic_y),
+        )
     if any("ASF_S" in t for t in sf_type):
         SF_x_scalar = np.zeros(len(sep_x) + 1)
         SF_y_scalar = np.zeros(len(sep_y) + 1)
-        adv_scalar = calculate_advection_2d(u, v, x, y, dx, dy, grid_type, scalar)
+        adv_scalar = calculate_advection_2d(
+            u,
+            v,
+            x,
+            y,
+            dx,
+            dy,
+            grid_type,
+            scalar,
+            staggered,
+            periodic=(periodic_x, periodic_y),
+        )
+    if staggered:
+        u = destagger_array(u, 1, len(x), periodic_x)[0]
+        v = destagger_array(v, 0, len(y), periodic_y)[0]
     if any("LL" in t for t in sf_type):
         SF_x_LL = np.zeros(len(sep_x) + 1)
         SF_y_LL = np.zeros(len(sep_y) + 1)
@@ -241,90 +490,344 @@ def generate_structure_functions_2d(  # noqa: C901, D417
             stacklevel=2,
         )
 
+    # Set up the structure function terms unless shifting the data directly
+    if (
+        estimator != "direct"
+        or engine != "direct"
+        or directions is not None
+        or uncertainty
+        or bootstrap_tiles is not None
+    ):
+        fields = {
+            key: value
+            for key, value in {
+                "u": u,
+                "v": v,
+                "adv_x": adv_x,
+                "adv_y": adv_y,
+                "scalar": scalar,
+                "adv_scalar": adv_scalar,
+            }.items()
+            if value is not None
+        }
+        x_terms = {
+            name + "_x": terms for name, terms in get_sf_terms(sf_type, (1, 0)).items()
+        }
+        y_terms = {
+            name + "_y": terms for name, terms in get_sf_terms(sf_type, (0, 1)).items()
+        }
+
+    if estimator == "montecarlo":
+        SF_stderr = {key + "_stderr": np.zeros(len(sep_x) + 1) for key in x_terms}
+        SF_stderr.update({key + "_stderr": np.zeros(len(sep_y) + 1) for key in y_terms})
+        rng = np.random.default_rng(seed)
+
+    if estimator == "multiresolution":
+        levels = {}
+        levels_periodic = {}
+        factor = 1
+        while factor <= max(x_coarsening.max(initial=1), y_coarsening.max(initial=1)):
+            levels[factor] = {
+                key: coarsen_array(value, factor, coarsen)
+                for key, value in fields.items()
+            }
+            levels_periodic[factor] = (
+                periodic_y and len(y) % factor == 0,
+                periodic_x and len(x) % factor == 0,
+            )
+            factor *= 2
+
+    # Decorrelation area (or volume) of each field in grid points, which reduces the
+    # number of independent pairs
+    if uncertainty:
+        SF_uncertainty = {}
+        for terms, sep in [(x_terms, sep_x), (y_terms, sep_y)]:
+            for key in terms:
+                for suffix in ["_variance", "_ess", "_stderr"]:
+                    SF_uncertainty[key + suffix] = np.zeros(len(sep) + 1)
+        decorrelation = {
+            field: np.prod(
+                [
+                    calculate_decorrelation_length(value, axis, axis_periodic)
+                    for axis, axis_periodic in enumerate([periodic_y, periodic_x])
+                ]
+            )
+            for field, value in fields.items()
+        }
+
+        def store_uncertainty(sf_dicts, terms, index):
+            for key, key_terms in terms.items():
+                key_decorrelation = max(
+                    decorrelation[field]
+                    for coeff, factors in key_terms
+                    for combination in factors
+                    for field, weight in combination
+                )
+                counts = sf_dicts[key + "_counts"]
+                ess = min(counts, max(1.0, counts / key_decorrelation))
+                SF_uncertainty[key + "_variance"][index] = sf_dicts[key + "_variance"]
+                SF_uncertainty[key + "_ess"][index] = ess
+                SF_uncertainty[key + "_stderr"][index] = np.sqrt(
+                    sf_dicts[key + "_variance"] / ess
+                )
+
+    # Tile of the first point of each pair, and the sums and numbers of pairs of
+    # each tile. The zero separation has one pair per tile so that it stays zero.
+    tile_index = None
+    if bootstrap_tiles is not None:
+        n_tiles = x_tiles * y_tiles
+        tile_index = (np.arange(len(y)) * y_tiles // len(y))[:, None] * x_tiles + (
+            np.arange(len(x)) * x_tiles // len(x)
+        )
+        tile_sums = {}
+        tile_counts = {}
+        for terms, sep in [(x_terms, sep_x), (y_terms, sep_y)]:
+            for key in terms:
+                tile_sums[key] = np.zeros((len(sep) + 1, n_tiles))
+                tile_counts[key] = np.zeros((len(sep) + 1, n_tiles))
+                tile_counts[key][0] = 1
+
+        def store_tiles(sf_dicts, terms, index):
+            for key in terms:
+                tile_sums[key][index] = sf_dicts[key + "_tile_sums"]
+                tile_counts[key][index] = sf_dicts[key + "_tile_counts"]
+
+    # Calculate all separations in each direction at once if requested
+    if engine in ["fft", "moments"]:
+        if engine == "fft":
+            calculate_all = calculate_structure_function_fft
+        else:
+            calculate_all = calculate_structure_function_moments
+        x_all = calculate_all(fields, x_terms, 1, periodic_x, sep_x)
+        y_all = calculate_all(fields, y_terms, 0, periodic_y, sep_y)
+
     # Iterate over separations in x and y
-    for x_shift in sep_x:
+    for x_index, x_shift in enumerate(sep_x, start=1):
         y_shift = 1
-        if boundary == "periodic-all" or boundary == "periodic-x":
-            xroll = shift_array_1d(x, shift_by=x_shift, boundary="Periodic")
+        if estimator == "montecarlo":
+            SF_dicts = calculate_structure_function_montecarlo(
+                fields,
+                x_terms,
+                (0, x_shift),
+                (periodic_y, periodic_x),
+                rng,
+                rtol,
+                max_samples,
+            )
+            for key in x_terms:
+                SF_stderr[key + "_stderr"][x_index] = SF_dicts[key + "_stderr"]
+        elif estimator == "multiresolution":
+            factor = x_coarsening[x_index - 1]
+            SF_dicts = calculate_structure_function_nd(
+                levels[factor], x_terms, (0, x_shift // factor), levels_periodic[factor]
+            )
+        elif uncertainty or bootstrap_tiles is not None:
+            SF_dicts = calculate_structure_function_nd(
+                fields,
+                x_terms,
+                (0, x_shift),
+                (periodic_y, periodic_x),
+                return_variance=uncertainty,
+                tile_index=tile_index,
+            )
+            if uncertainty:
+                store_uncertainty(SF_dicts, x_terms, x_index)
+            if bootstrap_tiles is not None:
+                store_tiles(SF_dicts, x_terms, x_index)
+        elif engine != "direct":
+            SF_dicts = {key: x_all[key][x_index - 1] for key in x_terms}
         else:
-            xroll = shift_array_1d(x, shift_by=x_shift, boundary=None)
-
-        SF_dicts = calculate_structure_function_2d(
-            u,
-            v,
-            adv_x,
-            adv_y,
-            x_shift,
-            y_shift,
-            sf_type,
-            scalar,
-            adv_scalar,
-            boundary,
-        )
+            SF_dicts = calculate_structure_function_2d(
+                u,
+                v,
+                adv_x,
+                adv_y,
+                x_shift,
+                y_shift,
+                sf_type,
+                scalar,
+                adv_scalar,
+                boundary,
+            )
 
         if any("ASF_V" in t for t in sf_type):
-            SF_adv_x[x_shift] = SF_dicts["SF_advection_velocity_x"]
+            SF_adv_x[x_index] = SF_dicts["SF_advection_velocity_x"]
         if any("LL" in t for t in sf_type):
-            SF_x_LL[x_shift] = SF_dicts["SF_LL_x"]
+            SF_x_LL[x_index] = SF_dicts["SF_LL_x"]
         if any("TT" in t for t in sf_type):
-            SF_x_TT[x_shift] = SF_dicts["SF_TT_x"]
+            SF_x_TT[x_index] = SF_dicts["SF_TT_x"]
         if any("SS" in t for t in sf_type):
-            SF_x_SS[x_shift] = SF_dicts["SF_SS_x"]
+            SF_x_SS[x_index] = SF_dicts["SF_SS_x"]
         if any("LLL" in t for t in sf_type):
-            SF_x_LLL[x_shift] = SF_dicts["SF_LLL_x"]
+            SF_x_LLL[x_index] = SF_dicts["SF_LLL_x"]
         if any("LTT" in t for t in sf_type):
-            SF_x_LTT[x_shift] = SF_dicts["SF_LTT_x"]
+            SF_x_LTT[x_index] = SF_dicts["SF_LTT_x"]
         if any("ASF_S" in t for t in sf_type):
-            SF_x_scalar[x_shift] = SF_dicts["SF_advection_scalar_x"]
+            SF_x_scalar[x_index] = SF_dicts["SF_advection_scalar_x"]
         if any("LSS" in t for t in sf_type):
-            SF_x_LSS[x_shift] = SF_dicts["SF_LSS_x"]
+            SF_x_LSS[x_index] = SF_dicts["SF_LSS_x"]
 
-        # Calculate separation distances in x
-        xd[x_shift], tmp = calculate_separation_distances(
-            x[0], y[0], xroll[0], y[0], grid_type
-        )
-
-    for y_shift in sep_y:
+    for y_index, y_shift in enumerate(sep_y, start=1):
         x_shift = 1
-        if boundary == "periodic-all" or boundary == "periodic-y":
-            yroll = shift_array_1d(y, shift_by=y_shift, boundary="Periodic")
+        if estimator == "montecarlo":
+            SF_dicts = calculate_structure_function_montecarlo(
+                fields,
+                y_terms,
+                (y_shift, 0),
+                (periodic_y, periodic_x),
+                rng,
+                rtol,
+                max_samples,
+            )
+            for key in y_terms:
+                SF_stderr[key + "_stderr"][y_index] = SF_dicts[key + "_stderr"]
+        elif estimator == "multiresolution":
+            factor = y_coarsening[y_index - 1]
+            SF_dicts = calculate_structure_function_nd(
+                levels[factor], y_terms, (y_shift // factor, 0), levels_periodic[factor]
+            )
+        elif uncertainty or bootstrap_tiles is not None:
+            SF_dicts = calculate_structure_function_nd(
+                fields,
+                y_terms,
+                (y_shift, 0),
+                (periodic_y, periodic_x),
+                return_variance=uncertainty,
+                tile_index=tile_index,
+            )
+            if uncertainty:
+                store_uncertainty(SF_dicts, y_terms, y_index)
+            if bootstrap_tiles is not None:
+                store_tiles(SF_dicts, y_terms, y_index)
+        elif engine != "direct":
+            SF_dicts = {key: y_all[key][y_index - 1] for key in y_terms}
         else:
-            yroll = shift_array_1d(y, shift_by=y_shift, boundary=None)
-
-        SF_dicts = calculate_structure_function_2d(
-            u,
-            v,
-            adv_x,
-            adv_y,
-            x_shift,
-            y_shift,
-            sf_type,
-            scalar,
-            adv_scalar,
-            boundary,
-        )
+            SF_dicts = calculate_structure_function_2d(
+                u,
+                v,
+                adv_x,
+                adv_y,
+                x_shift,
+                y_shift,
+                sf_type,
+                scalar,
+                adv_scalar,
+                boundary,
+            )
 
         if any("ASF_V" in t for t in sf_type):
-            SF_adv_y[y_shift] = SF_dicts["SF_advection_velocity_y"]
+            SF_adv_y[y_index] = SF_dicts["SF_advection_velocity_y"]
         if any("LL" in t for t in sf_type):
-            SF_y_LL[y_shift] = SF_dicts["SF_LL_y"]
+            SF_y_LL[y_index] = SF_dicts["SF_LL_y"]
         if any("TT" in t for t in sf_type):
-            SF_y_TT[y_shift] = SF_dicts["SF_TT_y"]
+            SF_y_TT[y_index] = SF_dicts["SF_TT_y"]
         if any("SS" in t for t in sf_type):
-            SF_y_SS[y_shift] = SF_dicts["SF_SS_y"]
+            SF_y_SS[y_index] = SF_dicts["SF_SS_y"]
         if any("LLL" in t for t in sf_type):
-            SF_y_LLL[y_shift] = SF_dicts["SF_LLL_y"]
+            SF_y_LLL[y_index] = SF_dicts["SF_LLL_y"]
         if any("LTT" in t for t in sf_type):
-            SF_y_LTT[y_shift] = SF_dicts["SF_LTT_y"]
+            SF_y_LTT[y_index] = SF_dicts["SF_LTT_y"]
         if any("ASF_S" in t for t in sf_type):
-            SF_y_scalar[y_shift] = SF_dicts["SF_advection_scalar_y"]
+            SF_y_scalar[y_index] = SF_dicts["SF_advection_scalar_y"]
         if any("LSS" in t for t in sf_type):
-            SF_y_LSS[y_shift] = SF_dicts["SF_LSS_y"]
-
-        # Calculate separation distances in y
-        tmp, yd[y_shift] = calculate_separation_distances(
-            x[0], y[0], x[0], yroll[0], grid_type
+            SF_y_LSS[y_index] = SF_dicts["SF_LSS_y"]
+
+    # Estimate the bias of each coarsened band from the next finer grid
+    if estimator == "multiresolution":
+        SF_bias = {}
+        for sep, coarsening, terms, axis in [
+            (sep_x, x_coarsening, x_terms, 1),
+            (sep_y, y_coarsening, y_terms, 0),
+        ]:
+            SF_bias.update({key + "_bias": np.zeros(len(sep) + 1) for key in terms})
+            bias = dict.fromkeys(terms, 0.0)
+            for factor in np.unique(coarsening[coarsening > 1]):
+                band = np.flatnonzero(coarsening == factor)
+                shift = [0, 0]
+                shift[axis] = sep[band[0]] // factor
+                coarse_dict = calculate_structure_function_nd(
+                    levels[factor], terms, tuple(shift), levels_periodic[factor]
+                )
+                shift[axis] = sep[band[0]] // (factor // 2)
+                fine_dict = calculate_structure_function_nd(
+                    levels[factor // 2],
+                    terms,
+                    tuple(shift),
+                    levels_periodic[factor // 2],
+                )
+                for key in terms:
+                    bias[key] += coarse_dict[key] - fine_dict[key]
+                    SF_bias[key + "_bias"][band + 1] = bias[key]
+        x_coarsening = np.concatenate(([1], x_coarsening))
+        y_coarsening = np.concatenate(([1], y_coarsening))
+
+    # Resample the tiles, averaging each resample over the bins if requested
+    if bootstrap_tiles is not None:
+        averaging = None
+        if nbins is not None:
+            averaging = {}
+            for key in tile_sums:
+                dd = xd if key.endswith("_x") else yd
+                codes = pd.cut(dd, nbins, duplicates="drop").codes
+                groups = np.unique(codes[codes >= 0])
+                in_group = (codes[:, None] == groups).astype(float)
+                averaging[key] = in_group / in_group.sum(axis=0)
+        SF_bootstrap = calculate_tile_bootstrap(
+            tile_sums,
+            tile_counts,
+            np.random.default_rng(seed),
+            n_resamples,
+            confidence_level,
+            averaging,
         )
+        SF_bootstrap = {
+            key.replace("_stderr", "_bootstrap_stderr"): value
+            for key, value in SF_bootstrap.items()
+        }
+
+    # Calculate structure functions along additional lattice directions
+    SF_directions = {}
+    for direction in directions or []:
+        name = "_".join(str(component) for component in direction)
+        direction_terms = {
+            key + "_" + name: key_terms
+            for key, key_terms in get_sf_terms(sf_type, direction).items()
+        }
+        lags = select_direction_lags(
+            direction, (len(x), len(y)), (periodic_x, periodic_y), separations
+        )
+
+        distances = np.zeros(len(lags))
+        for lag_index, lag in enumerate(lags):
+            x_end = x[lag * abs(direction[0])]
+            y_end = y[lag * abs(direction[1])]
+            if grid_type == "latlon":
+                distances[lag_index] = great_circle((x_end, y_end), (x[0], y[0])).meters
+            else:
+                distances[lag_index] = np.hypot(x_end - x[0], y_end - y[0])
+        if max_separation is not None:
+            lags = lags[distances <= max_separation]
+            distances = distances[distances <= max_separation]
+
+        dd = np.zeros(len(lags) + 1)
+        dd[1:] = distances
+        SF_direction = {key: np.zeros(len(lags) + 1) for key in direction_terms}
+        for lag_index, lag in enumerate(lags, start=1):
+            SF_dicts = calculate_structure_function_nd(
+                fields,
+                direction_terms,
+                (lag * direction[1], lag * direction[0]),
+                (periodic_y, periodic_x),
+            )
+            for key in direction_terms:
+                SF_direction[key][lag_index] = SF_dicts[key]
+
+        if nbins is not None:
+            for key, values in SF_direction.items():
+                dd_bin, SF_direction[key] = bin_data(dd, values, nbins)
+            dd = dd_bin
+        SF_directions.update(SF_direction)
+        SF_directions[name + "-diffs"] = dd
 
     # Bin the data if requested
     if nbins is not None:
@@ -352,6 +855,33 @@ def generate_structure_functions_2d(  # noqa: C901, D417
         if any("LSS" in t for t in sf_type):
             xd_bin, SF_x_LSS = bin_data(xd, SF_x_LSS, nbins)
             yd_bin, SF_y_LSS = bin_data(yd, SF_y_LSS, nbins)
+        if estimator == "montecarlo":
+            for key, stderr in SF_stderr.items():
+                if key[:-7].endswith("_x"):
+                    xd_bin, stderr_sq = bin_data(xd, stderr**2, nbins)
+                else:
+                    yd_bin, stderr_sq = bin_data(yd, stderr**2, nbins)
+                SF_stderr[key] = np.sqrt(stderr_sq)
+        if uncertainty:
+            # Effective sample sizes add up over the separations in each bin, and
+            # the standard error of each bin follows from them
+            for key in [key[:-4] for key in SF_uncertainty if key.endswith("_ess")]:
+                d = xd if key.endswith("_x") else yd
+                _, variance = bin_data(d, SF_uncertainty[key + "_variance"], nbins)
+                _, ess = bin_data(d, SF_uncertainty[key + "_ess"], nbins, "sum")
+                SF_uncertainty[key + "_variance"] = variance
+                SF_uncertainty[key + "_ess"] = ess
+                SF_uncertainty[key + "_stderr"] = np.sqrt(
+                    np.divide(variance, ess, out=np.zeros_like(variance), where=ess > 0)
+                )
+        if estimator == "multiresolution":
+            for key, bias in SF_bias.items():
+                if key[:-5].endswith("_x"):
+                    xd_bin, SF_bias[key] = bin_data(xd, bias, nbins)
+                else:
+                    yd_bin, SF_bias[key] = bin_data(yd, bias, nbins)
+            xd_bin, x_coarsening = bin_data(xd, x_coarsening, nbins)
+            yd_bin, y_coarsening = bin_data(yd, y_coarsening, nbins)
         xd = xd_bin
         yd = yd_bin
 
@@ -379,5 +909,16 @@ def generate_structure_functions_2d(  # noqa: C901, D417
         }.items()
         if value is not None
     }
+    data.update(SF_directions)
+    if uncertainty:
+        data.update(SF_uncertainty)
+    if bootstrap_tiles is not None:
+        data.update(SF_bootstrap)
+    if estimator == "montecarlo":
+        data.update(SF_stderr)
+    if estimator == "multiresolution":
+        data.update(SF_bias)
+        data["x-coarsening"] = x_coarsening
+        data["y-coarsening"] = y_coarsening
 
     return data
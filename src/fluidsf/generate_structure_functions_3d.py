@@ -4,9 +4,24 @@ import numpy as np
 
 from .bin_data import bin_data
 from .calculate_advection_3d import calculate_advection_3d
+from .calculate_decorrelation_length import calculate_decorrelation_length
 from .calculate_separation_distances_3d import calculate_separation_distances_3d
 from .calculate_structure_function_3d import calculate_structure_function_3d
-from .shift_array_1d import shift_array_1d
+from .calculate_structure_function_fft import calculate_structure_function_fft
+from .calculate_structure_function_moments import (
+    calculate_structure_function_moments,
+)
+from .calculate_structure_function_montecarlo import (
+    calculate_structure_function_montecarlo,
+)
+from .calculate_structure_function_nd import calculate_structure_function_nd
+from .coarsen_array import coarsen_array
+from .destagger_array import destagger_array
+from .get_sf_terms import get_sf_terms
+from .select_coarsening_factors import select_coarsening_factors
+from .select_direction_lags import select_direction_lags
+from .select_separations import select_separations
+from .sf_checkpoint import SFCheckpoint
 
 
 def generate_structure_functions_3d(  # noqa: C901, D417
@@ -20,6 +35,21 @@ def generate_structure_functions_3d(  # noqa: C901, D417
     scalar=None,
     boundary="periodic-all",
     nbins=None,
+    separations=None,
+    max_separation=None,
+    estimator="direct",
+    rtol=0.01,
+    max_samples=None,
+    seed=None,
+    native_lags=16,
+    coarsen="mean",
+    engine="direct",
+    directions=None,
+    uncertainty=False,
+    checkpoint=None,
+    checkpoint_interval=60.0,
+    staggered=False,
+    axes=(2, 1, 0),
 ):
     """
     Full method for generating structure functions for uniform and even 3D data,
@@ -54,6 +84,94 @@ def generate_structure_functions_3d(  # noqa: C901, D417
         nbins: int, optional
             Number of bins in the structure function. Defaults to None, i.e. does
             not bin the data.
+        separations: array_like or tuple, optional
+            Subset of integer separations (lags) to calculate in each direction,
+            either an array of lags or a tuple ("log", count) for count log-spaced
+            lags. Defaults to None, i.e. every lag is calculated.
+        max_separation: float, optional
+            Maximum separation distance to calculate, in coordinate units. Lags with
+            larger separation distances are skipped. Defaults to None, i.e. no
+            cutoff.
+        estimator: str, optional
+            Method used to average over pairs of points. Either "direct" to use
+            every pair, "montecarlo" to estimate each structure function from
+            randomly sampled pairs, or "multiresolution" to calculate larger
+            separations on successively coarsened copies of the data.
+            Defaults to "direct".
+        rtol: float, optional
+            Target standard error relative to the mean magnitude of the sampled
+            values of each structure function (e.g. of du**3 for SF_LLL) when
+            estimator is "montecarlo", so odd-order structure functions with means
+            near zero also converge. Sampling at a separation stops once every
+            structure function meets this target. Defaults to 0.01.
+        max_samples: int, optional
+            Maximum number of pairs sampled per separation when estimator is
+            "montecarlo". Defaults to None, i.e. a quarter of the available pairs.
+        seed: int, optional
+            Seed for the random number generator when estimator is "montecarlo".
+            Defaults to None.
+        native_lags: int, optional
+            Largest separation (in grid points) calculated on the native grid when
+            estimator is "multiresolution". Each following band of separations,
+            twice as long as the previous one, is calculated on a grid coarsened
+            by a further factor of two, and separations are rounded to multiples
+            of their coarsening factor. Defaults to 16.
+        coarsen: str, optional
+            How the data are coarsened when estimator is "multiresolution", either
+            "mean" for block averages or "decimate" to subsample. Defaults to
+            "mean".
+        engine: str, optional
+            Method used to calculate the structure functions when estimator is
+            "direct". Either "direct" to shift the data for each separation in
+            turn, "fft" to calculate all separations in each direction at once
+            with FFT correlations of the fields and of their NaN mask, or
+            "moments" to expand each structure function into moments that are
+            calculated from cumulative sums and dot products without shifting
+            the data. Non-periodic directions are zero-padded for "fft", so NaNs
+            (e.g. land) and non-periodic boundaries give the same result as the
+            "direct" engine with either engine, up to round-off errors of order
+            1e-12 relative to the variance of the data. Defaults to "direct".
+        directions: list, optional
+            List of additional separation directions, each an integer lattice
+            vector (dx, dy, dz) such as (1, 1, 0) or (1, 1, 1). Structure functions
+            are calculated for integer multiples of each vector, with the
+            longitudinal and transverse components projected onto the direction.
+            Requires estimator "direct", and the engine is not used for these
+            directions. Defaults to None, i.e. only axis-aligned directions are
+            calculated.
+        uncertainty: bool, optional
+            Whether to also calculate the variance of the integrand of each
+            structure function over pairs, in the same pass as its mean, and the
+            effective number of independent pairs, i.e. the number of pairs divided
+            by the decorrelation lengths of the fields along each axis (see
+            calculate_decorrelation_length). Only supported for the x-, y- and
+            z-directions with estimator and engine "direct". Defaults to False.
+        checkpoint: str or Path, optional
+            Path of a checkpoint file (see SFCheckpoint). The structure functions
+            of the completed separations are written to this file at most every
+            checkpoint_interval seconds. If the file exists, e.g. after the
+            calculation was interrupted, the completed separations are restored
+            from it and skipped, after checking that it was written for the same
+            data and parameters (nbins excepted). The file is deleted once the
+            calculation is complete. The state of the random number generator of
+            the "montecarlo" estimator is also checkpointed, so a resumed run with
+            a seed matches an uninterrupted one. Defaults to None, i.e. no
+            checkpoint.
+        checkpoint_interval: float, optional
+            Minimum time in seconds between writes of the checkpoint file. Defaults
+            to 60.
+        staggered: bool, optional
+            Whether u, v and w are on an Arakawa C-grid, i.e. u on the x-faces, v
+            on the y-faces and w on the z-faces of the cells centered on x, y, z
+            and scalar, e.g. MITgcm velocities (see destagger_array for the
+            supported layouts). The advection is calculated on the native layout
+            (see calculate_advection_3d), and the velocities are averaged to the
+            cell centers for the velocity structure functions, wrapping around
+            periodic boundaries. Defaults to False.
+        axes: tuple, optional
+            Axes of the x-, y- and z-direction in u, v, w and scalar, e.g.
+            (0, 1, 2) for arrays ordered (x, y, z) such as Fortran-ordered model
+            output. The arrays are not copied. Defaults to (2, 1, 0).
 
     Returns
     -------
@@ -141,7 +259,58 @@ def generate_structure_functions_3d(  # noqa: C901, D417
 
                 **z-diffs**: The separation distances in the z direction.
 
+            If directions are provided, the dictionary also contains the structure
+            functions and separation distances for each direction, with the
+            components of the direction joined by underscores as the suffix, e.g.
+            **SF_LL_1_1_0** and **1_1_0-diffs**.
+
+            If uncertainty is True, the dictionary also contains the variance of the
+            integrand, the effective sample size and the standard error of the mean
+            of each structure function under its key with a "_variance", "_ess" and
+            "_stderr" suffix, e.g. **SF_LL_x_variance**, **SF_LL_x_ess** and
+            **SF_LL_x_stderr**. Binned variances are averaged over each bin, binned
+            effective sample sizes are summed over each bin, and binned standard
+            errors are calculated from both.
+
+            If estimator is "montecarlo", the dictionary also contains the standard
+            error of each structure function under its key with a "_stderr" suffix,
+            e.g. **SF_LL_x_stderr**. Binned standard errors are the root mean
+            square of the standard errors in each bin, which is a conservative
+            estimate.
+
+            If estimator is "multiresolution", the dictionary also contains the
+            coarsening factor used at each separation under **x-coarsening**,
+            **y-coarsening** and **z-coarsening**, and a bias estimate of each
+            structure function under its key with a "_bias" suffix, e.g.
+            **SF_LL_x_bias**. The bias of a band is the difference between the
+            coarsened and the next finer grid at the first separation of the band,
+            accumulated over all coarser bands.
+
     """
+    # Error handling
+    if estimator not in ["direct", "montecarlo", "multiresolution"]:
+        raise ValueError(
+            "Estimator must be 'direct', 'montecarlo' or 'multiresolution'."
+        )
+    if engine not in ["direct", "fft", "moments"]:
+        raise ValueError("Engine must be 'direct', 'fft' or 'moments'.")
+    if engine != "direct" and estimator != "direct":
+        raise ValueError("Engine can only be changed if estimator is 'direct'.")
+    if directions is not None and estimator != "direct":
+        raise ValueError("Directions can only be used if estimator is 'direct'.")
+    if uncertainty and (estimator != "direct" or engine != "direct"):
+        raise ValueError(
+            "Uncertainty can only be calculated if estimator and engine are 'direct'."
+        )
+
+    # Views with the axes ordered (z, y, x), so that arrays in other layouts are not
+    # copied
+    u = np.moveaxis(u, axes, (2, 1, 0))
+    v = np.moveaxis(v, axes, (2, 1, 0))
+    w = np.moveaxis(w, axes, (2, 1, 0))
+    if scalar is not None:
+        scalar = np.moveaxis(scalar, axes, (2, 1, 0))
+
     # Initialize variables as NoneType
     SF_adv_x = None
     SF_adv_y = None
@@ -174,38 +343,105 @@ def generate_structure_functions_3d(  # noqa: C901, D417
 
     # Define a list of separation distances to iterate over.
     # Periodic is half the length since the calculation will wrap the data.
-    sep_x = range(1, int(len(x) - 1))
-    sep_y = range(1, int(len(y) - 1))
-    sep_z = range(1, int(len(z) - 1))
+    max_x = int(len(x) - 1)
+    max_y = int(len(y) - 1)
+    max_z = int(len(z) - 1)
 
     if boundary is not None:
         if "periodic-all" in boundary:
-            sep_x = range(1, int(len(x) / 2))
-            sep_y = range(1, int(len(y) / 2))
-            sep_z = range(1, int(len(z) / 2))
+            max_x = int(len(x) / 2)
+            max_y = int(len(y) / 2)
+            max_z = int(len(z) / 2)
         if "periodic-x" in boundary:
-            sep_x = range(1, int(len(x) / 2))
+            max_x = int(len(x) / 2)
         if "periodic-y" in boundary:
-            sep_y = range(1, int(len(y) / 2))
+            max_y = int(len(y) / 2)
         if "periodic-z" in boundary:
-            sep_z = range(1, int(len(z) / 2))
+            max_z = int(len(z) / 2)
+
+    sep_x = select_separations(max_x, separations)
+    sep_y = select_separations(max_y, separations)
+    sep_z = select_separations(max_z, separations)
+    periodic = tuple(
+        boundary is not None
+        and ("periodic-all" in boundary or "periodic-" + direction in boundary)
+        for direction in ["z", "y", "x"]
+    )
+
+    # Calculate larger separations on coarsened grids if requested
+    x_coarsening = np.ones(len(sep_x), dtype=int)
+    y_coarsening = np.ones(len(sep_y), dtype=int)
+    z_coarsening = np.ones(len(sep_z), dtype=int)
+    if estimator == "multiresolution":
+        sep_x, x_coarsening = select_coarsening_factors(
+            sep_x, native_lags, len(x), periodic[2]
+        )
+        sep_y, y_coarsening = select_coarsening_factors(
+            sep_y, native_lags, len(y), periodic[1]
+        )
+        sep_z, z_coarsening = select_coarsening_factors(
+            sep_z, native_lags, len(z), periodic[0]
+        )
+
+    # Calculate separation distances in x, y, and z
+    x_distances = np.zeros(len(sep_x))
+    y_distances = np.zeros(len(sep_y))
+    z_distances = np.zeros(len(sep_z))
+    for x_index, x_shift in enumerate(sep_x):
+        x_distances[x_index], tmp, tmp = calculate_separation_distances_3d(
+            x[0], y[0], z[0], x[x_shift], y[0], z[0]
+        )
+    for y_index, y_shift in enumerate(sep_y):
+        tmp, y_distances[y_index], tmp = calculate_separation_distances_3d(
+            x[0], y[0], z[0], x[0], y[y_shift], z[0]
+        )
+    for z_index, z_shift in enumerate(sep_z):
+        tmp, tmp, z_distances[z_index] = calculate_separation_distances_3d(
+            x[0], y[0], z[0], x[0], y[0], z[z_shift]
+        )
+
+    # Skip separations beyond the requested maximum
+    if max_separation is not None:
+        x_within_max = np.abs(x_distances) <= max_separation
+        y_within_max = np.abs(y_distances) <= max_separation
+        z_within_max = np.abs(z_distances) <= max_separation
+        sep_x = sep_x[x_within_max]
+        x_distances = x_distances[x_within_max]
+        x_coarsening = x_coarsening[x_within_max]
+        sep_y = sep_y[y_within_max]
+        y_distances = y_distances[y_within_max]
+        y_coarsening = y_coarsening[y_within_max]
+        sep_z = sep_z[z_within_max]
+        z_distances = z_distances[z_within_max]
+        z_coarsening = z_coarsening[z_within_max]
 
     # Initialize the separation distance arrays
     xd = np.zeros(len(sep_x) + 1)
     yd = np.zeros(len(sep_y) + 1)
     zd = np.zeros(len(sep_z) + 1)
+    xd[1:] = x_distances
+    yd[1:] = y_distances
+    zd[1:] = z_distances
 
     # Initialize the structure function arrays
     if any("ASF_V" in t for t in sf_type):
         SF_adv_x = np.zeros(len(sep_x) + 1)
         SF_adv_y = np.zeros(len(sep_y) + 1)
         SF_adv_z = np.zeros(len(sep_z) + 1)
-        adv_x, adv_y, adv_z = calculate_advection_3d(u, v, w, x, y, z)
+        adv_x, adv_y, adv_z = calculate_advection_3d(
+            u, v, w, x, y, z, staggered=staggered, periodic=periodic[::-1]
+        )
     if any("ASF_S" in t for t in sf_type):
         SF_x_scalar = np.zeros(len(sep_x) + 1)
         SF_y_scalar = np.zeros(len(sep_y) + 1)
         SF_z_scalar = np.zeros(len(sep_z) + 1)
-        adv_scalar = calculate_advection_3d(u, v, w, x, y, z, scalar)
+        adv_scalar = calculate_advection_3d(
+            u, v, w, x, y, z, scalar, staggered, periodic=periodic[::-1]
+        )
+    if staggered:
+        u = destagger_array(u, 2, len(x), periodic[2])[0]
+        v = destagger_array(v, 1, len(y), periodic[1])[0]
+        w = destagger_array(w, 0, len(z), periodic[0])[0]
     if any("LL" in t for t in sf_type):
         SF_x_LL = np.zeros(len(sep_x) + 1)
         SF_y_LL = np.zeros(len(sep_y) + 1)
@@ -237,163 +473,451 @@ def generate_structure_functions_3d(  # noqa: C901, D417
             stacklevel=2,
         )
 
+    # Set up the structure function terms unless shifting the data directly
+    if (
+        estimator != "direct"
+        or engine != "direct"
+        or directions is not None
+        or uncertainty
+    ):
+        fields = {
+            key: value
+            for key, value in {
+                "u": u,
+                "v": v,
+                "w": w,
+                "adv_x": adv_x,
+                "adv_y": adv_y,
+                "adv_z": adv_z,
+                "scalar": scalar,
+                "adv_scalar": adv_scalar,
+            }.items()
+            if value is not None
+        }
+        x_terms = {
+            name + "_x": terms
+            for name, terms in get_sf_terms(sf_type, (1, 0, 0)).items()
+        }
+        y_terms = {
+            name + "_y": terms
+            for name, terms in get_sf_terms(sf_type, (0, 1, 0)).items()
+        }
+        z_terms = {
+            name + "_z": terms
+            for name, terms in get_sf_terms(sf_type, (0, 0, 1)).items()
+        }
+
+    if estimator == "montecarlo":
+        SF_stderr = {key + "_stderr": np.zeros(len(sep_x) + 1) for key in x_terms}
+        SF_stderr.update({key + "_stderr": np.zeros(len(sep_y) + 1) for key in y_terms})
+        SF_stderr.update({key + "_stderr": np.zeros(len(sep_z) + 1) for key in z_terms})
+        rng = np.random.default_rng(seed)
+
+    if estimator == "multiresolution":
+        levels = {}
+        levels_periodic = {}
+        factor = 1
+        while factor <= max(
+            x_coarsening.max(initial=1),
+            y_coarsening.max(initial=1),
+            z_coarsening.max(initial=1),
+        ):
+            levels[factor] = {
+                key: coarsen_array(value, factor, coarsen)
+                for key, value in fields.items()
+            }
+            levels_periodic[factor] = tuple(
+                p and n % factor == 0
+                for p, n in zip(periodic, [len(z), len(y), len(x)], strict=True)
+            )
+            factor *= 2
+
+    # Decorrelation area (or volume) of each field in grid points, which reduces the
+    # number of independent pairs
+    if uncertainty:
+        SF_uncertainty = {}
+        for terms, sep in [(x_terms, sep_x), (y_terms, sep_y), (z_terms, sep_z)]:
+            for key in terms:
+                for suffix in ["_variance", "_ess", "_stderr"]:
+                    SF_uncertainty[key + suffix] = np.zeros(len(sep) + 1)
+        decorrelation = {
+            field: np.prod(
+                [
+                    calculate_decorrelation_length(value, axis, axis_periodic)
+                    for axis, axis_periodic in enumerate(periodic)
+                ]
+            )
+            for field, value in fields.items()
+        }
+
+        def store_uncertainty(sf_dicts, terms, index):
+            for key, key_terms in terms.items():
+                key_decorrelation = max(
+                    decorrelation[field]
+                    for coeff, factors in key_terms
+                    for combination in factors
+                    for field, weight in combination
+                )
+                counts = sf_dicts[key + "_counts"]
+                ess = min(counts, max(1.0, counts / key_decorrelation))
+                SF_uncertainty[key + "_variance"][index] = sf_dicts[key + "_variance"]
+                SF_uncertainty[key + "_ess"][index] = ess
+                SF_uncertainty[key + "_stderr"][index] = np.sqrt(
+                    sf_dicts[key + "_variance"] / ess
+                )
+
+    # Calculate all separations in each direction at once if requested
+    if engine in ["fft", "moments"]:
+        if engine == "fft":
+            calculate_all = calculate_structure_function_fft
+        else:
+            calculate_all = calculate_structure_function_moments
+        x_all = calculate_all(fields, x_terms, 2, periodic[2], sep_x)
+        y_all = calculate_all(fields, y_terms, 1, periodic[1], sep_y)
+        z_all = calculate_all(fields, z_terms, 0, periodic[0], sep_z)
+
+    # Restore the completed separations from a checkpoint, and skip them below
+    x_done = np.zeros(len(sep_x) + 1, dtype=bool)
+    y_done = np.zeros(len(sep_y) + 1, dtype=bool)
+    z_done = np.zeros(len(sep_z) + 1, dtype=bool)
+    if checkpoint is not None:
+        checkpointer = SFCheckpoint(
+            checkpoint,
+            {
+                "generator": "generate_structure_functions_3d",
+                "fields": [u, v, w, scalar, x, y, z],
+                "parameters": [
+                    sf_type,
+                    boundary,
+                    separations,
+                    max_separation,
+                    estimator,
+                    rtol,
+                    max_samples,
+                    seed,
+                    native_lags,
+                    coarsen,
+                    engine,
+                    directions,
+                    uncertainty,
+                    staggered,
+                ],
+            },
+            checkpoint_interval,
+        )
+        checkpointer.track(
+            {
+                "SF_advection_velocity_x": SF_adv_x,
+                "SF_advection_velocity_y": SF_adv_y,
+                "SF_advection_velocity_z": SF_adv_z,
+                "SF_advection_scalar_x": SF_x_scalar,
+                "SF_advection_scalar_y": SF_y_scalar,
+                "SF_advection_scalar_z": SF_z_scalar,
+                "SF_LL_x": SF_x_LL,
+                "SF_LL_y": SF_y_LL,
+                "SF_LL_z": SF_z_LL,
+                "SF_TT_x": SF_x_TT,
+                "SF_TT_y": SF_y_TT,
+                "SF_TT_z": SF_z_TT,
+                "SF_SS_x": SF_x_SS,
+                "SF_SS_y": SF_y_SS,
+                "SF_SS_z": SF_z_SS,
+                "SF_LLL_x": SF_x_LLL,
+                "SF_LLL_y": SF_y_LLL,
+                "SF_LLL_z": SF_z_LLL,
+                "SF_LTT_x": SF_x_LTT,
+                "SF_LTT_y": SF_y_LTT,
+                "SF_LTT_z": SF_z_LTT,
+                "SF_LSS_x": SF_x_LSS,
+                "SF_LSS_y": SF_y_LSS,
+                "SF_LSS_z": SF_z_LSS,
+                "x_done": x_done,
+                "y_done": y_done,
+                "z_done": z_done,
+            }
+        )
+        if estimator == "montecarlo":
+            checkpointer.track(SF_stderr)
+            checkpointer.track_rng(rng)
+        if uncertainty:
+            checkpointer.track(SF_uncertainty)
+
     # Iterate over separations in x, y, and z
-    for x_shift in sep_x:
+    for x_index, x_shift in enumerate(sep_x, start=1):
+        if x_done[x_index]:
+            continue
         y_shift = 1
         z_shift = 1
-        if boundary is not None:
-            if any("periodic-all" in b for b in boundary) or any(
-                "periodic-x" in b for b in boundary
-            ):
-                xroll = shift_array_1d(x, shift_by=x_shift, boundary="Periodic")
-
-            else:
-                xroll = shift_array_1d(x, shift_by=x_shift, boundary=None)
+        if estimator == "montecarlo":
+            SF_dicts = calculate_structure_function_montecarlo(
+                fields, x_terms, (0, 0, x_shift), periodic, rng, rtol, max_samples
+            )
+            for key in x_terms:
+                SF_stderr[key + "_stderr"][x_index] = SF_dicts[key + "_stderr"]
+        elif estimator == "multiresolution":
+            factor = x_coarsening[x_index - 1]
+            SF_dicts = calculate_structure_function_nd(
+                levels[factor],
+                x_terms,
+                (0, 0, x_shift // factor),
+                levels_periodic[factor],
+            )
+        elif uncertainty:
+            SF_dicts = calculate_structure_function_nd(
+                fields, x_terms, (0, 0, x_shift), periodic, return_variance=True
+            )
+            store_uncertainty(SF_dicts, x_terms, x_index)
+        elif engine != "direct":
+            SF_dicts = {key: x_all[key][x_index - 1] for key in x_terms}
         else:
-            xroll = shift_array_1d(x, shift_by=x_shift, boundary=None)
-
-        SF_dicts = calculate_structure_function_3d(
-            u,
-            v,
-            w,
-            adv_x,
-            adv_y,
-            adv_z,
-            x_shift,
-            y_shift,
-            z_shift,
-            sf_type,
-            scalar,
-            adv_scalar,
-            boundary,
-        )
+            SF_dicts = calculate_structure_function_3d(
+                u,
+                v,
+                w,
+                adv_x,
+                adv_y,
+                adv_z,
+                x_shift,
+                y_shift,
+                z_shift,
+                sf_type,
+                scalar,
+                adv_scalar,
+                boundary,
+            )
 
         if any("ASF_V" in t for t in sf_type):
-            SF_adv_x[x_shift] = SF_dicts["SF_advection_velocity_x"]
+            SF_adv_x[x_index] = SF_dicts["SF_advection_velocity_x"]
         if any("ASF_S" in t for t in sf_type):
-            SF_x_scalar[x_shift] = SF_dicts["SF_advection_scalar_x"]
+            SF_x_scalar[x_index] = SF_dicts["SF_advection_scalar_x"]
         if any("LL" in t for t in sf_type):
-            SF_x_LL[x_shift] = SF_dicts["SF_LL_x"]
+            SF_x_LL[x_index] = SF_dicts["SF_LL_x"]
         if any("TT" in t for t in sf_type):
-            SF_x_TT[x_shift] = SF_dicts["SF_TT_x"]
+            SF_x_TT[x_index] = SF_dicts["SF_TT_x"]
         if any("SS" in t for t in sf_type):
-            SF_x_SS[x_shift] = SF_dicts["SF_SS_x"]
+            SF_x_SS[x_index] = SF_dicts["SF_SS_x"]
         if any("LLL" in t for t in sf_type):
-            SF_x_LLL[x_shift] = SF_dicts["SF_LLL_x"]
+            SF_x_LLL[x_index] = SF_dicts["SF_LLL_x"]
         if any("LTT" in t for t in sf_type):
-            SF_x_LTT[x_shift] = SF_dicts["SF_LTT_x"]
+            SF_x_LTT[x_index] = SF_dicts["SF_LTT_x"]
         if any("LSS" in t for t in sf_type):
-            SF_x_LSS[x_shift] = SF_dicts["SF_LSS_x"]
-
-        # Calculate separation distances in x
-        xd[x_shift], tmp, tmp = calculate_separation_distances_3d(
-            x[0], y[0], z[0], xroll[0], y[0], z[0]
-        )
+            SF_x_LSS[x_index] = SF_dicts["SF_LSS_x"]
+        x_done[x_index] = True
+        if checkpoint is not None:
+            checkpointer.update()
 
-    for y_shift in sep_y:
+    for y_index, y_shift in enumerate(sep_y, start=1):
+        if y_done[y_index]:
+            continue
         x_shift = 1
         z_shift = 1
-        if boundary is not None:
-            if any("periodic-all" in b for b in boundary) or any(
-                "periodic-y" in b for b in boundary
-            ):
-                yroll = shift_array_1d(y, shift_by=y_shift, boundary="Periodic")
-            else:
-                yroll = shift_array_1d(y, shift_by=y_shift, boundary=None)
-
+        if estimator == "montecarlo":
+            SF_dicts = calculate_structure_function_montecarlo(
+                fields, y_terms, (0, y_shift, 0), periodic, rng, rtol, max_samples
+            )
+            for key in y_terms:
+                SF_stderr[key + "_stderr"][y_index] = SF_dicts[key + "_stderr"]
+        elif estimator == "multiresolution":
+            factor = y_coarsening[y_index - 1]
+            SF_dicts = calculate_structure_function_nd(
+                levels[factor],
+                y_terms,
+                (0, y_shift // factor, 0),
+                levels_periodic[factor],
+            )
+        elif uncertainty:
+            SF_dicts = calculate_structure_function_nd(
+                fields, y_terms, (0, y_shift, 0), periodic, return_variance=True
+            )
+            store_uncertainty(SF_dicts, y_terms, y_index)
+        elif engine != "direct":
+            SF_dicts = {key: y_all[key][y_index - 1] for key in y_terms}
         else:
-            yroll = shift_array_1d(y, shift_by=y_shift, boundary=None)
-
-        SF_dicts = calculate_structure_function_3d(
-            u,
-            v,
-            w,
-            adv_x,
-            adv_y,
-            adv_z,
-            x_shift,
-            y_shift,
-            z_shift,
-            sf_type,
-            scalar,
-            adv_scalar,
-            boundary,
-        )
+            SF_dicts = calculate_structure_function_3d(
+                u,
+                v,
+                w,
+                adv_x,
+                adv_y,
+                adv_z,
+                x_shift,
+                y_shift,
+                z_shift,
+                sf_type,
+                scalar,
+                adv_scalar,
+                boundary,
+            )
 
         if any("ASF_V" in t for t in sf_type):
-            SF_adv_y[y_shift] = SF_dicts["SF_advection_velocity_y"]
+            SF_adv_y[y_index] = SF_dicts["SF_advection_velocity_y"]
         if any("ASF_S" in t for t in sf_type):
-            SF_y_scalar[y_shift] = SF_dicts["SF_advection_scalar_y"]
+            SF_y_scalar[y_index] = SF_dicts["SF_advection_scalar_y"]
         if any("LL" in t for t in sf_type):
-            SF_y_LL[y_shift] = SF_dicts["SF_LL_y"]
+            SF_y_LL[y_index] = SF_dicts["SF_LL_y"]
         if any("TT" in t for t in sf_type):
-            SF_y_TT[y_shift] = SF_dicts["SF_TT_y"]
+            SF_y_TT[y_index] = SF_dicts["SF_TT_y"]
         if any("SS" in t for t in sf_type):
-            SF_y_SS[y_shift] = SF_dicts["SF_SS_y"]
+            SF_y_SS[y_index] = SF_dicts["SF_SS_y"]
         if any("LLL" in t for t in sf_type):
-            SF_y_LLL[y_shift] = SF_dicts["SF_LLL_y"]
+            SF_y_LLL[y_index] = SF_dicts["SF_LLL_y"]
         if any("LTT" in t for t in sf_type):
-            SF_y_LTT[y_shift] = SF_dicts["SF_LTT_y"]
+            SF_y_LTT[y_index] = SF_dicts["SF_LTT_y"]
         if any("LSS" in t for t in sf_type):
-            SF_y_LSS[y_shift] = SF_dicts["SF_LSS_y"]
-
-        # Calculate separation distances in y
-        tmp, yd[y_shift], tmp = calculate_separation_distances_3d(
-            x[0], y[0], z[0], x[0], yroll[0], z[0]
-        )
+            SF_y_LSS[y_index] = SF_dicts["SF_LSS_y"]
+        y_done[y_index] = True
+        if checkpoint is not None:
+            checkpointer.update()
 
-    for z_shift in sep_z:
+    for z_index, z_shift in enumerate(sep_z, start=1):
+        if z_done[z_index]:
+            continue
         x_shift = 1
         y_shift = 1
-        if boundary is not None:
-            if any("periodic-all" in b for b in boundary) or any(
-                "periodic-z" in b for b in boundary
-            ):
-                zroll = shift_array_1d(z, shift_by=z_shift, boundary="Periodic")
-
-            else:
-                zroll = shift_array_1d(z, shift_by=z_shift, boundary=None)
+        if estimator == "montecarlo":
+            SF_dicts = calculate_structure_function_montecarlo(
+                fields, z_terms, (z_shift, 0, 0), periodic, rng, rtol, max_samples
+            )
+            for key in z_terms:
+                SF_stderr[key + "_stderr"][z_index] = SF_dicts[key + "_stderr"]
+        elif estimator == "multiresolution":
+            factor = z_coarsening[z_index - 1]
+            SF_dicts = calculate_structure_function_nd(
+                levels[factor],
+                z_terms,
+                (z_shift // factor, 0, 0),
+                levels_periodic[factor],
+            )
+        elif uncertainty:
+            SF_dicts = calculate_structure_function_nd(
+                fields, z_terms, (z_shift, 0, 0), periodic, return_variance=True
+            )
+            store_uncertainty(SF_dicts, z_terms, z_index)
+        elif engine != "direct":
+            SF_dicts = {key: z_all[key][z_index - 1] for key in z_terms}
         else:
-            zroll = shift_array_1d(z, shift_by=z_shift, boundary=None)
-
-        SF_dicts = calculate_structure_function_3d(
-            u,
-            v,
-            w,
-            adv_x,
-            adv_y,
-            adv_z,
-            x_shift,
-            y_shift,
-            z_shift,
-            sf_type,
-            scalar,
-            adv_scalar,
-            boundary,
-        )
+            SF_dicts = calculate_structure_function_3d(
+                u,
+                v,
+                w,
+                adv_x,
+                adv_y,
+                adv_z,
+                x_shift,
+                y_shift,
+                z_shift,
+                sf_type,
+                scalar,
+                adv_scalar,
+                boundary,
+            )
 
         if any("ASF_V" in t for t in sf_type):
-            SF_adv_z[z_shift] = SF_dicts["SF_advection_velocity_z"]
+            SF_adv_z[z_index] = SF_dicts["SF_advection_velocity_z"]
         if any("ASF_S" in t for t in sf_type):
-            SF_z_scalar[z_shift] = SF_dicts["SF_advection_scalar_z"]
+            SF_z_scalar[z_index] = SF_dicts["SF_advection_scalar_z"]
         if any("LL" in t for t in sf_type):
-            SF_z_LL[z_shift] = SF_dicts["SF_LL_z"]
+            SF_z_LL[z_index] = SF_dicts["SF_LL_z"]
         if any("TT" in t for t in sf_type):
-            SF_z_TT[z_shift] = SF_dicts["SF_TT_z"]
+            SF_z_TT[z_index] = SF_dicts["SF_TT_z"]
         if any("SS" in t for t in sf_type):
-            SF_z_SS[z_shift] = SF_dicts["SF_SS_z"]
+            SF_z_SS[z_index] = SF_dicts["SF_SS_z"]
         if any("LLL" in t for t in sf_type):
-            SF_z_LLL[z_shift] = SF_dicts["SF_LLL_z"]
+            SF_z_LLL[z_index] = SF_dicts["SF_LLL_z"]
         if any("LTT" in t for t in sf_type):
-            SF_z_LTT[z_shift] = SF_dicts["SF_LTT_z"]
+            SF_z_LTT[z_index] = SF_dicts["SF_LTT_z"]
         if any("LSS" in t for t in sf_type):
-            SF_z_LSS[z_shift] = SF_dicts["SF_LSS_z"]
+            SF_z_LSS[z_index] = SF_dicts["SF_LSS_z"]
+        z_done[z_index] = True
+        if checkpoint is not None:
+            checkpointer.update()
+
+    # Estimate the bias of each coarsened band from the next finer grid
+    if estimator == "multiresolution":
+        SF_bias = {}
+        for sep, coarsening, terms, axis in [
+            (sep_x, x_coarsening, x_terms, 2),
+            (sep_y, y_coarsening, y_terms, 1),
+            (sep_z, z_coarsening, z_terms, 0),
+        ]:
+            SF_bias.update({key + "_bias": np.zeros(len(sep) + 1) for key in terms})
+            bias = dict.fromkeys(terms, 0.0)
+            for factor in np.unique(coarsening[coarsening > 1]):
+                band = np.flatnonzero(coarsening == factor)
+                shift = [0, 0, 0]
+                shift[axis] = sep[band[0]] // factor
+                coarse_dict = calculate_structure_function_nd(
+                    levels[factor], terms, tuple(shift), levels_periodic[factor]
+                )
+                shift[axis] = sep[band[0]] // (factor // 2)
+                fine_dict = calculate_structure_function_nd(
+                    levels[factor // 2],
+                    terms,
+                    tuple(shift),
+                    levels_periodic[factor // 2],
+                )
+                for key in terms:
+                    bias[key] += coarse_dict[key] - fine_dict[key]
+                    SF_bias[key + "_bias"][band + 1] = bias[key]
+        x_coarsening = np.concatenate(([1], x_coarsening))
+        y_coarsening = np.concatenate(([1], y_coarsening))
+        z_coarsening = np.concatenate(([1], z_coarsening))
 
-        # Calculate separation distances in z
-        tmp, tmp, zd[z_shift] = calculate_separation_distances_3d(
-            x[0], y[0], z[0], x[0], y[0], zroll[0]
+    # Calculate structure functions along additional lattice directions
+    SF_directions = {}
+    for direction in directions or []:
+        name = "_".join(str(component) for component in direction)
+        direction_terms = {
+            key + "_" + name: key_terms
+            for key, key_terms in get_sf_terms(sf_type, direction).items()
+        }
+        lags = select_direction_lags(
+            direction, (len(x), len(y), len(z)), periodic[::-1], separations
         )
 
+        distances = np.zeros(len(lags))
+        for lag_index, lag in enumerate(lags):
+            distances[lag_index] = np.sqrt(
+                sum(
+                    (coords[lag * abs(component)] - coords[0]) ** 2
+                    for coords, component in zip([x, y, z], direction, strict=True)
+                )
+            )
+        if max_separation is not None:
+            lags = lags[distances <= max_separation]
+            distances = distances[distances <= max_separation]
+
+        dd = np.zeros(len(lags) + 1)
+        dd[1:] = distances
+        SF_direction = {key: np.zeros(len(lags) + 1) for key in direction_terms}
+        direction_done = np.zeros(len(lags) + 1, dtype=bool)
+        if checkpoint is not None:
+            checkpointer.track({**SF_direction, name + "_done": direction_done})
+        for lag_index, lag in enumerate(lags, start=1):
+            if direction_done[lag_index]:
+                continue
+            SF_dicts = calculate_structure_function_nd(
+                fields,
+                direction_terms,
+                (lag * direction[2], lag * direction[1], lag * direction[0]),
+                periodic,
+            )
+            for key in direction_terms:
+                SF_direction[key][lag_index] = SF_dicts[key]
+            direction_done[lag_index] = True
+            if checkpoint is not None:
+                checkpointer.update()
+
+        if nbins is not None:
+            for key, values in SF_direction.items():
+                dd_bin, SF_direction[key] = bin_data(dd, values, nbins)
+            dd = dd_bin
+        SF_directions.update(SF_direction)
+        SF_directions[name + "-diffs"] = dd
+
+    if checkpoint is not None:
+        checkpointer.finish()
+
     if nbins is not None:
         if any("ASF_V" in t for t in sf_type):
             xd_bin, SF_adv_x = bin_data(xd, SF_adv_x, nbins)
@@ -427,6 +951,38 @@ def generate_structure_functions_3d(  # noqa: C901, D417
             xd_bin, SF_x_LSS = bin_data(xd, SF_x_LSS, nbins)
             yd_bin, SF_y_LSS = bin_data(yd, SF_y_LSS, nbins)
             zd_bin, SF_z_LSS = bin_data(zd, SF_z_LSS, nbins)
+        if estimator == "montecarlo":
+            for key, stderr in SF_stderr.items():
+                if key[:-7].endswith("_x"):
+                    xd_bin, stderr_sq = bin_data(xd, stderr**2, nbins)
+                elif key[:-7].endswith("_y"):
+                    yd_bin, stderr_sq = bin_data(yd, stderr**2, nbins)
+                else:
+                    zd_bin, stderr_sq = bin_data(zd, stderr**2, nbins)
+                SF_stderr[key] = np.sqrt(stderr_sq)
+        if uncertainty:
+            # Effective sample sizes add up over the separations in each bin, and
+            # the standard error of each bin follows from them
+            for key in [key[:-4] for key in SF_uncertainty if key.endswith("_ess")]:
+                d = {"_x": xd, "_y": yd, "_z": zd}[key[-2:]]
+                _, variance = bin_data(d, SF_uncertainty[key + "_variance"], nbins)
+                _, ess = bin_data(d, SF_uncertainty[key + "_ess"], nbins, "sum")
+                SF_uncertainty[key + "_variance"] = variance
+                SF_uncertainty[key + "_ess"] = ess
+                SF_uncertainty[key + "_stderr"] = np.sqrt(
+                    np.divide(variance, ess, out=np.zeros_like(variance), where=ess > 0)
+                )
+        if estimator == "multiresolution":
+            for key, bias in SF_bias.items():
+                if key[:-5].endswith("_x"):
+                    xd_bin, SF_bias[key] = bin_data(xd, bias, nbins)
+                elif key[:-5].endswith("_y"):
+                    yd_bin, SF_bias[key] = bin_data(yd, bias, nbins)
+                else:
+                    zd_bin, SF_bias[key] = bin_data(zd, bias, nbins)
+            xd_bin, x_coarsening = bin_data(xd, x_coarsening, nbins)
+            yd_bin, y_coarsening = bin_data(yd, y_coarsening, nbins)
+            zd_bin, z_coarsening = bin_data(zd, z_coarsening, nbins)
         xd = xd_bin
         yd = yd_bin
         zd = zd_bin
@@ -464,4 +1020,15 @@ def generate_structure_functions_3d(  # noqa: C901, D417
         }.items()
         if value is not None
     }
+    data.update(SF_directions)
+    if uncertainty:
+        data.update(SF_uncertainty)
+    if estimator == "montecarlo":
+        data.update(SF_stderr)
+    if estimator == "multiresolution":
+        data.update(SF_bias)
+        data["x-coarsening"] = x_coarsening
+        data["y-coarsening"] = y_coarsening
+        data["z-coarsening"] = z_coarsening
+
     return data
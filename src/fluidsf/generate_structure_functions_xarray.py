@@ -0,0 +1,186 @@
+import numpy as np
+
+from .calculate_separation_distances import calculate_separation_distances
+from .generate_structure_functions_1d import generate_structure_functions_1d
+from .generate_structure_functions_2d import generate_structure_functions_2d
+from .generate_structure_functions_3d import generate_structure_functions_3d
+from .sf_result import _separation_name
+
+
+def generate_structure_functions_xarray(  # noqa: C901, D417
+    u,
+    v=None,
+    w=None,
+    scalar=None,
+    dims=None,
+    sf_type=None,
+    dask="parallelized",
+    **kwargs,
+):
+    """
+    Generate structure functions from xarray DataArrays with the 1D, 2D or 3D
+    generator, chosen from the number of velocity components. The coordinates and,
+    for a latlon grid, the grid spacings are taken from the coordinates of the
+    spatial dimensions. The structure functions are calculated independently for
+    every element of the remaining dimensions (e.g. time or ensemble member) with
+    xarray.apply_ufunc, in parallel over dask chunks if the data are dask arrays,
+    so the data never have to be loaded into memory at once. Requires xarray, and
+    dask for dask arrays.
+
+    Parameters
+    ----------
+        u: xarray.DataArray
+            Array of u velocity components.
+        v: xarray.DataArray, optional
+            Array of v velocity components. Defaults to None.
+        w: xarray.DataArray, optional
+            Array of w velocity components. Defaults to None.
+        scalar: xarray.DataArray, optional
+            Array of scalar values. Defaults to None.
+        dims: tuple, optional
+            Names of the spatial dimensions, ordered (x,), (x, y) or (x, y, z).
+            Defaults to None, i.e. the last one, two or three dimensions of u in
+            reverse order for u only, u and v, or u, v and w, respectively. Pass
+            dims=("x",) to calculate 1D structure functions with u and v.
+        sf_type: list, optional
+            List of structure function types to calculate. Defaults to None, i.e.
+            the default of the generator.
+        dask: str, optional
+            How xarray.apply_ufunc handles dask arrays, either "parallelized" to
+            calculate every chunk in parallel, "allowed" or "forbidden". Defaults
+            to "parallelized". The spatial dimensions must not be chunked.
+        **kwargs:
+            Other keyword arguments of the generator, e.g. boundary, nbins or
+            engine. Coordinates and grid spacings given here replace the ones
+            taken from the data.
+
+    Returns
+    -------
+        xarray.Dataset:
+            Dataset with one variable per entry of the dictionary returned by the
+            generator, e.g. **SF_LL_x**, along the remaining dimensions of the data
+            and a separation dimension for each separation direction, e.g.
+            **x_separation**, **y_separation** or **1_1_separation**. The separation
+            distances are the coordinates of the separation dimensions.
+    """
+    try:
+        import xarray as xr
+    except ImportError as error:
+        raise ImportError(
+            "generate_structure_functions_xarray requires xarray. Install it with "
+            "'pip install fluidsf[xarray]'."
+        ) from error
+
+    if dims is None:
+        n_dims = 3 if w is not None else 2 if v is not None else 1
+        dims = tuple(reversed(u.dims[-n_dims:]))
+    dims = tuple(dims)
+    if len(dims) not in [1, 2, 3] or not set(dims) <= set(u.dims):
+        raise ValueError("dims must name one, two or three dimensions of u.")
+    if len(dims) == 3 and (v is None or w is None):
+        raise ValueError("v and w must be provided for 3D structure functions.")
+    if len(dims) == 2 and v is None:
+        raise ValueError("v must be provided for 2D structure functions.")
+
+    # Coordinates of the spatial dimensions, or indices if there are none
+    coords = [
+        np.asarray(u[dim].values) if dim in u.coords else np.arange(u.sizes[dim])
+        for dim in dims
+    ]
+    if len(dims) == 1:
+        generator = generate_structure_functions_1d
+        kwargs.setdefault("x", coords[0])
+    elif len(dims) == 2:
+        generator = generate_structure_functions_2d
+        x, y = coords
+        kwargs.setdefault("x", x)
+        kwargs.setdefault("y", y)
+        if kwargs.get("grid_type") == "latlon":
+            # Distances between neighbouring points, accumulated into coordinates
+            kwargs.setdefault(
+                "dx",
+                np.array(
+                    [0.0]
+                    + [
+                        calculate_separation_distances(
+                            x[i - 1], y[0], x[i], y[0], "latlon"
+                        )[0]
+                        for i in range(1, len(x))
+                    ]
+                ),
+            )
+            kwargs.setdefault(
+                "dy",
+                np.array(
+                    [0.0]
+                    + [
+                        calculate_separation_distances(
+                            x[0], y[i - 1], x[0], y[i], "latlon"
+                        )[1]
+                        for i in range(1, len(y))
+                    ]
+                ),
+            )
+    else:
+        generator = generate_structure_functions_3d
+        for name, coord in zip(["x", "y", "z"], coords, strict=True):
+            kwargs.setdefault(name, coord)
+    if sf_type is not None:
+        kwargs["sf_type"] = sf_type
+
+    fields = {
+        name: field
+        for name, field in {"u": u, "v": v, "w": w, "scalar": scalar}.items()
+        if field is not None
+    }
+    names = list(fields)
+
+    def generate(*arrays):
+        return generator(**dict(zip(names, arrays, strict=True)), **kwargs)
+
+    # Calculate the first element to find the outputs and separation distances
+    core_dims = list(reversed(dims))
+    extra_dims = [dim for dim in u.dims if dim not in dims]
+    first = {
+        name: field.isel({dim: 0 for dim in extra_dims if dim in field.dims})
+        for name, field in fields.items()
+    }
+    template = generate(
+        *[np.asarray(first[name].transpose(*core_dims).values) for name in names]
+    )
+    separations = {
+        key.removesuffix("-diffs"): value
+        for key, value in template.items()
+        if key.endswith("-diffs")
+    }
+    keys = [key for key in template if not key.endswith("-diffs")]
+    key_dims = {
+        key: _separation_name(key, list(separations)) + "_separation" for key in keys
+    }
+
+    def generate_outputs(*arrays):
+        output = generate(*arrays)
+        output = tuple(np.asarray(output[key], dtype=float) for key in keys)
+        return output if len(keys) > 1 else output[0]
+
+    outputs = xr.apply_ufunc(
+        generate_outputs,
+        *fields.values(),
+        input_core_dims=[core_dims] * len(fields),
+        output_core_dims=[[key_dims[key]] for key in keys],
+        vectorize=True,
+        dask=dask,
+        output_dtypes=[float] * len(keys),
+        dask_gufunc_kwargs={
+            "output_sizes": {
+                name + "_separation": len(value) for name, value in separations.items()
+            }
+        },
+    )
+    if len(keys) == 1:
+        outputs = (outputs,)
+
+    return xr.Dataset(
+        dict(zip(keys, outputs, strict=True)),
+        coords={name + "_separation": value for name, value in separations.items()},
+    )
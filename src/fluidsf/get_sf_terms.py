@@ -0,0 +1,86 @@
+import numpy as np
+
+
+def get_sf_terms(sf_type, direction):  # noqa: C901, D417
+    """
+    Express the requested structure functions as sums of products of field
+    increments for separation vectors along a given direction. Each structure
+    function is returned as a list of terms (coeff, factors), where factors is a
+    tuple of linear combinations of field increments and each linear combination is
+    a tuple of (field, weight) pairs. For example, the second-order longitudinal
+    structure function in the x direction of 2D data is [(1.0, ((("u", 1.0),),
+    (("u", 1.0),)))], i.e. the mean of the squared increment of u.
+
+    Parameters
+    ----------
+        sf_type: list
+            List of structure function types to calculate.
+            Accepted list entries must be one or more of the following strings:
+            "ASF_V", "ASF_S", "LL", "TT", "SS", "LLL", "LTT", "LSS".
+        direction: tuple
+            Direction of the separation vector, given as its (x, y) components for
+            2D data or its (x, y, z) components for 3D data. Does not need to be
+            normalized.
+
+    Returns
+    -------
+        dict:
+            Dictionary of terms keyed by structure function name, without a
+            direction suffix, e.g. "SF_advection_velocity" or "SF_LL". Field names
+            are "u", "v", "w", "scalar", "adv_x", "adv_y", "adv_z" and "adv_scalar".
+    """
+    direction = np.asarray(direction, dtype=float)
+    if direction.shape not in [(2,), (3,)] or not np.any(direction):
+        raise ValueError("Direction must be a non-zero vector with 2 or 3 components.")
+    direction = direction / np.linalg.norm(direction)
+
+    if len(direction) == 2:
+        velocity = ("u", "v")
+        advection = ("adv_x", "adv_y")
+        transverse_directions = [np.array([-direction[1], direction[0]])]
+    else:
+        velocity = ("u", "v", "w")
+        advection = ("adv_x", "adv_y", "adv_z")
+        # Complete an orthonormal basis using the axis least aligned with direction
+        axis = np.zeros(3)
+        axis[np.argmin(np.abs(direction))] = 1
+        first_transverse = np.cross(direction, axis)
+        first_transverse = first_transverse / np.linalg.norm(first_transverse)
+        transverse_directions = [
+            first_transverse,
+            np.cross(direction, first_transverse),
+        ]
+
+    def combination(vector):
+        return tuple(
+            (field, float(weight))
+            for field, weight in zip(velocity, vector, strict=True)
+            if abs(weight) > 1e-12
+        )
+
+    L = combination(direction)
+    T = [combination(vector) for vector in transverse_directions]
+    S = (("scalar", 1.0),)
+
+    terms = {}
+    if any("ASF_V" in t for t in sf_type):
+        terms["SF_advection_velocity"] = [
+            (1.0, (((adv, 1.0),), ((vel, 1.0),)))
+            for adv, vel in zip(advection, velocity, strict=True)
+        ]
+    if any("ASF_S" in t for t in sf_type):
+        terms["SF_advection_scalar"] = [(1.0, ((("adv_scalar", 1.0),), S))]
+    if any("LL" in t for t in sf_type):
+        terms["SF_LL"] = [(1.0, (L, L))]
+    if any("TT" in t for t in sf_type):
+        terms["SF_TT"] = [(1.0, (transverse, transverse)) for transverse in T]
+    if any("SS" in t for t in sf_type):
+        terms["SF_SS"] = [(1.0, (S, S))]
+    if any("LLL" in t for t in sf_type):
+        terms["SF_LLL"] = [(1.0, (L, L, L))]
+    if any("LTT" in t for t in sf_type):
+        terms["SF_LTT"] = [(1.0, (L, transverse, transverse)) for transverse in T]
+    if any("LSS" in t for t in sf_type):
+        terms["SF_LSS"] = [(1.0, (L, S, S))]
+
+    return terms
@@ -0,0 +1,47 @@
+import hashlib
+
+import numpy as np
+
+
+def _hash_value(digest, value):
+    # Add a parameter to the hash, including the data of arrays
+    if isinstance(value, np.ndarray) or (
+        hasattr(value, "__array__") and not isinstance(value, str)
+    ):
+        value = np.ascontiguousarray(value)
+        digest.update(f"array{value.dtype.str}{value.shape}".encode())
+        digest.update(value.view(np.uint8).ravel())
+    elif isinstance(value, list | tuple):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _hash_value(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key in sorted(value):
+            _hash_value(digest, key)
+            _hash_value(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def hash_inputs(*values):  # noqa: D417
+    """
+    Hash the inputs of a calculation, including the data of arrays and the
+    contents of lists, tuples and dictionaries, e.g. to key cached outputs or to
+    check that a checkpoint belongs to the same calculation.
+
+    Parameters
+    ----------
+        *values: any
+            Inputs to hash, in order. Arrays (and array-likes) are hashed by their
+            dtype, shape and data, and other values by their repr.
+
+    Returns
+    -------
+        str:
+            Hexadecimal BLAKE2b digest of the inputs.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for value in values:
+        _hash_value(digest, value)
+    return digest.hexdigest()
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+def polar_bins(  # noqa: D417
+    separation_distances, separation_angles, nbins, nangles=None
+):
+    """
+    Calculate the separation distance bin and angular sector of every entry of a
+    2D map grid, as used by bin_sf_maps_polar. The result can be passed to
+    bin_sf_maps_polar for every map of the same grid (e.g. one per snapshot), so
+    the bins are only calculated once.
+
+    Parameters
+    ----------
+        separation_distances: ndarray
+            2D array of separation distances of the map, as returned by
+            generate_sf_maps_2d.
+        separation_angles: ndarray
+            2D array of separation angles of the map, as returned by
+            generate_sf_maps_2d.
+        nbins: int or array_like
+            Number of equal-width separation distance bins, or an array of bin
+            edges.
+        nangles: int, optional
+            Number of equal-width angular sectors covering half a turn, since the
+            separation vectors of the maps only cover half of the plane. Defaults
+            to None, i.e. a single sector.
+
+    Returns
+    -------
+        dict:
+            Dictionary containing the distance bin of every map entry (flattened,
+            -1 for entries outside the bins and the zero separation) under
+            **radial_index**, the angular sector of every map entry under
+            **angular_index**, the bin edges under **edges**, the number of sectors
+            under **nangles** and the shape of the map under **shape**.
+    """
+    if nangles is not None and nangles < 1:
+        raise ValueError("nangles must be a positive integer.")
+
+    distances = np.asarray(separation_distances, dtype=float)
+    angles = np.asarray(separation_angles, dtype=float)
+    edges = np.histogram_bin_edges(distances[distances > 0], nbins).astype(float)
+    n_sectors = 1 if nangles is None else nangles
+
+    radial_index = np.digitize(distances, edges[1:-1])
+    outside = (distances <= 0) | (distances < edges[0]) | (distances > edges[-1])
+    radial_index[outside] = -1
+
+    # Separation vectors are stored for half of the plane, so their directions are
+    # only defined up to a half turn
+    sector_angles = np.mod(angles + np.pi / 2, np.pi)
+    angular_index = np.minimum(
+        (sector_angles / np.pi * n_sectors).astype(int), n_sectors - 1
+    )
+
+    return {
+        "radial_index": radial_index.ravel(),
+        "angular_index": angular_index.ravel(),
+        "edges": edges,
+        "nangles": nangles,
+        "shape": distances.shape,
+    }
@@ -0,0 +1,90 @@
+import queue
+import threading
+
+import numpy as np
+
+
+def _read_arrays(snapshot):
+    # Read array-likes (e.g. h5py datasets or memory maps) into memory, including
+    # those in tuples and dictionaries
+    if isinstance(snapshot, dict):
+        return {key: _read_arrays(value) for key, value in snapshot.items()}
+    if isinstance(snapshot, tuple):
+        return tuple(_read_arrays(value) for value in snapshot)
+    return np.asarray(snapshot)
+
+
+def _put(buffer, stop, item):
+    # Wait for space in the queue unless the consumer stopped early
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(snapshots, read, buffer, stop, done):
+    # Read the snapshots into the queue, followed by done or the error raised
+    try:
+        for snapshot in snapshots:
+            if not _put(buffer, stop, (read(snapshot), None)):
+                return
+    except Exception as error:  # noqa: BLE001
+        _put(buffer, stop, (None, error))
+        return
+    _put(buffer, stop, (done, None))
+
+
+def prefetch_snapshots(snapshots, prefetch=2, read=None):  # noqa: D417
+    """
+    Iterate over snapshots while the next snapshots are read on a background
+    thread, so that reading a snapshot from disk overlaps with calculating the
+    structure functions of the previous one. At most prefetch snapshots are held
+    in a bounded queue, which caps the memory used by snapshots read ahead.
+
+    Parameters
+    ----------
+        snapshots: iterable
+            Snapshots to read, e.g. tuples of h5py datasets (u[d], v[d]) for each
+            snapshot d, or keys of the snapshots if read is given.
+        prefetch: int, optional
+            Maximum number of snapshots read ahead of the one being processed.
+            Defaults to 2.
+        read: function, optional
+            Function that reads one element of snapshots into memory, e.g.
+            lambda d: (u[d][0], v[d][0]). Defaults to None, i.e. every array-like
+            in each element, including those in tuples and dictionaries, is read
+            with np.asarray.
+
+    Returns
+    -------
+        generator:
+            Generator of the snapshots as returned by read, in the order of
+            snapshots. Errors raised while reading are raised by the generator.
+    """
+    if prefetch < 1:
+        raise ValueError("prefetch must be a positive integer.")
+    if read is None:
+        read = _read_arrays
+
+    buffer = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()
+
+    thread = threading.Thread(
+        target=_produce, args=(snapshots, read, buffer, stop, done), daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            snapshot, error = buffer.get()
+            if error is not None:
+                raise error
+            if snapshot is done:
+                return
+            yield snapshot
+    finally:
+        stop.set()
+        thread.join()
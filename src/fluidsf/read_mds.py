@@ -0,0 +1,160 @@
+import re
+from pathlib import Path
+
+import numpy as np
+
+# Arakawa C-grid location of common MITgcm fields and grid variables. Velocities
+# are stored on the faces of the tracer cells, i.e. u at the west face, v at the
+# south face and w at the top face, and vorticity at the south-west corner.
+MDS_LOCATIONS = {
+    "u": (
+        "U",
+        "UVEL",
+        "UVELMASS",
+        "UVELSQ",
+        "uVel",
+        "uVeltave",
+        "DXC",
+        "DYG",
+        "RAW",
+        "hFacW",
+    ),
+    "v": (
+        "V",
+        "VVEL",
+        "VVELMASS",
+        "VVELSQ",
+        "vVel",
+        "vVeltave",
+        "DYC",
+        "DXG",
+        "RAS",
+        "hFacS",
+    ),
+    "w": ("W", "WVEL", "WVELMASS", "WVELSQ", "wVel", "wVeltave", "RF", "DRC"),
+    "corner": ("XG", "YG", "RAZ", "momVort3", "vort3"),
+}
+
+MDS_PRECISIONS = {"float32": "f4", "float64": "f8", "real*4": "f4", "real*8": "f8"}
+
+
+def _parse_meta(text):
+    # Parse the entries of an MITgcm .meta file, e.g. "nDims = [ 2 ];" or
+    # "fldList = { 'UVEL    ' 'VVEL    ' };", into lists of strings
+    entries = {}
+    for name, value in re.findall(r"(\w+)\s*=\s*[\[{](.*?)[\]}]\s*;", text, re.DOTALL):
+        quoted = re.findall(r"'([^']*)'", value)
+        if quoted:
+            entries[name] = [item.strip() for item in quoted]
+        else:
+            entries[name] = [item for item in re.split(r"[\s,]+", value) if item]
+    return entries
+
+
+def _parse_shape(meta, name):
+    # Shape of the arrays of a file with the axes ordered (z, y, x). dimList holds
+    # (global size, first index, last index) per axis, x first.
+    n_dims = int(meta["nDims"][0])
+    dim_list = [int(item) for item in meta["dimList"]]
+    if len(dim_list) != 3 * n_dims:
+        raise ValueError(f"dimList of {name}.meta must have 3 entries per axis.")
+    shape = []
+    for size, first, last in zip(*[iter(dim_list)] * 3, strict=True):
+        if first != 1 or last != size:
+            raise ValueError(
+                f"{name} is a tile of a global field. Only global files are "
+                "supported, e.g. written with globalFiles=.TRUE."
+            )
+        shape.append(size)
+    return tuple(reversed(shape))
+
+
+def _field_location(name, locations):
+    # C-grid location of a field, from locations or the common MITgcm names
+    if locations is not None and name in locations:
+        return locations[name]
+    for location, location_names in MDS_LOCATIONS.items():
+        if name in location_names:
+            return location
+    return "center"
+
+
+def read_mds(  # noqa: D417
+    path, iteration=None, fields=None, locations=None, byteorder=">"
+):
+    """
+    Read an MITgcm MDS output file (a .data file with a .meta file describing it)
+    as memory-mapped arrays, so that fields are only read from disk when they are
+    used and can be passed to the generate_ modules without intermediate copies.
+    Arrays have the shape given by the .meta file with the axes ordered (z, y, x)
+    like the generate_ modules, and keep the byte order of the file (big-endian by
+    default in MITgcm). Only global files (globalFiles=.TRUE. or files joined after
+    the run) are supported, not per-tile files.
+
+    Parameters
+    ----------
+        path: str or Path
+            Path of the file without the .data or .meta suffix, e.g. "U.0000000100",
+            or the prefix of the file if iteration is given, e.g. "U".
+        iteration: int, optional
+            Time step of the file, appended to path as ten digits. Defaults to None,
+            i.e. path includes the time step if the file has one.
+        fields: list, optional
+            Names of the fields to return. Defaults to None, i.e. all fields in the
+            file.
+        locations: dict, optional
+            C-grid location of fields, keyed by field name, overriding the locations
+            of common MITgcm names. Defaults to None.
+        byteorder: str, optional
+            Byte order of the file, ">" for big-endian or "<" for little-endian.
+            Defaults to ">".
+
+    Returns
+    -------
+        tuple:
+            Dictionary of the memory-mapped field arrays and dictionary of the
+            C-grid location of each field, i.e. "center" (tracer points), "u"
+            (west faces), "v" (south faces), "w" (top faces) or "corner"
+            (south-west corners), both keyed by field name. Fields of files with
+            one field per record are named by fldList in the .meta file, and the
+            field of a file without fldList is named by the prefix of the file,
+            e.g. "U", with a leading axis for records if there are several.
+    """
+    path = Path(path)
+    if path.suffix in (".data", ".meta"):
+        path = path.with_suffix("")
+    if iteration is not None:
+        path = path.with_name(f"{path.name}.{int(iteration):010d}")
+    if byteorder not in (">", "<"):
+        raise ValueError("byteorder must be '>' or '<'.")
+
+    meta = _parse_meta(path.with_name(path.name + ".meta").read_text())
+    shape = _parse_shape(meta, path.name)
+
+    precision = meta.get("dataprec", ["float32"])[0].lower()
+    if precision not in MDS_PRECISIONS:
+        raise ValueError(f"Unsupported dataprec {precision} in {path.name}.meta.")
+    n_records = int(meta.get("nrecords", ["1"])[0])
+    data = np.memmap(
+        path.with_name(path.name + ".data"),
+        dtype=byteorder + MDS_PRECISIONS[precision],
+        mode="r",
+        shape=(n_records, *shape),
+    )
+
+    names = meta.get("fldList")
+    if names is not None and len(names) == n_records:
+        arrays = {name: data[record] for record, name in enumerate(names)}
+    else:
+        name = path.name.split(".")[0]
+        arrays = {name: data[0] if n_records == 1 else data}
+
+    if fields is not None:
+        missing = [name for name in fields if name not in arrays]
+        if missing:
+            raise ValueError(f"Fields {missing} are not in {path.name}.")
+        arrays = {name: arrays[name] for name in fields}
+
+    field_locations = {name: _field_location(name, locations) for name in arrays}
+
+    return arrays, field_locations
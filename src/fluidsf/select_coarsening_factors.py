@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def select_coarsening_factors(separations, native_lags, length, periodic):
+    """
+    Assign separations to coarsened grids for multi-resolution calculations. The
+    separations up to native_lags stay on the native grid, and each following band
+    of separations, twice as long as the previous one, is assigned to a grid that is
+    coarsened by a further factor of two. Separations are rounded to the nearest
+    multiple of their coarsening factor, and separations that do not fit on their
+    coarsened grid are dropped.
+
+    Parameters
+    ----------
+    separations: array_like
+        Sorted 1D array of integer separations (lags) on the native grid.
+    native_lags: int
+        Largest separation that is calculated on the native grid.
+    length: int
+        Number of points along the axis of the separations.
+    periodic: bool
+        Whether the axis is periodic. A coarsened axis is only periodic if its
+        coarsening factor divides the number of points.
+
+    Returns
+    -------
+    tuple:
+        A tuple containing the sorted 1D array of unique separations on the native
+        grid and the coarsening factor used for each of them.
+    """
+    if not isinstance(native_lags, int | np.integer) or native_lags < 1:
+        raise ValueError("native_lags must be a positive integer.")
+
+    separations = np.asarray(separations, dtype=int)
+    levels = np.ceil(np.log2(np.maximum(separations, 1) / native_lags))
+    factors = 2 ** np.maximum(levels, 0).astype(int)
+    coarse_lags = np.maximum(np.round(separations / factors), 1).astype(int)
+
+    coarse_length = length // factors
+    coarse_periodic = periodic & (length % factors == 0)
+    max_shift = np.where(coarse_periodic, coarse_length // 2, coarse_length - 1)
+    fits = coarse_lags < max_shift
+
+    lags, first_index = np.unique((coarse_lags * factors)[fits], return_index=True)
+    return lags, factors[fits][first_index]
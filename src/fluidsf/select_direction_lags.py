@@ -0,0 +1,49 @@
+import numpy as np
+
+from .select_separations import select_separations
+
+
+def select_direction_lags(direction, lengths, periodic, separations=None):  # noqa: D417
+    """
+    Select the integer lags to iterate over along an integer lattice direction.
+    The separation vector of lag k is k times the direction, and lags are limited
+    so that the separation along every axis stays below half the number of points
+    for periodic axes and below the number of points minus one otherwise, as for
+    axis-aligned separations.
+
+    Parameters
+    ----------
+        direction: tuple
+            Integer lattice vector of the direction, e.g. (1, 1) or (2, -1),
+            ordered like lengths.
+        lengths: tuple
+            Number of points along each axis.
+        periodic: tuple
+            Whether each axis is periodic.
+        separations: array_like or tuple, optional
+            Subset of lags to calculate, as accepted by select_separations.
+            Defaults to None, i.e. every lag is calculated.
+
+    Returns
+    -------
+        ndarray:
+            Sorted 1D array of integer lags along the direction.
+    """
+    if not all(isinstance(c, int | np.integer) for c in direction) or not any(
+        direction
+    ):
+        raise ValueError("Directions must be non-zero vectors of integers.")
+    if len(direction) != len(lengths):
+        raise ValueError(
+            f"Directions must have {len(lengths)} components for {len(lengths)}D data."
+        )
+
+    max_lag = None
+    for component, n, axis_periodic in zip(direction, lengths, periodic, strict=True):
+        if component == 0:
+            continue
+        max_shift = int(n / 2) if axis_periodic else int(n - 1)
+        axis_max_lag = (max_shift - 1) // abs(component)
+        max_lag = axis_max_lag if max_lag is None else min(max_lag, axis_max_lag)
+
+    return select_separations(max(max_lag, 0) + 1, separations)
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def select_separations(max_shift, separations=None):
+    """
+    Select the integer separations (lags) at which structure functions are
+    calculated. By default every lag from 1 up to (but not including) max_shift is
+    returned, otherwise only a subset of those lags is returned.
+
+    Parameters
+    ----------
+    max_shift: int
+        Exclusive upper bound of the available lags, e.g. half the array length for
+        periodic data or the array length minus one for non-periodic data.
+    separations: array_like or tuple, optional
+        Separations to calculate. Either an array (or tuple) of integer lags or a
+        tuple ("log", count) that selects up to count logarithmically-spaced lags.
+        Requested lags that are not smaller than max_shift are dropped.
+        Defaults to None, i.e. every available lag.
+
+    Returns
+    -------
+    ndarray:
+        Sorted 1D array of unique integer lags.
+    """
+    if separations is None:
+        return np.arange(1, max_shift)
+
+    if (
+        isinstance(separations, tuple)
+        and len(separations) == 2
+        and isinstance(separations[0], str)
+    ):
+        spacing, count = separations
+        if spacing != "log":
+            raise ValueError("Separation spacing must be 'log'.")
+        if not isinstance(count, int | np.integer) or count < 1:
+            raise ValueError("Number of log-spaced separations must be a positive int.")
+        if max_shift <= 1:
+            return np.arange(1, max_shift)
+        lags = np.geomspace(1, max_shift - 1, count)
+        return np.unique(np.round(lags).astype(int))
+
+    lags = np.asarray(separations)
+    if lags.ndim != 1 or not np.issubdtype(lags.dtype, np.integer):
+        raise ValueError(
+            "separations must be a 1D array of integers or a tuple ('log', count)."
+        )
+    if np.any(lags < 1):
+        raise ValueError("All separations must be positive integers.")
+
+    lags = np.unique(lags)
+    return lags[lags < max_shift]
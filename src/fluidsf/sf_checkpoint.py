@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .hash_inputs import hash_inputs
+
+
+class SFCheckpoint:
+    """
+    Periodic checkpoint of a long structure function calculation. The arrays
+    registered with track, i.e. the partial structure functions and boolean
+    arrays marking the completed separations, and the state of a random number
+    generator registered with track_rng are written to an .npz file at most
+    every interval seconds when update is called. If the file already exists when
+    the checkpoint is created, tracked arrays are restored from it, so a resumed
+    calculation skips the completed separations. The file stores a hash of the
+    inputs, and a file written for different inputs raises a ValueError instead
+    of being resumed.
+
+    Parameters
+    ----------
+        path: str or Path
+            Path of the checkpoint file.
+        inputs: dict
+            Input arrays and parameters of the calculation, hashed to check that a
+            checkpoint file belongs to the same calculation.
+        interval: float, optional
+            Minimum time in seconds between writes of the checkpoint file.
+            Defaults to 60.
+
+    Attributes
+    ----------
+        path: Path
+            Path of the checkpoint file.
+        digest: str
+            Hash of the inputs.
+        resumed: bool
+            Whether the tracked arrays were restored from an existing file.
+    """
+
+    def __init__(self, path, inputs, interval=60.0):
+        self.path = Path(path)
+        self.interval = interval
+        self.digest = hash_inputs(inputs)
+        self._arrays = {}
+        self._rng = None
+        self._saved = {}
+        self._last_save = time.monotonic()
+        self.resumed = self.path.exists()
+        if self.resumed:
+            with np.load(self.path, allow_pickle=False) as file:
+                if str(file["digest"]) != self.digest:
+                    raise ValueError(
+                        f"Checkpoint {self.path} was written for different inputs. "
+                        "Delete it to start a new calculation."
+                    )
+                self._saved = {name: file[name] for name in file.files}
+
+    def track(self, arrays):
+        """
+        Register arrays to checkpoint, keyed by unique names, and restore their
+        values in place from the checkpoint file if it exists.
+        """
+        for name, array in arrays.items():
+            if array is None:
+                continue
+            if name in self._saved:
+                if np.shape(self._saved[name]) != np.shape(array):
+                    raise ValueError(f"Checkpoint array {name} has a different shape.")
+                array[...] = self._saved[name]
+            self._arrays[name] = array
+
+    def track_rng(self, rng):
+        """
+        Register a random number generator (numpy.random.Generator) to checkpoint,
+        and restore its state from the checkpoint file if it exists, so a resumed
+        calculation draws the same samples as an uninterrupted one.
+        """
+        if "rng_state" in self._saved:
+            rng.bit_generator.state = json.loads(str(self._saved["rng_state"]))
+        self._rng = rng
+
+    def update(self):
+        """Write the tracked arrays if interval seconds passed since the last write."""
+        if time.monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        """Write the tracked arrays to the checkpoint file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Replace the file in one step, so that a preempted write never leaves a
+        # partial checkpoint
+        with tempfile.NamedTemporaryFile(
+            dir=self.path.parent, suffix=".tmp", delete=False
+        ) as file:
+            arrays = dict(self._arrays)
+            if self._rng is not None:
+                arrays["rng_state"] = np.array(
+                    json.dumps(self._rng.bit_generator.state)
+                )
+            np.savez(file, digest=np.array(self.digest), **arrays)
+        os.replace(file.name, self.path)
+        self._last_save = time.monotonic()
+
+    def finish(self):
+        """Delete the checkpoint file once the calculation is complete."""
+        self.path.unlink(missing_ok=True)
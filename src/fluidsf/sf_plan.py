@@ -0,0 +1,353 @@
+import numpy as np
+import pandas as pd
+
+from .calculate_advection_2d import calculate_advection_2d
+from .calculate_advection_3d import calculate_advection_3d
+from .calculate_separation_distances import calculate_separation_distances
+from .calculate_separation_distances_3d import calculate_separation_distances_3d
+from .calculate_structure_function_fft import calculate_structure_function_fft
+from .calculate_structure_function_moments import (
+    calculate_structure_function_moments,
+)
+from .evaluate_sf_terms import evaluate_sf_terms
+from .get_sf_terms import get_sf_terms
+from .select_separations import select_separations
+
+
+class SFPlan:
+    """
+    Reusable plan for generating structure functions from many snapshots on the
+    same 2D or 3D grid. The separations, separation distances, bin assignments,
+    structure function terms and work buffers are set up once when the plan is
+    created, so that each call to execute only calculates the increments and
+    averages. The output of execute matches generate_structure_functions_2d or
+    generate_structure_functions_3d with the same arguments.
+
+    Parameters
+    ----------
+        x: ndarray
+            1D array of x-coordinates.
+        y: ndarray
+            1D array of y-coordinates.
+        z: ndarray, optional
+            1D array of z-coordinates for 3D data. Defaults to None, i.e. 2D data.
+        sf_type: list
+            List of structure function types to calculate.
+            Accepted list entries must be one or more of the following strings:
+            "ASF_V, "ASF_S", "LL", "TT", "SS", "LLL", "LTT", "LSS".
+            Defaults to ["ASF_V"].
+        boundary: str or list, optional
+            Boundary condition of the data, as accepted by
+            generate_structure_functions_2d for 2D data or
+            generate_structure_functions_3d for 3D data. Defaults to
+            "periodic-all".
+        grid_type: str, optional
+            Type of grid for 2D data, either "uniform" or "latlon". Defaults to
+            "uniform".
+        dx: ndarray, optional
+            Grid spacing in the x-direction for 2D latlon grids. Defaults to None.
+        dy: ndarray, optional
+            Grid spacing in the y-direction for 2D latlon grids. Defaults to None.
+        nbins: int, optional
+            Number of bins for binning the data. Defaults to None, i.e. does not bin
+            data.
+        separations: array_like or tuple, optional
+            Subset of integer separations (lags) to calculate in each direction, as
+            accepted by select_separations. Defaults to None, i.e. every lag is
+            calculated.
+        max_separation: float, optional
+            Maximum separation distance to calculate. Defaults to None, i.e. no
+            cutoff.
+        engine: str, optional
+            Method used to calculate the structure functions. Either "direct" to
+            average the increments for each separation in turn, "fft" to
+            calculate all separations in each direction at once with masked FFT
+            correlations (see calculate_structure_function_fft), or "moments" to
+            use cumulative sums and dot products without shifting the data (see
+            calculate_structure_function_moments). Defaults to "direct".
+
+    Attributes
+    ----------
+        lags: dict
+            Integer separations calculated in each direction, keyed by "x", "y"
+            and "z".
+        distances: dict
+            Separation distances in each direction, including the zero separation,
+            keyed by "x", "y" and "z".
+        bin_edges: dict
+            Edges of the distance bins in each direction, or None if nbins is None.
+    """
+
+    def __init__(  # noqa: C901
+        self,
+        x,
+        y,
+        z=None,
+        sf_type=["ASF_V"],  # noqa: B006
+        boundary="periodic-all",
+        grid_type="uniform",
+        dx=None,
+        dy=None,
+        nbins=None,
+        separations=None,
+        max_separation=None,
+        engine="direct",
+    ):
+        if not isinstance(sf_type, list) or len(sf_type) == 0:
+            raise ValueError("sf_type must be a non-empty list of strings.")
+        if not all(isinstance(t, str) for t in sf_type):
+            raise ValueError(
+                "All elements in sf_type must be strings. Accepted strings are: "
+                "ASF_V, ASF_S, LL, TT, SS, LLL, LTT, LSS."
+            )
+        if engine not in ["direct", "fft", "moments"]:
+            raise ValueError("Engine must be 'direct', 'fft' or 'moments'.")
+        if grid_type not in ["uniform", "latlon"]:
+            raise ValueError("Grid type must be 'uniform' or 'latlon'.")
+
+        if z is None:
+            if boundary not in ["periodic-all", "periodic-x", "periodic-y", None]:
+                raise ValueError(
+                    "Boundary must be 'periodic-all', 'periodic-x', 'periodic-y', "
+                    "or None."
+                )
+            if grid_type == "latlon" and (
+                isinstance(dx, int | float | None) or isinstance(dy, int | float | None)
+            ):
+                raise ValueError(
+                    "If grid_type is 'latlon', dx and dy must be provided as arrays."
+                )
+            coords = {"x": x, "y": y}
+            periodic = {
+                direction: boundary in ["periodic-all", "periodic-" + direction]
+                for direction in coords
+            }
+        else:
+            if grid_type != "uniform":
+                raise ValueError("3D data must be on a uniform grid.")
+            coords = {"x": x, "y": y, "z": z}
+            periodic = {
+                direction: boundary is not None
+                and ("periodic-all" in boundary or "periodic-" + direction in boundary)
+                for direction in coords
+            }
+
+        self.sf_type = sf_type
+        self.grid_type = grid_type
+        self.engine = engine
+        self.nbins = nbins
+        self._coords = coords
+        self._dx = dx
+        self._dy = dy
+        # Array axes are ordered (y, x) for 2D data and (z, y, x) for 3D data
+        self.shape = tuple(len(coords[d]) for d in reversed(list(coords)))
+        self._axes = {d: len(coords) - 1 - i for i, d in enumerate(coords)}
+        self._periodic = {self._axes[d]: periodic[d] for d in coords}
+
+        self._needs_scalar = any(
+            s in t for t in sf_type for s in ["SS", "LSS", "ASF_S"]
+        )
+
+        self.lags = {}
+        self.distances = {}
+        self.bin_edges = {}
+        self._terms = {}
+        self._bin_codes = {}
+        self._binned_distances = {}
+        for direction in coords:
+            n = len(coords[direction])
+            max_shift = int(n / 2) if periodic[direction] else int(n - 1)
+            lags = select_separations(max_shift, separations)
+
+            distances = np.zeros(len(lags))
+            for lag_index, lag in enumerate(lags):
+                shifted = {d: c[0] for d, c in coords.items()}
+                shifted[direction] = coords[direction][lag]
+                if z is None:
+                    separation = calculate_separation_distances(
+                        x[0], y[0], shifted["x"], shifted["y"], grid_type
+                    )
+                else:
+                    separation = calculate_separation_distances_3d(
+                        x[0], y[0], z[0], shifted["x"], shifted["y"], shifted["z"]
+                    )
+                distances[lag_index] = separation[list(coords).index(direction)]
+
+            if max_separation is not None:
+                within_max = np.abs(distances) <= max_separation
+                lags = lags[within_max]
+                distances = distances[within_max]
+
+            self.lags[direction] = lags
+            self.distances[direction] = np.concatenate(([0.0], distances))
+
+            unit = np.zeros(len(coords))
+            unit[list(coords).index(direction)] = 1
+            self._terms[direction] = {
+                name + "_" + direction: terms
+                for name, terms in get_sf_terms(sf_type, tuple(unit)).items()
+            }
+
+            if nbins is None:
+                self.bin_edges[direction] = None
+            else:
+                codes, edges = pd.cut(
+                    self.distances[direction],
+                    nbins,
+                    retbins=True,
+                    duplicates="drop",
+                    labels=False,
+                )
+                self._bin_codes[direction] = codes.astype(int)
+                self.bin_edges[direction] = edges
+                self._binned_distances[direction] = self._bin(
+                    direction, self.distances[direction]
+                )
+
+        # Fields that are needed, and work buffers for their increments
+        self._fields = {
+            field
+            for terms in self._terms.values()
+            for key_terms in terms.values()
+            for coeff, factors in key_terms
+            for combination in factors
+            for field, weight in combination
+        }
+        self._buffers = {}
+        if engine == "direct":
+            self._buffers = {field: np.empty(self.shape) for field in self._fields}
+
+    def _bin(self, direction, values):
+        """Average values within the precomputed distance bins, ignoring NaNs."""
+        codes = self._bin_codes[direction]
+        nbins = len(self.bin_edges[direction]) - 1
+        occupied = np.bincount(codes, minlength=nbins) > 0
+        finite = np.isfinite(values)
+        sums = np.bincount(codes[finite], weights=values[finite], minlength=nbins)
+        counts = np.bincount(codes[finite], minlength=nbins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        return means[occupied]
+
+    def _fill_increments(self, fields, axis, lag):
+        """Write the increments of every field at a lag along an axis."""
+        n = self.shape[axis]
+
+        def along(start, stop):
+            index = [slice(None)] * len(self.shape)
+            index[axis] = slice(start, stop)
+            return tuple(index)
+
+        increments = {}
+        for field, buffer in self._buffers.items():
+            values = fields[field]
+            np.subtract(
+                values[along(lag, None)],
+                values[along(0, n - lag)],
+                out=buffer[along(0, n - lag)],
+            )
+            if self._periodic[axis]:
+                np.subtract(
+                    values[along(0, lag)],
+                    values[along(n - lag, None)],
+                    out=buffer[along(n - lag, None)],
+                )
+                increments[field] = buffer
+            else:
+                increments[field] = buffer[along(0, n - lag)]
+
+        return increments
+
+    def execute(self, u, v, w=None, scalar=None):  # noqa: C901, D417
+        """
+        Calculate the planned structure functions for a single snapshot.
+
+        Parameters
+        ----------
+            u: ndarray
+                Array of u velocity components with the shape of the grid.
+            v: ndarray
+                Array of v velocity components with the shape of the grid.
+            w: ndarray, optional
+                Array of w velocity components for 3D data. Defaults to None.
+            scalar: ndarray, optional
+                Array of scalar values. Required if sf_type includes "SS", "LSS" or
+                "ASF_S". Defaults to None.
+
+        Returns
+        -------
+            dict:
+                Dictionary containing the requested structure functions and
+                separation distances, with the same keys as
+                generate_structure_functions_2d or generate_structure_functions_3d.
+        """
+        if np.shape(u) != self.shape or np.shape(v) != self.shape:
+            raise ValueError("u and v must have the shape of the planned grid.")
+        if len(self.shape) == 3 and np.shape(w) != self.shape:
+            raise ValueError("w must have the shape of the planned grid for 3D data.")
+        if self._needs_scalar and scalar is None:
+            raise ValueError(
+                "If you include 'SS', 'LSS' or 'ASF_S' in sf_type, you must provide "
+                "a scalar array."
+            )
+
+        fields = {"u": u, "v": v, "w": w, "scalar": scalar}
+        if len(self.shape) == 2:
+            x, y = self._coords["x"], self._coords["y"]
+            if "adv_x" in self._fields:
+                fields["adv_x"], fields["adv_y"] = calculate_advection_2d(
+                    u, v, x, y, self._dx, self._dy, self.grid_type
+                )
+            if "adv_scalar" in self._fields:
+                fields["adv_scalar"] = calculate_advection_2d(
+                    u, v, x, y, self._dx, self._dy, self.grid_type, scalar
+                )
+        else:
+            if "adv_x" in self._fields:
+                fields["adv_x"], fields["adv_y"], fields["adv_z"] = (
+                    calculate_advection_3d(u, v, w, *self._coords.values())
+                )
+            if "adv_scalar" in self._fields:
+                fields["adv_scalar"] = calculate_advection_3d(
+                    u, v, w, *self._coords.values(), scalar
+                )
+
+        data = {}
+        for direction, lags in self.lags.items():
+            terms = self._terms[direction]
+            SF_direction = {key: np.zeros(len(lags) + 1) for key in terms}
+            if self.engine != "direct":
+                if self.engine == "fft":
+                    calculate_all = calculate_structure_function_fft
+                else:
+                    calculate_all = calculate_structure_function_moments
+                SF_all = calculate_all(
+                    {field: fields[field] for field in self._fields},
+                    terms,
+                    self._axes[direction],
+                    self._periodic[self._axes[direction]],
+                    lags,
+                )
+                for key in terms:
+                    SF_direction[key][1:] = SF_all[key]
+            else:
+                for lag_index, lag in enumerate(lags, start=1):
+                    increments = self._fill_increments(
+                        fields, self._axes[direction], lag
+                    )
+                    for key, key_terms in terms.items():
+                        values = evaluate_sf_terms(key_terms, increments)
+                        if np.all(np.isnan(values)):
+                            SF_direction[key][lag_index] = np.nan
+                        else:
+                            SF_direction[key][lag_index] = np.nanmean(values)
+
+            if self.nbins is None:
+                data.update(SF_direction)
+                data[direction + "-diffs"] = self.distances[direction]
+            else:
+                for key, values in SF_direction.items():
+                    data[key] = self._bin(direction, values)
+                data[direction + "-diffs"] = self._binned_distances[direction]
+
+        return data
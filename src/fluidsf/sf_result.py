@@ -0,0 +1,287 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+class SFResult(Mapping):
+    """
+    Compact container for structure functions. All structure functions of a
+    separation direction are stored as the rows of one contiguous 2D array, along
+    with the separation distances and the number of samples averaged into each
+    value. The container behaves like the dictionary returned by the generators,
+    e.g. result["SF_LL_x"] and result["x-diffs"], and returns views into the 2D
+    arrays. Binning is lazy: binned returns a container that shares the arrays,
+    and each direction is binned on first access. Containers are saved to and
+    loaded from .npz files, or HDF5 files if h5py is installed, without pickling.
+
+    Parameters
+    ----------
+        values: dict
+            2D array of the structure functions of each separation direction, with
+            one row per structure function and one column per separation, keyed by
+            the name of the direction, e.g. "x".
+        keys: dict
+            List of the names of the rows of each array in values, e.g. ["SF_LL_x",
+            "SF_TT_x"], keyed like values.
+        separations: dict
+            1D array of the separation distances of each direction, keyed like
+            values.
+        counts: dict, optional
+            1D array of the number of samples averaged into each separation of each
+            direction, or a 2D array like values if the structure functions of a
+            direction have different numbers of samples, keyed like values.
+            Defaults to None, i.e. one sample per separation.
+        nbins: int, optional
+            Number of bins for binning the structure functions on access. Defaults
+            to None, i.e. does not bin data.
+
+    Attributes
+    ----------
+        values: dict
+            Unbinned 2D arrays of the structure functions of each direction.
+        keys_by_direction: dict
+            Names of the rows of each array in values.
+        separations: dict
+            Unbinned separation distances of each direction.
+        counts: dict
+            Number of samples of each separation of each direction.
+        nbins: int
+            Number of bins, or None if the data are not binned.
+    """
+
+    __slots__ = (
+        "_binned",
+        "_index",
+        "counts",
+        "keys_by_direction",
+        "nbins",
+        "separations",
+        "values",
+    )
+
+    def __init__(self, values, keys, separations, counts=None, nbins=None):
+        if set(values) != set(keys) or set(values) != set(separations):
+            raise ValueError("values, keys and separations must have the same keys.")
+        self.values = {}
+        self.keys_by_direction = {}
+        self.separations = {}
+        self.counts = {}
+        self._index = {}
+        for direction, direction_values in values.items():
+            direction_values = np.ascontiguousarray(direction_values, dtype=float)
+            direction_keys = [str(key) for key in keys[direction]]
+            if direction_values.shape != (
+                len(direction_keys),
+                len(separations[direction]),
+            ):
+                raise ValueError(
+                    f"values of direction {direction} must have one row per key and "
+                    "one column per separation."
+                )
+            self.values[direction] = direction_values
+            self.keys_by_direction[direction] = direction_keys
+            self.separations[direction] = np.asarray(separations[direction], float)
+            self.counts[direction] = (
+                np.ones(len(separations[direction]))
+                if counts is None
+                else np.asarray(counts[direction], dtype=float)
+            )
+            if self.counts[direction].shape not in [
+                self.separations[direction].shape,
+                direction_values.shape,
+            ]:
+                raise ValueError(
+                    f"counts of direction {direction} must have one entry per "
+                    "separation, or one row of entries per key."
+                )
+            for row, key in enumerate(direction_keys):
+                self._index[key] = (direction, row)
+        self.nbins = nbins
+        self._binned = {}
+
+    @classmethod
+    def from_dict(cls, data, nbins=None, counts=None):
+        """
+        Create a container from the dictionary returned by a generator. Every
+        entry must be a 1D array along one of the separation directions given by
+        the "-diffs" entries, e.g. "x-diffs". Entries ending in "-counts" (e.g.
+        "pair-counts" of generate_structure_functions_1d_batch) are used as the
+        number of pairs of each separation of their direction, unless counts (a
+        dictionary keyed by direction) is given.
+        """
+        separations = {
+            key.removesuffix("-diffs"): value
+            for key, value in data.items()
+            if key.endswith("-diffs")
+        }
+        if len(separations) == 0:
+            raise ValueError("No separation distances (keys ending in '-diffs').")
+        keys = {direction: [] for direction in separations}
+        data_counts = {}
+        for key in data:
+            if key.endswith("-counts"):
+                data_counts[_separation_name(key, list(separations))] = data[key]
+            elif not key.endswith("-diffs"):
+                keys[_separation_name(key, list(separations))].append(key)
+        if counts is None:
+            counts = data_counts
+        values = {}
+        for direction, direction_keys in keys.items():
+            values[direction] = np.empty(
+                (len(direction_keys), len(separations[direction]))
+            )
+            for row, key in enumerate(direction_keys):
+                if np.shape(data[key]) != np.shape(separations[direction]):
+                    raise ValueError(
+                        f"{key} must have the same shape as {direction}-diffs."
+                    )
+                values[direction][row] = data[key]
+        counts = {
+            direction: counts.get(direction, np.ones(len(separations[direction])))
+            for direction in separations
+        }
+        return cls(values, keys, separations, counts, nbins)
+
+    def binned(self, nbins):
+        """
+        Return a container that bins the structure functions into nbins distance
+        bins on access, sharing the unbinned arrays of this container.
+        """
+        return type(self)(
+            self.values, self.keys_by_direction, self.separations, self.counts, nbins
+        )
+
+    def _direction(self, direction):
+        # Structure functions, separation distances and counts of a direction,
+        # binned like bin_data on first access if requested
+        if self.nbins is None:
+            return (
+                self.values[direction],
+                self.separations[direction],
+                self.counts[direction],
+            )
+        if direction not in self._binned:
+            codes = pd.cut(
+                self.separations[direction], self.nbins, labels=False, duplicates="drop"
+            )
+            groups = np.unique(codes[~np.isnan(codes)])
+            in_group = (codes[:, None] == groups).astype(float)
+            values = self.values[direction]
+            valid = ~np.isnan(values)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self._binned[direction] = (
+                    (np.where(valid, values, 0.0) @ in_group) / (valid @ in_group),
+                    (self.separations[direction] @ in_group) / in_group.sum(axis=0),
+                    self.counts[direction] @ in_group,
+                )
+        return self._binned[direction]
+
+    def __getitem__(self, key):
+        """Return a structure function or separation distances by key."""
+        if key.endswith("-diffs") and key.removesuffix("-diffs") in self.values:
+            return self._direction(key.removesuffix("-diffs"))[1]
+        if key not in self._index:
+            raise KeyError(key)
+        direction, row = self._index[key]
+        return self._direction(direction)[0][row]
+
+    def __iter__(self):
+        """Iterate over the keys in the order of the generators."""
+        for direction, direction_keys in self.keys_by_direction.items():
+            yield from direction_keys
+            yield direction + "-diffs"
+
+    def __len__(self):
+        """Return the number of keys."""
+        return len(self._index) + len(self.values)
+
+    def __repr__(self):
+        """Return the keys and number of bins of the container."""
+        return f"SFResult({list(self)}, nbins={self.nbins})"
+
+    def get_counts(self, direction):
+        """Return the number of samples of each (binned) separation of a direction."""
+        return self._direction(direction)[2]
+
+    def to_dict(self):
+        """Return the structure functions as a dictionary like the generators."""
+        return {key: np.array(self[key]) for key in self}
+
+    def save(self, path):
+        """
+        Save the container to an .npz file, or to an HDF5 file if path ends in
+        .h5 or .hdf5. The unbinned arrays are written as they are stored.
+        """
+        arrays = {"nbins": np.array(-1 if self.nbins is None else self.nbins)}
+        for direction in self.values:
+            arrays["values/" + direction] = self.values[direction]
+            arrays["keys/" + direction] = np.array(
+                self.keys_by_direction[direction], dtype=str
+            )
+            arrays["separations/" + direction] = self.separations[direction]
+            arrays["counts/" + direction] = self.counts[direction]
+        if str(path).endswith((".h5", ".hdf5")):
+            h5py = _import_h5py()
+            with h5py.File(path, "w") as file:
+                for name, array in arrays.items():
+                    if array.dtype.kind == "U":
+                        array = array.astype(h5py.string_dtype())
+                    file.create_dataset(name, data=array)
+        else:
+            np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a container saved with save. The arrays of .npz files are read into
+        memory in full when loaded.
+        """
+        if str(path).endswith((".h5", ".hdf5")):
+            h5py = _import_h5py()
+            with h5py.File(path, "r") as file:
+                arrays = {
+                    group + "/" + name: file[group][name][()]
+                    for group in ["values", "keys", "separations", "counts"]
+                    for name in file[group]
+                }
+                arrays["nbins"] = file["nbins"][()]
+            for name in list(arrays):
+                if name.startswith("keys/"):
+                    arrays[name] = arrays[name].astype(str)
+        else:
+            with np.load(path, allow_pickle=False) as file:
+                arrays = {name: file[name] for name in file.files}
+
+        fields = {"values": {}, "keys": {}, "separations": {}, "counts": {}}
+        for name, array in arrays.items():
+            if "/" in name:
+                field, direction = name.split("/", 1)
+                fields[field][direction] = array
+        nbins = int(arrays["nbins"])
+        return cls(
+            fields["values"],
+            {direction: list(keys) for direction, keys in fields["keys"].items()},
+            fields["separations"],
+            fields["counts"],
+            None if nbins < 0 else nbins,
+        )
+
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError as error:
+        raise ImportError("Saving to HDF5 files requires h5py.") from error
+    return h5py
+
+
+def _separation_name(key, names):
+    # Name of the separation direction of an output, e.g. "x" for SF_LL_x_stderr,
+    # "1_1" for SF_LL_1_1 or "x" for x-coarsening
+    for name in sorted(names, key=len, reverse=True):
+        if key.startswith(name + "-") or f"_{name}_" in key + "_":
+            return name
+    if len(names) == 1:
+        return names[0]
+    raise ValueError(f"Could not find the separation direction of {key}.")
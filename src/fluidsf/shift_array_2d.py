@@ -2,7 +2,7 @@ import numpy as np
 
 
 def shift_array_2d(  # noqa: D417
-    input_array, shift_x=1, shift_y=1, boundary="periodic-all"
+    input_array, shift_x=1, shift_y=1, boundary="periodic-all", axes=(1, 0)
 ):
     """
     Shifts 2D array in x and y by the specified integer amounts and returns
@@ -25,6 +25,10 @@ def shift_array_2d(  # noqa: D417
             the array, otherwise the array will be padded with NaNs. Accepted strings
             are "periodic-x", "periodic-y", and "periodic-all".
             Defaults to "periodic-all".
+        axes: tuple, optional
+            Axes of the x- and y-direction in input_array, e.g. (0, 1) for arrays
+            ordered (x, y). The shifted arrays have the shape and memory layout of
+            input_array. Defaults to (1, 0).
 
     Returns
     -------
@@ -33,8 +37,11 @@ def shift_array_2d(  # noqa: D417
         shifted_y_array
             2D array shifted in y by the specified integer amount
     """
-    shifted_x_array = np.full(np.shape(input_array), np.nan)
-    shifted_y_array = np.full(np.shape(input_array), np.nan)
+    # Shift views with the axes ordered (y, x), so that arrays in other layouts are
+    # not copied
+    input_array = np.moveaxis(np.asarray(input_array), axes, (1, 0))
+    shifted_x_array = np.full_like(input_array, np.nan, dtype=float, subok=False)
+    shifted_y_array = np.full_like(input_array, np.nan, dtype=float, subok=False)
 
     if boundary == "periodic-all":
         shifted_x_array[:, :-shift_x] = input_array[:, shift_x:]
@@ -59,4 +66,7 @@ def shift_array_2d(  # noqa: D417
         shifted_x_array[:, :-shift_x] = input_array[:, shift_x:]
         shifted_y_array[:-shift_y, :] = input_array[shift_y:, :]
 
-    return shifted_x_array, shifted_y_array
+    return (
+        np.moveaxis(shifted_x_array, (1, 0), axes),
+        np.moveaxis(shifted_y_array, (1, 0), axes),
+    )
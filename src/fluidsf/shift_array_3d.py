@@ -2,7 +2,7 @@ import numpy as np
 
 
 def shift_array_3d(  # noqa: D417
-    input_array, shift_x=1, shift_y=1, shift_z=1, boundary=None
+    input_array, shift_x=1, shift_y=1, shift_z=1, boundary=None, axes=(2, 1, 0)
 ):
     """
     Shifts 3D array in x/y/z by the specified integer amounts and returns
@@ -29,6 +29,10 @@ def shift_array_3d(  # noqa: D417
             will wrap the array, otherwise the array will be padded with NaNs. Accepted
             strings are "periodic-x", "periodic-y", "periodic-z", and "periodic-all".
             Defaults to "periodic-all".
+        axes: tuple, optional
+            Axes of the x-, y- and z-direction in input_array, e.g. (0, 1, 2) for
+            arrays ordered (x, y, z). The shifted arrays have the shape and memory
+            layout of input_array. Defaults to (2, 1, 0).
 
     Returns
     -------
@@ -39,9 +43,12 @@ def shift_array_3d(  # noqa: D417
         shifted_z_array
             3D array shifted in z by the specified integer amount
     """
-    shifted_x_array = np.full(np.shape(input_array), np.nan)
-    shifted_y_array = np.full(np.shape(input_array), np.nan)
-    shifted_z_array = np.full(np.shape(input_array), np.nan)
+    # Shift views with the axes ordered (z, y, x), so that arrays in other layouts
+    # are not copied
+    input_array = np.moveaxis(np.asarray(input_array), axes, (2, 1, 0))
+    shifted_x_array = np.full_like(input_array, np.nan, dtype=float, subok=False)
+    shifted_y_array = np.full_like(input_array, np.nan, dtype=float, subok=False)
+    shifted_z_array = np.full_like(input_array, np.nan, dtype=float, subok=False)
 
     shifted_x_array[:, :, :-shift_x] = input_array[:, :, shift_x:]
     shifted_y_array[:, :-shift_y, :] = input_array[:, shift_y:, :]
@@ -62,4 +69,8 @@ def shift_array_3d(  # noqa: D417
         if any("periodic-z" in b for b in boundary):
             shifted_z_array[-shift_z:, :, :] = input_array[:shift_z, :, :]
 
-    return shifted_x_array, shifted_y_array, shifted_z_array
+    return (
+        np.moveaxis(shifted_x_array, (2, 1, 0), axes),
+        np.moveaxis(shifted_y_array, (2, 1, 0), axes),
+        np.moveaxis(shifted_z_array, (2, 1, 0), axes),
+    )
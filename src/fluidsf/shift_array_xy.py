@@ -1,7 +1,7 @@
 import numpy as np
 
 
-def shift_array_xy(input_array, x_shift=0, y_shift=0):  # noqa: D417
+def shift_array_xy(input_array, x_shift=0, y_shift=0, axes=(1, 0)):  # noqa: D417
     """
     Wrap 2D array in x and y by the specified integer amounts and returns
     the shifted arrays. Only works with 2D, doubly-periodic data on an even grid.
@@ -14,13 +14,20 @@ def shift_array_xy(input_array, x_shift=0, y_shift=0):  # noqa: D417
             Shift amount for x shift.
         shift_y: int, optional
             Shift amount for y shift.
+        axes: tuple, optional
+            Axes of the x- and y-direction in input_array, e.g. (0, 1) for arrays
+            ordered (x, y). The shifted array has the shape and memory layout of
+            input_array. Defaults to (1, 0).
 
     Returns
     -------
         shifted_xy_array
             2D array shifted in the x-y directions by the specified integer amount
     """
-    shifted_xy_array = np.full(np.shape(input_array), np.nan)
+    # Shift a view with the axes ordered (y, x), so that arrays in other layouts are
+    # not copied
+    input_array = np.moveaxis(np.asarray(input_array), axes, (1, 0))
+    shifted_xy_array = np.full_like(input_array, np.nan, dtype=float, subok=False)
 
     if x_shift == 0 and y_shift == 0:
         shifted_xy_array = input_array
@@ -36,4 +43,4 @@ def shift_array_xy(input_array, x_shift=0, y_shift=0):  # noqa: D417
         shifted_xy_array[-y_shift:, :-x_shift] = input_array[:y_shift, x_shift:]
         shifted_xy_array[-y_shift:, -x_shift:] = input_array[:y_shift, :x_shift]
 
-    return shifted_xy_array
+    return np.moveaxis(shifted_xy_array, (1, 0), axes)
@@ -66,3 +66,13 @@ def test_bin_data(dd, sf, nbins, expected_result):
     """Test the bin_data function."""
     result = bin_data(dd, sf, nbins)
     np.testing.assert_allclose(result, expected_result)
+
+
+def test_bin_data_sum():
+    """Test that the sum statistic adds up the data in each bin."""
+    dd, sf = bin_data(np.linspace(1, 24, 24), np.linspace(2, 48, 24), 3, "sum")
+    np.testing.assert_allclose(dd, [4.5, 12.5, 20.5])
+    np.testing.assert_allclose(sf, [72, 200, 328])
+
+    with pytest.raises(ValueError):
+        bin_data(np.arange(5), np.arange(5), 2, statistic="median")
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from fluidsf.bin_sf_maps_polar import bin_sf_maps_polar
+from fluidsf.polar_bins import polar_bins
+
+
+def make_maps(rng):
+    """Build a map grid like generate_sf_maps_2d with random structure functions."""
+    x_separations, y_separations = np.meshgrid(
+        np.arange(5), np.arange(-4, 4), indexing="ij"
+    )
+    angles = np.arctan2(y_separations, x_separations)
+    angles[0, :4] = -np.pi / 2
+    return {
+        "SF_LL_xy": rng.standard_normal((5, 8)),
+        "SF_TT_xy": rng.standard_normal((5, 8)),
+        "separation_distances": np.hypot(x_separations, y_separations),
+        "separation_angles": angles,
+        "x_separations": x_separations,
+        "y_separations": y_separations,
+    }
+
+
+def test_bin_sf_maps_polar():
+    """Test that the binned maps match averages over the map entries in each bin."""
+    rng = np.random.default_rng(0)
+    maps = [make_maps(rng) for _ in range(3)]
+    maps[1]["SF_LL_xy"][2, 6] = np.nan
+
+    output_dict = bin_sf_maps_polar(maps, 4, nangles=2, harmonics=(2,))
+
+    distances = maps[0]["separation_distances"]
+    angles = maps[0]["separation_angles"]
+    edges = np.histogram_bin_edges(distances[distances > 0], 4)
+    assert output_dict["SF_LL_iso"].shape == (3, 4)
+    assert output_dict["SF_TT_sectors"].shape == (3, 4, 2)
+    assert output_dict["SF_LL_harmonics"].shape == (3, 4, 1)
+    for bin_index in range(4):
+        in_bin = (distances > 0) & (distances >= edges[bin_index])
+        if bin_index < 3:
+            in_bin &= distances < edges[bin_index + 1]
+        else:
+            in_bin &= distances <= edges[-1]
+        assert output_dict["bin_counts"][bin_index] == in_bin.sum()
+        for map_index, sf_map in enumerate(maps):
+            values = sf_map["SF_LL_xy"][in_bin]
+            valid = ~np.isnan(values)
+            np.testing.assert_allclose(
+                output_dict["SF_LL_iso"][map_index, bin_index],
+                values[valid].mean(),
+            )
+            np.testing.assert_allclose(
+                output_dict["SF_LL_harmonics"][map_index, bin_index, 0],
+                np.mean(values[valid] * np.exp(-2j * angles[in_bin][valid])),
+            )
+            in_sector = in_bin & (angles >= 0) & (angles < np.pi / 2)
+            np.testing.assert_allclose(
+                output_dict["SF_TT_sectors"][map_index, bin_index, 1],
+                sf_map["SF_TT_xy"][in_sector].mean(),
+            )
+
+    # Stacked maps give the same result as a list of maps
+    stacked = dict(maps[0])
+    for key in ["SF_LL_xy", "SF_TT_xy"]:
+        stacked[key] = np.stack([sf_map[key] for sf_map in maps])
+    stacked_dict = bin_sf_maps_polar(stacked, 4, nangles=2, harmonics=(2,))
+    for key, value in output_dict.items():
+        np.testing.assert_allclose(stacked_dict[key], value)
+
+    # Precomputed bins give the same result
+    bins = polar_bins(
+        maps[0]["separation_distances"], maps[0]["separation_angles"], 4, 2
+    )
+    for map_index, sf_map in enumerate(maps):
+        map_dict = bin_sf_maps_polar(sf_map, harmonics=(2,), bins=bins)
+        np.testing.assert_allclose(
+            map_dict["SF_TT_sectors"], output_dict["SF_TT_sectors"][map_index]
+        )
+        np.testing.assert_allclose(
+            map_dict["separation_angles"], output_dict["separation_angles"]
+        )
+
+
+@pytest.mark.parametrize(
+    "nangles, harmonics",
+    [
+        # Test 1: non-positive number of sectors raises ValueError
+        (0, None),
+        # Test 2: odd harmonics raise ValueError
+        (None, (1, 2)),
+    ],
+)
+def test_bin_sf_maps_polar_errors(nangles, harmonics):
+    """Test that bin_sf_maps_polar raises ValueError for invalid bins."""
+    with pytest.raises(ValueError):
+        bin_sf_maps_polar(
+            make_maps(np.random.default_rng(0)), 4, nangles=nangles, harmonics=harmonics
+        )
+
+    # Bins are required, and must match the map grid
+    sf_map = make_maps(np.random.default_rng(0))
+    with pytest.raises(ValueError):
+        bin_sf_maps_polar(sf_map)
+    bins = polar_bins(np.ones((3, 3)), np.zeros((3, 3)), 2)
+    with pytest.raises(ValueError):
+        bin_sf_maps_polar(sf_map, bins=bins)
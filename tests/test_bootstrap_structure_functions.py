@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from fluidsf.bootstrap_structure_functions import bootstrap_structure_functions
+
+
+def make_sfs(n_snapshots, seed=0):
+    """Make per-snapshot structure function dictionaries."""
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "SF_LL_x": 1 + rng.standard_normal(5),
+            "SF_LLL_x": rng.standard_normal(5),
+            "x-diffs": np.arange(5.0),
+        }
+        for _ in range(n_snapshots)
+    ]
+
+
+@pytest.mark.parametrize("block_length", [None, 1, 4])
+def test_bootstrap_structure_functions(block_length):
+    """Test the bootstrap means, intervals and reproducibility."""
+    sfs = make_sfs(20)
+    sfs[3]["SF_LLL_x"][2] = np.nan
+
+    output_dict = bootstrap_structure_functions(
+        sfs, n_resamples=2000, block_length=block_length, seed=1
+    )
+
+    np.testing.assert_array_equal(output_dict["x-diffs"], np.arange(5.0))
+    for key in ["SF_LL_x", "SF_LLL_x"]:
+        stacked = np.array([sf[key] for sf in sfs])
+        np.testing.assert_allclose(output_dict[key], np.nanmean(stacked, axis=0))
+        assert np.all(output_dict[key + "_ci_low"] < output_dict[key])
+        assert np.all(output_dict[key + "_ci_high"] > output_dict[key])
+        if block_length is None:
+            # Standard error of the mean of independent snapshots
+            np.testing.assert_allclose(
+                output_dict[key + "_stderr"],
+                np.nanstd(stacked, axis=0) / np.sqrt(np.sum(~np.isnan(stacked), 0)),
+                rtol=0.1,
+            )
+
+    # The same seed gives the same resamples with any number of workers
+    repeat_dict = bootstrap_structure_functions(
+        sfs, n_resamples=2000, block_length=block_length, seed=1, workers=3
+    )
+    for key, value in output_dict.items():
+        np.testing.assert_allclose(repeat_dict[key], value)
+
+
+def test_bootstrap_structure_functions_stacked():
+    """Test that stacked structure functions match a list of snapshots."""
+    sfs = make_sfs(10)
+    stacked = {key: np.stack([sf[key] for sf in sfs]) for key in sfs[0]}
+    stacked["x-diffs"] = sfs[0]["x-diffs"]
+
+    output_dict = bootstrap_structure_functions(sfs, n_resamples=100, seed=0)
+    stacked_dict = bootstrap_structure_functions(stacked, n_resamples=100, seed=0)
+    for key, value in output_dict.items():
+        np.testing.assert_allclose(stacked_dict[key], value)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        # Test 1: blocks longer than the series raise ValueError
+        {"block_length": 11},
+        # Test 2: invalid confidence level raises ValueError
+        {"confidence_level": 1.5},
+    ],
+)
+def test_bootstrap_structure_functions_errors(kwargs):
+    """Test that bootstrap_structure_functions raises ValueError for bad input."""
+    with pytest.raises(ValueError):
+        bootstrap_structure_functions(make_sfs(10), **kwargs)
+    with pytest.raises(ValueError):
+        bootstrap_structure_functions([{"x-diffs": np.arange(3)}])
@@ -166,3 +166,105 @@ def test_calculate_advection(
     """Test that calculate_advection works correctly for multiple cases."""
     output_advection = calculate_advection_2d(u, v, x, y, dx, dy, grid_type, scalar)
     np.testing.assert_allclose(output_advection, expected_advection_result)
+
+
+@pytest.mark.parametrize("x_faces, y_faces", [(8, 6), (9, 7), (7, 5)])
+@pytest.mark.parametrize("grid_type", ["uniform", "nonuniform"])
+@pytest.mark.parametrize("with_scalar", [False, True])
+def test_calculate_advection_staggered(x_faces, y_faces, grid_type, with_scalar):
+    """Test that staggered velocities give the advection of the cell centers."""
+    x = 0.5 * np.arange(8)
+    y = 0.5 * np.arange(6)
+    dx = np.full(8, 0.5)
+    dy = np.full(6, 0.5)
+    # Faces start half a cell before the first center unless only inner faces are
+    # stored
+    x_face = 0.5 * (np.arange(x_faces) - (0.5 if x_faces > 7 else -0.5))
+    y_face = 0.5 * (np.arange(y_faces) - (0.5 if y_faces > 5 else -0.5))
+    u = 3 * x_face + np.sin(y)[:, None]
+    v = -2 * y_face[:, None] + np.cos(x)
+    scalar = np.sin(x) * np.cos(y)[:, None] if with_scalar else None
+
+    staggered = calculate_advection_2d(
+        u, v, x, y, dx, dy, grid_type, scalar, staggered=True
+    )
+    centered = calculate_advection_2d(
+        3 * x + np.sin(y)[:, None],
+        -2 * y[:, None] + np.cos(x),
+        x,
+        y,
+        dx,
+        dy,
+        grid_type,
+        scalar,
+    )
+    np.testing.assert_allclose(staggered, centered, atol=1e-12)
+
+
+def test_calculate_advection_staggered_periodic():
+    """Test that the last face of a periodic staggered axis wraps around."""
+    x = 0.5 * np.arange(8)
+    y = 0.5 * np.arange(6)
+    period = 4.0
+
+    def u_of(x):
+        return np.sin(2 * np.pi * x / period) + 0 * y[:, None]
+
+    # One face per cell, half a cell before each center, so the face after the
+    # last center is the first face shifted by one period
+    u = u_of(x - 0.25)
+    v = np.zeros((6, 8))
+    expected = (
+        0.5 * (u_of(x - 0.25) + u_of(x + 0.25)) * (u_of(x + 0.25) - u_of(x - 0.25))
+    ) / 0.5
+
+    adv_x, adv_y = calculate_advection_2d(
+        u, v, x, y, staggered=True, periodic=(True, False)
+    )
+    np.testing.assert_allclose(adv_x, expected, atol=1e-12)
+    np.testing.assert_allclose(adv_y, 0, atol=1e-12)
+
+    adv_x, _ = calculate_advection_2d(u, v, x, y, staggered=True)
+    assert not np.allclose(adv_x[:, -1], expected[:, -1])
+    np.testing.assert_allclose(adv_x[:, :-1], expected[:, :-1], atol=1e-12)
+
+
+@pytest.mark.parametrize("with_scalar", [False, True])
+def test_calculate_advection_staggered_cumulative_spacing(with_scalar):
+    """Test that spacings with a leading zero give finite staggered advection."""
+    x = 0.5 * np.arange(8)
+    y = 0.5 * np.arange(6)
+    x_face = x - 0.25
+    y_face = y - 0.25
+    u = 3 * x_face + np.sin(y)[:, None]
+    v = -2 * y_face[:, None] + np.cos(x)
+    scalar = np.sin(x) * np.cos(y)[:, None] if with_scalar else None
+    dx = np.r_[0, np.full(7, 0.5)]
+    dy = np.r_[0, np.full(5, 0.5)]
+
+    cumulative = calculate_advection_2d(
+        u, v, x, y, dx, dy, "latlon", scalar, staggered=True
+    )
+    uniform = calculate_advection_2d(
+        u, v, x, y, 0.5, 0.5, "uniform", scalar, staggered=True
+    )
+    assert np.all(np.isfinite(cumulative))
+    np.testing.assert_allclose(cumulative, uniform, atol=1e-12)
+
+
+@pytest.mark.parametrize("with_scalar", [False, True])
+def test_calculate_advection_axes(with_scalar):
+    """Test that arrays ordered (x, y) give the transposed advection."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 6, 8))
+    x = np.arange(8.0)
+    y = np.arange(6.0)
+    scalar = scalar if with_scalar else None
+
+    advection = calculate_advection_2d(u, v, x, y, scalar=scalar)
+    transposed = calculate_advection_2d(
+        u.T, v.T, x, y, scalar=None if scalar is None else scalar.T, axes=(0, 1)
+    )
+    np.testing.assert_allclose(
+        transposed, np.transpose(advection, (0, 2, 1) if scalar is None else None)
+    )
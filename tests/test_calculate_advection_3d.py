@@ -135,3 +135,81 @@ def test_calculate_advection_3d(u, v, w, x, y, z, scalar, expected_advection_res
     """Test that calculate_advection works correctly for multiple cases."""
     output_advection = calculate_advection_3d(u, v, w, x, y, z, scalar)
     np.testing.assert_allclose(output_advection, expected_advection_result)
+
+
+@pytest.mark.parametrize("with_scalar", [False, True])
+def test_calculate_advection_3d_staggered(with_scalar):
+    """Test that staggered velocities give the advection of the cell centers."""
+    x = np.arange(6.0)
+    y = np.arange(5.0)
+    z = np.arange(4.0)
+    # Velocities on the lower face of every cell, like MITgcm
+    u = 2 * (x - 0.5) + np.sin(y)[:, None] + z[:, None, None]
+    v = -(y - 0.5)[:, None] + np.cos(x) + z[:, None, None] ** 2
+    w = 0.5 * (z - 0.5)[:, None, None] + np.sin(x) * np.cos(y)[:, None]
+    scalar = np.sin(x) * y[:, None] * z[:, None, None] if with_scalar else None
+
+    staggered = calculate_advection_3d(u, v, w, x, y, z, scalar, staggered=True)
+    centered = calculate_advection_3d(
+        2 * x + np.sin(y)[:, None] + z[:, None, None],
+        -y[:, None] + np.cos(x) + z[:, None, None] ** 2,
+        0.5 * z[:, None, None] + np.sin(x) * np.cos(y)[:, None],
+        x,
+        y,
+        z,
+        scalar,
+    )
+    np.testing.assert_allclose(staggered, centered, atol=1e-12)
+
+
+def test_calculate_advection_3d_staggered_periodic():
+    """Test that the last face of a periodic staggered axis wraps around."""
+    x = np.arange(6.0)
+    y = np.arange(5.0)
+    z = np.arange(4.0)
+
+    def w_of(z):
+        return np.sin(2 * np.pi * z / 4)[:, None, None] + 0 * x + 0 * y[:, None]
+
+    u = np.zeros((4, 5, 6))
+    v = np.zeros((4, 5, 6))
+    w = w_of(z - 0.5)
+    expected = 0.5 * (w_of(z - 0.5) + w_of(z + 0.5)) * (w_of(z + 0.5) - w_of(z - 0.5))
+
+    adv_x, adv_y, adv_z = calculate_advection_3d(
+        u, v, w, x, y, z, staggered=True, periodic=(False, False, True)
+    )
+    np.testing.assert_allclose(adv_z, expected, atol=1e-12)
+    np.testing.assert_allclose(adv_x, 0, atol=1e-12)
+    np.testing.assert_allclose(adv_y, 0, atol=1e-12)
+
+    adv_z = calculate_advection_3d(u, v, w, x, y, z, staggered=True)[2]
+    assert not np.allclose(adv_z[-1], expected[-1])
+
+
+@pytest.mark.parametrize("with_scalar", [False, True])
+def test_calculate_advection_3d_axes(with_scalar):
+    """Test that arrays ordered (x, y, z) give the transposed advection."""
+    rng = np.random.default_rng(0)
+    u, v, w, scalar = rng.standard_normal((4, 4, 5, 6))
+    x = np.arange(6.0)
+    y = np.arange(5.0)
+    z = np.arange(4.0)
+    scalar = scalar if with_scalar else None
+
+    advection = calculate_advection_3d(u, v, w, x, y, z, scalar)
+    transposed = calculate_advection_3d(
+        u.T,
+        v.T,
+        w.T,
+        x,
+        y,
+        z,
+        None if scalar is None else scalar.T,
+        axes=(0, 1, 2),
+    )
+    if scalar is None:
+        for component, expected in zip(transposed, advection, strict=True):
+            np.testing.assert_allclose(component, expected.T)
+    else:
+        np.testing.assert_allclose(transposed, advection.T)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from fluidsf.calculate_decorrelation_length import calculate_decorrelation_length
+
+
+def make_ar1(phi, shape, seed=0):
+    """Generate first-order autoregressive series along the last axis."""
+    noise = np.random.default_rng(seed).standard_normal(shape)
+    values = np.zeros(shape)
+    for i in range(1, shape[-1]):
+        values[..., i] = phi * values[..., i - 1] + noise[..., i]
+    return values
+
+
+@pytest.mark.parametrize(
+    "phi, axis, periodic, expected_output",
+    [
+        # Test 1: AR(1) series have decorrelation length (1 + phi) / (1 - phi)
+        (0.8, 1, False, 9.0),
+        # Test 2: same along a periodic axis
+        (0.5, 1, True, 3.0),
+        # Test 3: independent series across the other axis
+        (0.8, 0, False, 1.0),
+    ],
+)
+def test_calculate_decorrelation_length(phi, axis, periodic, expected_output):
+    """Test that calculate_decorrelation_length recovers known lengths."""
+    values = make_ar1(phi, (20, 4000))
+    assert calculate_decorrelation_length(values, axis, periodic) == pytest.approx(
+        expected_output, rel=0.15
+    )
+
+
+def test_calculate_decorrelation_length_constant():
+    """Test that constant and all-NaN fields have a decorrelation length of 1."""
+    assert calculate_decorrelation_length(np.ones((4, 5)), 1, False) == 1
+    assert calculate_decorrelation_length(np.full((4, 5), np.nan), 0, True) == 1
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from fluidsf.calculate_structure_function_1d import calculate_structure_function_1d
+from fluidsf.calculate_structure_function_1d_vectorized import (
+    calculate_structure_function_1d_vectorized,
+)
+
+
+@pytest.mark.parametrize(
+    "boundary, lag_block",
+    [("Periodic", None), ("Periodic", 2), (None, None), (None, 3)],
+)
+def test_calculate_structure_function_1d_vectorized(boundary, lag_block):
+    """Test that the vectorized calculator matches the per-separation calculator."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 11))
+    u[4] = np.nan
+    sf_type = ["LL", "TT", "SS", "LLL", "LTT", "LSS"]
+    separations = np.arange(1, 5)
+
+    output_dict = calculate_structure_function_1d_vectorized(
+        u, separations, sf_type, v, scalar, boundary, lag_block
+    )
+
+    assert len(output_dict) == len(sf_type)
+    for index, separation in enumerate(separations):
+        expected_dict = calculate_structure_function_1d(
+            u, separation, sf_type, v, scalar, boundary
+        )
+        for key, value in expected_dict.items():
+            assert output_dict[key][index] == pytest.approx(value)
+
+
+def test_calculate_structure_function_1d_vectorized_lag_block():
+    """Test that an invalid lag_block raises ValueError."""
+    with pytest.raises(ValueError):
+        calculate_structure_function_1d_vectorized(
+            np.arange(5.0), np.arange(1, 3), ["LL"], lag_block=0
+        )
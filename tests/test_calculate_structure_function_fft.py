@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from fluidsf.calculate_structure_function_fft import calculate_structure_function_fft
+from fluidsf.calculate_structure_function_nd import calculate_structure_function_nd
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+@pytest.mark.parametrize(
+    "axis, periodic",
+    [(0, True), (0, False), (1, True), (1, False)],
+)
+def test_calculate_structure_function_fft(axis, periodic):
+    """Test calculate_structure_function_fft against the pair-by-pair calculator."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 8, 10)) + 3
+    u[2, 3] = np.nan
+    scalar[5, 1] = np.nan
+    fields = {"u": u, "v": v, "scalar": scalar}
+    direction = (0, 1) if axis == 0 else (1, 0)
+    terms = get_sf_terms(["LL", "TT", "SS", "LLL", "LTT", "LSS"], direction)
+    separations = np.arange(1, u.shape[axis] // 2)
+
+    output_dict = calculate_structure_function_fft(
+        fields, terms, axis, periodic, separations
+    )
+
+    for index, separation in enumerate(separations):
+        shift = [0, 0]
+        shift[axis] = separation
+        expected_dict = calculate_structure_function_nd(
+            fields, terms, tuple(shift), (periodic, periodic)
+        )
+        for key, value in expected_dict.items():
+            assert output_dict[key][index] == pytest.approx(value)
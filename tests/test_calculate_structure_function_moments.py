@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from fluidsf.calculate_structure_function_moments import (
+    calculate_structure_function_moments,
+)
+from fluidsf.calculate_structure_function_nd import calculate_structure_function_nd
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+@pytest.mark.parametrize(
+    "axis, periodic, with_nans",
+    [
+        (0, True, True),
+        (0, False, True),
+        (1, True, False),
+        (1, False, False),
+        (1, False, True),
+    ],
+)
+def test_calculate_structure_function_moments(axis, periodic, with_nans):
+    """Test calculate_structure_function_moments against the pair-by-pair calculator."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 8, 10)) + 3
+    if with_nans:
+        u[2, 3] = np.nan
+        scalar[5, 1] = np.nan
+    fields = {"u": u, "v": v, "scalar": scalar}
+    direction = (0, 1) if axis == 0 else (1, 0)
+    terms = get_sf_terms(["LL", "TT", "SS", "LLL", "LTT", "LSS"], direction)
+    separations = np.arange(1, u.shape[axis] // 2)
+
+    output_dict = calculate_structure_function_moments(
+        fields, terms, axis, periodic, separations
+    )
+
+    for index, separation in enumerate(separations):
+        shift = [0, 0]
+        shift[axis] = separation
+        expected_dict = calculate_structure_function_nd(
+            fields, terms, tuple(shift), (periodic, periodic)
+        )
+        for key, value in expected_dict.items():
+            assert output_dict[key][index] == pytest.approx(value)
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from fluidsf.calculate_structure_function_montecarlo import (
+    calculate_structure_function_montecarlo,
+)
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+@pytest.mark.parametrize(
+    "shift, periodic, expected_ll, expected_lll",
+    [
+        # Test 1: linear field gives constant increments without wrapping
+        ((0, 3), (False, False), 9.0, 27.0),
+        # Test 2: negative shifts
+        ((0, -2), (False, False), 4.0, -8.0),
+        # Test 3: shift in the other axis leaves u unchanged
+        ((4, 0), (False, False), 0.0, 0.0),
+    ],
+)
+def test_calculate_structure_function_montecarlo_exact(
+    shift, periodic, expected_ll, expected_lll
+):
+    """Test that constant increments are estimated exactly."""
+    u = np.meshgrid(np.arange(10.0), np.arange(8.0))[0]
+    terms = get_sf_terms(["LLL"], (1, 0))
+    output_dict = calculate_structure_function_montecarlo(
+        {"u": u}, terms, shift, periodic, np.random.default_rng(0)
+    )
+    assert output_dict["SF_LL"] == pytest.approx(expected_ll)
+    assert output_dict["SF_LLL"] == pytest.approx(expected_lll)
+    assert output_dict["SF_LL_stderr"] == pytest.approx(0)
+
+
+def test_calculate_structure_function_montecarlo_tolerance():
+    """Test that sampling stops once the requested tolerance is met."""
+    rng = np.random.default_rng(0)
+    u = rng.standard_normal((128, 128))
+    terms = get_sf_terms(["LL"], (1, 0))
+
+    output_dict = calculate_structure_function_montecarlo(
+        {"u": u},
+        terms,
+        (0, 5),
+        (True, True),
+        np.random.default_rng(1),
+        rtol=0.02,
+        max_samples=u.size,
+    )
+    exact = np.mean((np.roll(u, -5, axis=1) - u) ** 2)
+
+    assert output_dict["SF_LL_stderr"] <= 0.02 * output_dict["SF_LL"]
+    assert abs(output_dict["SF_LL"] - exact) < 5 * output_dict["SF_LL_stderr"]
+
+    repeat_dict = calculate_structure_function_montecarlo(
+        {"u": u},
+        terms,
+        (0, 5),
+        (True, True),
+        np.random.default_rng(1),
+        rtol=0.02,
+        max_samples=u.size,
+    )
+    assert repeat_dict == output_dict
+
+
+def test_calculate_structure_function_montecarlo_nans():
+    """Test that pairs containing NaNs are ignored."""
+    u = np.meshgrid(np.arange(10.0), np.arange(8.0))[0]
+    u[:, 5] = np.nan
+    terms = get_sf_terms(["LL"], (1, 0))
+    output_dict = calculate_structure_function_montecarlo(
+        {"u": u}, terms, (0, 1), (False, False), np.random.default_rng(0)
+    )
+    assert output_dict["SF_LL"] == pytest.approx(1.0)
+
+
+class CountingGenerator:
+    """Random number generator that counts the drawn anchor points."""
+
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+        self.n_drawn = 0
+
+    def integers(self, low, high, size):
+        """Draw random integers and count them."""
+        self.n_drawn += size
+        return self.rng.integers(low, high, size)
+
+
+def test_calculate_structure_function_montecarlo_odd_order():
+    """Test that third-order structure functions with zero mean converge."""
+    rng = np.random.default_rng(0)
+    u = rng.standard_normal((256, 256))
+    terms = get_sf_terms(["LLL"], (1, 0))
+    counting_rng = CountingGenerator(1)
+
+    output_dict = calculate_structure_function_montecarlo(
+        {"u": u}, terms, (0, 5), (True, True), counting_rng, rtol=0.03
+    )
+    increments = np.roll(u, -5, axis=1) - u
+    magnitude = np.mean(np.abs(increments**3))
+
+    # Anchor points are drawn once per axis
+    n_samples = counting_rng.n_drawn // 2
+    assert n_samples < u.size // 4
+    assert output_dict["SF_LLL_stderr"] <= 0.03 * magnitude
+    assert output_dict["SF_LL_stderr"] <= 0.03 * np.mean(increments**2)
+    assert abs(output_dict["SF_LLL"] - np.mean(increments**3)) < 5 * (
+        output_dict["SF_LLL_stderr"]
+    )
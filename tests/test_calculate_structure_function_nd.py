@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from fluidsf.calculate_structure_function_2d import calculate_structure_function_2d
+from fluidsf.calculate_structure_function_nd import calculate_structure_function_nd
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+@pytest.mark.parametrize(
+    "boundary, periodic",
+    [
+        ("periodic-all", (True, True)),
+        ("periodic-x", (False, True)),
+        ("periodic-y", (True, False)),
+        (None, (False, False)),
+    ],
+)
+def test_calculate_structure_function_nd_matches_2d(boundary, periodic):
+    """Test calculate_structure_function_nd against the 2D calculator."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 8, 10))
+    u[2, 3] = np.nan
+    fields = {"u": u, "v": v, "scalar": scalar}
+    sf_type = ["LL", "TT", "SS", "LLL", "LTT", "LSS"]
+
+    expected = calculate_structure_function_2d(
+        u, v, None, None, 3, 2, sf_type, scalar, None, boundary
+    )
+    x_dict = calculate_structure_function_nd(
+        fields,
+        {k + "_x": t for k, t in get_sf_terms(sf_type, (1, 0)).items()},
+        (0, 3),
+        periodic,
+    )
+    y_dict = calculate_structure_function_nd(
+        fields,
+        {k + "_y": t for k, t in get_sf_terms(sf_type, (0, 1)).items()},
+        (2, 0),
+        periodic,
+    )
+
+    for key, value in {**x_dict, **y_dict}.items():
+        assert value == pytest.approx(expected[key])
+
+
+def test_calculate_structure_function_nd_no_pairs():
+    """Test that separations without valid pairs return NaN."""
+    u = np.arange(5.0)
+    output_dict = calculate_structure_function_nd(
+        {"u": u}, {"SF_LL": get_sf_terms(["LL"], (1, 0))["SF_LL"]}, (5,), (False,)
+    )
+    assert np.isnan(output_dict["SF_LL"])
+
+
+def test_calculate_structure_function_nd_variance():
+    """Test that the variance matches the variance of the integrand."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 6, 9))
+    u[2, 3] = np.nan
+    terms = get_sf_terms(["LL", "LTT"], (1, 0))
+
+    output_dict = calculate_structure_function_nd(
+        {"u": u, "v": v},
+        terms,
+        (0, 2),
+        (False, False),
+        return_variance=True,
+    )
+
+    du = u[:, 2:] - u[:, :-2]
+    dv = v[:, 2:] - v[:, :-2]
+    for key, values in {"SF_LL": du**2, "SF_LTT": du * dv**2}.items():
+        values = values[~np.isnan(values)]
+        assert output_dict[key] == pytest.approx(np.mean(values))
+        assert output_dict[key + "_variance"] == pytest.approx(np.var(values, ddof=1))
+        assert output_dict[key + "_counts"] == values.size
+
+
+@pytest.mark.parametrize("periodic", [True, False])
+def test_calculate_structure_function_nd_tiles(periodic):
+    """Test that the tile sums and counts add up to the structure function."""
+    rng = np.random.default_rng(0)
+    u = rng.standard_normal((6, 8))
+    u[1, 5] = np.nan
+    tile_index = np.repeat(np.repeat(np.arange(4).reshape(2, 2), 3, 0), 4, 1)
+
+    output_dict = calculate_structure_function_nd(
+        {"u": u},
+        get_sf_terms(["LL"], (1, 0)),
+        (0, 3),
+        (periodic, periodic),
+        tile_index=tile_index,
+    )
+
+    assert output_dict["SF_LL_tile_sums"].shape == (4,)
+    assert np.sum(output_dict["SF_LL_tile_sums"]) / np.sum(
+        output_dict["SF_LL_tile_counts"]
+    ) == pytest.approx(output_dict["SF_LL"])
+    du = (np.roll(u, -3, axis=1) - u) if periodic else (u[:, 3:] - u[:, :-3])
+    assert np.sum(output_dict["SF_LL_tile_counts"]) == np.sum(~np.isnan(du))
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from fluidsf.calculate_tile_bootstrap import calculate_tile_bootstrap
+
+
+@pytest.mark.parametrize("confidence_level", [0.5, 0.9])
+def test_calculate_tile_bootstrap(confidence_level):
+    """Test that the tile bootstrap of known partial sums brackets the mean."""
+    rng = np.random.default_rng(0)
+    counts = rng.integers(10, 20, (3, 8)).astype(float)
+    sums = counts * (1 + rng.standard_normal((3, 8)))
+
+    output_dict = calculate_tile_bootstrap(
+        {"SF_LL": sums},
+        {"SF_LL": counts},
+        np.random.default_rng(1),
+        n_resamples=500,
+        confidence_level=confidence_level,
+    )
+
+    mean = sums.sum(axis=1) / counts.sum(axis=1)
+    assert output_dict["SF_LL_ci_low"].shape == (3,)
+    assert np.all(output_dict["SF_LL_ci_low"] < mean)
+    assert np.all(output_dict["SF_LL_ci_high"] > mean)
+    assert np.all(output_dict["SF_LL_stderr"] > 0)
+
+    # Averaging over all separations gives a single value
+    output_dict = calculate_tile_bootstrap(
+        {"SF_LL": sums},
+        {"SF_LL": counts},
+        np.random.default_rng(1),
+        n_resamples=500,
+        confidence_level=confidence_level,
+        averaging={"SF_LL": np.full((3, 1), 1 / 3)},
+    )
+    assert output_dict["SF_LL_ci_low"].shape == (1,)
+    assert output_dict["SF_LL_ci_low"][0] < np.mean(mean)
+
+
+def test_calculate_tile_bootstrap_errors():
+    """Test that invalid confidence levels raise errors."""
+    with pytest.raises(ValueError):
+        calculate_tile_bootstrap(
+            {"SF_LL": np.ones((2, 4))},
+            {"SF_LL": np.ones((2, 4))},
+            np.random.default_rng(0),
+            confidence_level=1.5,
+        )
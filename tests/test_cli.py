@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+from fluidsf.cli import main
+from fluidsf.generate_structure_functions_2d import generate_structure_functions_2d
+from fluidsf.sf_result import SFResult
+
+h5py = pytest.importorskip("h5py")
+
+
+def write_snapshots(path, u, v, transpose=False):
+    with h5py.File(path, "w") as file:
+        file["vars/u"] = u.T if transpose else u
+        file["vars/v"] = v.T if transpose else v
+        file["x"] = 0.5 * np.arange(u.shape[-1])
+        file["y"] = np.arange(u.shape[-2])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cli(tmp_path, capsys, workers):
+    """Test that the batch runner matches the generator for every file."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 3, 2, 8, 10))
+    for index in range(3):
+        write_snapshots(tmp_path / f"run_{index}.h5", u[index], v[index])
+    write_snapshots(tmp_path / "run_3.jld2", u[0], v[0], transpose=True)
+
+    args = [
+        str(tmp_path / "run_*.h5"),
+        str(tmp_path / "*.jld2"),
+        "--variables",
+        "vars/u",
+        "vars/v",
+        "--coords",
+        "x",
+        "y",
+        "--sf-type",
+        "LL",
+        "TT",
+        "--boundary",
+        "none",
+        "--output-dir",
+        str(tmp_path / "output"),
+        "--workers",
+        str(workers),
+    ]
+    assert main(args) == 0
+    assert "4 files (8 snapshots" in capsys.readouterr().out
+
+    expected = [
+        [
+            generate_structure_functions_2d(
+                u[index, snapshot],
+                v[index, snapshot],
+                0.5 * np.arange(10),
+                np.arange(8),
+                ["LL", "TT"],
+                boundary=None,
+            )
+            for snapshot in range(2)
+        ]
+        for index in range(3)
+    ]
+    for index in range(3):
+        result = SFResult.load(tmp_path / "output" / f"run_{index}.npz")
+        for key in ["SF_LL_x", "SF_TT_y", "x-diffs"]:
+            np.testing.assert_allclose(
+                result[key], np.mean([sf[key] for sf in expected[index]], axis=0)
+            )
+        np.testing.assert_array_equal(
+            result.get_counts("x"), [2 * 8 * (10 - np.arange(9))] * 2
+        )
+    # The transposed JLD2 file is read in the same order as the first file
+    np.testing.assert_allclose(
+        SFResult.load(tmp_path / "output" / "run_3.npz")["SF_LL_x"],
+        SFResult.load(tmp_path / "output" / "run_0.npz")["SF_LL_x"],
+    )
+
+    aggregate = SFResult.load(tmp_path / "output" / "aggregate.npz")
+    np.testing.assert_allclose(
+        aggregate["SF_LL_y"],
+        np.mean(
+            [sf["SF_LL_y"] for sfs in [*expected, expected[0]] for sf in sfs], axis=0
+        ),
+    )
+    np.testing.assert_array_equal(
+        aggregate.get_counts("y"), [8 * 10 * (8 - np.arange(7))] * 2
+    )
+
+
+def test_cli_resume(tmp_path, capsys):
+    """Test that existing results are skipped and still aggregated."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 2, 6, 6))
+    for index in range(2):
+        write_snapshots(tmp_path / f"run_{index}.h5", u[index], v[index])
+    args = ["--variables", "vars/u", "vars/v", "--output-dir", str(tmp_path / "out")]
+
+    main([str(tmp_path / "run_0.h5"), *args])
+    main([str(tmp_path / "run_*.h5"), *args, "--resume"])
+
+    output = capsys.readouterr().out
+    assert "Skipping 1 files" in output
+    assert "Processed 1 files" in output
+    aggregate = SFResult.load(tmp_path / "out" / "aggregate.npz")
+    np.testing.assert_array_equal(aggregate.get_counts("x"), 2 * 36)
+
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "missing_*.h5"), *args])
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "run_*.h5"), "--variables", "u", "v", "w", "T"])
+
+
+def test_cli_pair_counts(tmp_path):
+    """Test that files are weighted by the pairs without NaNs of each field."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 2, 2, 6, 8))
+    u[1, :, :, :4] = np.nan
+    u[1, 1, 0, 6] = np.nan
+    for index in range(2):
+        write_snapshots(tmp_path / f"run_{index}.h5", u[index], v[index])
+    args = ["--variables", "vars/u", "vars/v", "--output-dir", str(tmp_path / "out")]
+    main(
+        [
+            str(tmp_path / "run_*.h5"),
+            *args,
+            *["--sf-type", "LL", "TT", "--boundary", "none", "--nbins", "3"],
+        ]
+    )
+
+    def count_pairs(field):
+        valid = ~np.isnan(field)
+        return np.array(
+            [np.sum(valid[:, : 8 - lag] & valid[:, lag:]) for lag in range(7)]
+        )
+
+    aggregate = SFResult.load(tmp_path / "out" / "aggregate.npz")
+    assert aggregate.nbins == 3
+    for key, field in [("SF_LL_x", u), ("SF_TT_x", v)]:
+        sums = 0
+        counts = 0
+        for index, snapshot in np.ndindex(2, 2):
+            sf = generate_structure_functions_2d(
+                u[index, snapshot],
+                v[index, snapshot],
+                np.arange(8),
+                np.arange(6),
+                ["LL", "TT"],
+                boundary=None,
+            )
+            snapshot_counts = count_pairs(field[index, snapshot])
+            sums = sums + np.where(snapshot_counts > 0, sf[key] * snapshot_counts, 0)
+            counts = counts + snapshot_counts
+        np.testing.assert_allclose(aggregate.binned(None)[key], sums / counts)
+        row = aggregate.keys_by_direction["x"].index(key)
+        np.testing.assert_array_equal(
+            aggregate.binned(None).get_counts("x")[row], counts
+        )
+        np.testing.assert_array_equal(
+            aggregate.get_counts("x")[row],
+            [counts[:3].sum(), counts[3:5].sum(), counts[5:].sum()],
+        )
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from fluidsf.coarsen_array import coarsen_array
+
+
+@pytest.mark.parametrize(
+    "input_array, factor, method, expected_output",
+    [
+        # Test 1: block average in 2D
+        (
+            np.arange(16.0).reshape(4, 4),
+            2,
+            "mean",
+            np.array([[2.5, 4.5], [10.5, 12.5]]),
+        ),
+        # Test 2: decimation in 2D
+        (np.arange(16.0).reshape(4, 4), 2, "decimate", np.array([[0, 2], [8, 10]])),
+        # Test 3: incomplete blocks are dropped
+        (np.arange(7.0), 3, "mean", np.array([1.0, 4.0])),
+        # Test 4: factor 1 returns the input
+        (np.arange(3.0), 1, "mean", np.arange(3.0)),
+        # Test 5: unknown method raises ValueError
+        (np.arange(4.0), 2, "median", ValueError),
+        # Test 6: non-integer factor raises ValueError
+        (np.arange(4.0), 1.5, "mean", ValueError),
+    ],
+)
+def test_coarsen_array(input_array, factor, method, expected_output):
+    """Test that coarsen_array works correctly for multiple cases."""
+    if expected_output is ValueError:
+        with pytest.raises(ValueError):
+            coarsen_array(input_array, factor, method)
+    else:
+        np.testing.assert_array_equal(
+            coarsen_array(input_array, factor, method), expected_output
+        )
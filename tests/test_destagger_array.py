@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from fluidsf.destagger_array import destagger_array
+
+
+@pytest.mark.parametrize(
+    "n_faces, first_face",
+    [
+        # Both faces of every cell
+        (9, -0.5),
+        # Lower face of every cell, e.g. MITgcm
+        (8, -0.5),
+        # Faces between cells, e.g. ROMS
+        (7, 0.5),
+    ],
+)
+@pytest.mark.parametrize("axis", [0, 1])
+def test_destagger_array(n_faces, first_face, axis):
+    """Test that linear fields are averaged and differenced exactly."""
+    faces = 2.0 * (first_face + np.arange(n_faces)) + 1.0
+    other = np.arange(3.0)
+    input_array = faces[:, None] + other if axis == 0 else other[:, None] + faces
+
+    centers, differences = destagger_array(input_array, axis, 8)
+
+    expected = 2.0 * np.arange(8) + 1.0
+    expected = expected[:, None] + other if axis == 0 else other[:, None] + expected
+    np.testing.assert_allclose(centers, expected)
+    np.testing.assert_allclose(differences, np.full(expected.shape, 2.0))
+
+
+def test_destagger_array_periodic():
+    """Test that the missing face wraps around periodic axes."""
+    faces = np.array([1.0, 2.0, 4.0, 8.0])
+    centers, differences = destagger_array(faces, 0, 4, periodic=True)
+    np.testing.assert_allclose(centers, [1.5, 3.0, 6.0, 4.5])
+    np.testing.assert_allclose(differences, [1.0, 2.0, 4.0, -7.0])
+
+    with pytest.raises(ValueError):
+        destagger_array(faces, 0, 6)
@@ -0,0 +1,30 @@
+import numpy as np
+from fluidsf.evaluate_sf_terms import evaluate_sf_terms
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+def test_evaluate_sf_terms():
+    """Test that evaluate_sf_terms reproduces the structure function integrands."""
+    du = np.array([1.0, -2.0, 3.0])
+    dv = np.array([0.5, 1.0, -1.0])
+    ds = np.array([2.0, 0.0, 1.0])
+    increments = {"u": du, "v": dv, "scalar": ds}
+
+    x_terms = get_sf_terms(["LL", "LTT", "LSS"], (1, 0))
+    y_terms = get_sf_terms(["LTT"], (0, 1))
+
+    np.testing.assert_allclose(evaluate_sf_terms(x_terms["SF_LL"], increments), du**2)
+    np.testing.assert_allclose(
+        evaluate_sf_terms(x_terms["SF_LTT"], increments), du * dv**2
+    )
+    np.testing.assert_allclose(
+        evaluate_sf_terms(x_terms["SF_LSS"], increments), du * ds**2
+    )
+    np.testing.assert_allclose(
+        evaluate_sf_terms(y_terms["SF_LTT"], increments), dv * du**2
+    )
+
+    diagonal = get_sf_terms(["LL"], (1, 1))["SF_LL"]
+    np.testing.assert_allclose(
+        evaluate_sf_terms(diagonal, increments), (du + dv) ** 2 / 2
+    )
@@ -0,0 +1,44 @@
+import pytest
+from fluidsf.expand_sf_terms import expand_sf_terms
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+@pytest.mark.parametrize(
+    "sf_type, key, expected_output",
+    [
+        # Test 1: (u' - u)^2 = u'u' - 2 u u' + u u
+        (
+            ["LL"],
+            "SF_LL",
+            {((), ("u", "u")): 1.0, (("u",), ("u",)): -2.0, (("u", "u"), ()): 1.0},
+        ),
+        # Test 2: (u' - u)^3
+        (
+            ["LLL"],
+            "SF_LLL",
+            {
+                ((), ("u", "u", "u")): 1.0,
+                (("u",), ("u", "u")): -3.0,
+                (("u", "u"), ("u",)): 3.0,
+                (("u", "u", "u"), ()): -1.0,
+            },
+        ),
+        # Test 3: (a' - a)(s' - s)
+        (
+            ["ASF_S"],
+            "SF_advection_scalar",
+            {
+                ((), ("adv_scalar", "scalar")): 1.0,
+                (("scalar",), ("adv_scalar",)): -1.0,
+                (("adv_scalar",), ("scalar",)): -1.0,
+                (("adv_scalar", "scalar"), ()): 1.0,
+            },
+        ),
+    ],
+)
+def test_expand_sf_terms(sf_type, key, expected_output):
+    """Test that expand_sf_terms expands increments into anchor/partner products."""
+    output = expand_sf_terms(get_sf_terms(sf_type, (1, 0))[key])
+    assert output.keys() == expected_output.keys()
+    for monomials, coeff in expected_output.items():
+        assert output[monomials] == pytest.approx(coeff)
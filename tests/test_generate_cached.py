@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pytest
+from fluidsf.generate_cached import generate_cached
+from fluidsf.generate_sf_maps_2d import generate_sf_maps_2d
+from fluidsf.generate_structure_functions_1d import generate_structure_functions_1d
+from fluidsf.generate_structure_functions_1d_batch import (
+    generate_structure_functions_1d_batch,
+)
+from fluidsf.generate_structure_functions_2d import generate_structure_functions_2d
+from fluidsf.generate_structure_functions_3d import generate_structure_functions_3d
+
+rng = np.random.default_rng(0)
+u, v, w = rng.standard_normal((3, 6, 8, 8))
+
+
+@pytest.mark.parametrize(
+    "generator, args, kwargs",
+    [
+        (generate_structure_functions_1d, (u[0, 0], np.arange(8)), {"sf_type": ["LL"]}),
+        (
+            generate_structure_functions_2d,
+            (u[0], v[0], np.arange(8), np.arange(8)),
+            {"sf_type": ["LL", "TT"], "nbins": 3},
+        ),
+        (
+            generate_structure_functions_3d,
+            (u, v, w, np.arange(8), np.arange(8), np.arange(6)),
+            {"sf_type": ["LL"], "boundary": None},
+        ),
+        (
+            generate_sf_maps_2d,
+            (u[0], v[0], np.arange(8), np.arange(8)),
+            {"sf_type": ["LL"]},
+        ),
+    ],
+)
+def test_generate_cached(tmp_path, generator, args, kwargs):
+    """Test that cached outputs match the generator and are reused."""
+    expected_dict = generator(*args, **kwargs)
+
+    output_dict = generate_cached(generator, *args, cache_dir=tmp_path, **kwargs)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    cached_dict = generate_cached(generator, *args, cache_dir=tmp_path, **kwargs)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    assert set(cached_dict) == set(expected_dict)
+    for key, value in expected_dict.items():
+        np.testing.assert_array_equal(output_dict[key], value)
+        np.testing.assert_array_equal(cached_dict[key], value)
+
+    # Different data or parameters are cached separately
+    generate_cached(
+        generator, *(np.asarray(args[0]) + 1, *args[1:]), cache_dir=tmp_path, **kwargs
+    )
+    generate_cached(generator, *args, cache_dir=tmp_path, **kwargs, max_separation=3)
+    assert len(list(tmp_path.glob("*.npz"))) == 3
+
+
+def test_generate_cached_pair_counts(tmp_path):
+    """Test that a cache hit returns the pair counts of pooled batch outputs."""
+    tracks = [u[0, 0], u[0, 1, :5], u[0, 2, :7]]
+    coords = [np.arange(len(track), dtype=float) for track in tracks]
+    kwargs = {"sf_type": ["LL"], "pool": True}
+
+    output_dict = generate_cached(
+        generate_structure_functions_1d_batch,
+        tracks,
+        coords,
+        cache_dir=tmp_path,
+        **kwargs,
+    )
+    cached_dict = generate_cached(
+        generate_structure_functions_1d_batch,
+        tracks,
+        coords,
+        cache_dir=tmp_path,
+        **kwargs,
+    )
+
+    assert "pair-counts" in output_dict
+    assert set(cached_dict) == set(output_dict)
+    for key, value in output_dict.items():
+        np.testing.assert_array_equal(cached_dict[key], value)
+        assert cached_dict[key].dtype == np.asarray(value).dtype
+
+
+def test_generate_cached_eviction(tmp_path, monkeypatch):
+    """Test that the least recently used outputs are evicted."""
+    x = np.arange(8)
+    paths = []
+    for shift in range(3):
+        generate_cached(
+            generate_structure_functions_1d, u[0, 0] + shift, x, cache_dir=tmp_path
+        )
+        paths.append((set(tmp_path.glob("*.npz")) - set(paths)).pop())
+    size = paths[0].stat().st_size
+
+    # Make the second output the least recently used
+    for path, mtime in zip(paths, [1, 0, 2], strict=True):
+        os.utime(path, (mtime, mtime))
+    generate_cached(
+        generate_structure_functions_1d,
+        u[0, 0] + 3,
+        x,
+        cache_dir=tmp_path,
+        max_size=3 * size,
+    )
+    remaining = set(tmp_path.glob("*.npz"))
+    assert len(remaining) == 3
+    assert paths[1] not in remaining
+    assert paths[0] in remaining
+
+    # The cache directory can be set with an environment variable
+    monkeypatch.setenv("FLUIDSF_CACHE_DIR", str(tmp_path / "env"))
+    generate_cached(generate_structure_functions_1d, u[0, 0], x)
+    assert len(list((tmp_path / "env").glob("*.npz"))) == 1
+
+
+def test_generate_cached_random(tmp_path):
+    """Test that random estimators are only cached with a seed."""
+    args = (u[0], v[0], np.arange(8), np.arange(8))
+    generate_cached(
+        generate_structure_functions_2d,
+        *args,
+        sf_type=["LL"],
+        estimator="montecarlo",
+        cache_dir=tmp_path,
+    )
+    assert len(list(tmp_path.glob("*.npz"))) == 0
+    generate_cached(
+        generate_structure_functions_2d,
+        *args,
+        sf_type=["LL"],
+        estimator="montecarlo",
+        seed=0,
+        cache_dir=tmp_path,
+    )
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    with pytest.raises(ValueError):
+        generate_cached(
+            generate_structure_functions_1d, u[0, 0], np.arange(8), max_size=-1
+        )
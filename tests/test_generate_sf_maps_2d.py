@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+from fluidsf.generate_sf_maps_2d import generate_sf_maps_2d
+from fluidsf.sf_checkpoint import SFCheckpoint
+
+
+@pytest.mark.parametrize(
+    "separations, max_separation, workers",
+    [
+        # Test 1: every separation vector
+        (None, None, None),
+        # Test 2: separation vectors within a maximum separation
+        (None, 4.0, 2),
+        # Test 3: subset of separations
+        (np.array([1, 3]), None, 1),
+    ],
+)
+def test_generate_sf_maps_2d_blocked(separations, max_separation, workers):
+    """Test that the blocked engine gives identical results to the direct engine."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 12, 16))
+    u[3:6, 4:9] = np.nan
+    v[3:6, 4:9] = np.nan
+    x = 0.5 * np.arange(16)
+    y = np.arange(12)
+    sf_type = ["ASF_V", "ASF_S", "LL", "TT", "SS", "LLL", "LTT", "LSS"]
+
+    with np.errstate(invalid="ignore"):
+        expected_dict = generate_sf_maps_2d(
+            u,
+            v,
+            x,
+            y,
+            sf_type,
+            scalar,
+            separations=separations,
+            max_separation=max_separation,
+        )
+        output_dict = generate_sf_maps_2d(
+            u,
+            v,
+            x,
+            y,
+            sf_type,
+            scalar,
+            separations=separations,
+            max_separation=max_separation,
+            engine="blocked",
+            workers=workers,
+        )
+
+    assert output_dict.keys() == expected_dict.keys()
+    for key, value in expected_dict.items():
+        np.testing.assert_array_equal(output_dict[key], value)
+
+    with pytest.raises(ValueError):
+        generate_sf_maps_2d(u, v, x, y, sf_type, scalar, engine="fft")
+
+
+@pytest.mark.parametrize(
+    "engine, max_separation", [("direct", None), ("direct", 3), ("blocked", None)]
+)
+def test_generate_sf_maps_2d_checkpoint(tmp_path, monkeypatch, engine, max_separation):
+    """Test that an interrupted map calculation resumes from its checkpoint."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 8, 10))
+    x = np.arange(10)
+    y = np.arange(8)
+    kwargs = {
+        "sf_type": ["LL", "TT"],
+        "engine": engine,
+        "max_separation": max_separation,
+    }
+    expected_dict = generate_sf_maps_2d(u, v, x, y, **kwargs)
+
+    calls = []
+    interrupt = [True]
+    original_update = SFCheckpoint.update
+
+    def interrupted_update(self):
+        calls.append(1)
+        if interrupt[0] and len(calls) == 3:
+            raise RuntimeError("Preempted")
+        original_update(self)
+
+    monkeypatch.setattr(SFCheckpoint, "update", interrupted_update)
+    checkpoint = tmp_path / "checkpoint.npz"
+    with pytest.raises(RuntimeError):
+        generate_sf_maps_2d(
+            u, v, x, y, checkpoint=checkpoint, checkpoint_interval=0, **kwargs
+        )
+    assert checkpoint.exists()
+
+    calls.clear()
+    interrupt[0] = False
+    output_dict = generate_sf_maps_2d(
+        u, v, x, y, checkpoint=checkpoint, checkpoint_interval=0, **kwargs
+    )
+    # One update per row of separation vectors, or per vector within max_separation
+    n_updates = np.sum(
+        expected_dict["separation_distances"] <= (max_separation or np.inf)
+    )
+    if engine == "blocked":
+        n_updates = len(expected_dict["separation_distances"])
+    assert len(calls) == n_updates - 2
+    assert not checkpoint.exists()
+    for key, value in expected_dict.items():
+        np.testing.assert_array_equal(output_dict[key], value)
+
+
+@pytest.mark.parametrize("engine", ["direct", "blocked"])
+def test_generate_sf_maps_2d_axes(engine):
+    """Test that arrays ordered (x, y) give the same maps."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 6, 8))
+    x = np.arange(8.0)
+    y = np.arange(6.0)
+
+    sf = generate_sf_maps_2d(u, v, x, y, ["ASF_V", "LL"], engine=engine)
+    sf_transposed = generate_sf_maps_2d(
+        u.T, v.T, x, y, ["ASF_V", "LL"], engine=engine, axes=(0, 1)
+    )
+    for key in sf:
+        np.testing.assert_allclose(sf_transposed[key], sf[key])
+
+
+def test_generate_sf_maps_2d_log_separations_symmetric():
+    """Test that log-spaced maps use the same negative and positive lags."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 64, 64))
+    x = np.arange(64.0)
+
+    output_dict = generate_sf_maps_2d(u, v, x, x, ["LL"], separations=("log", 6))
+    y_lags = np.round(output_dict["y_separations"][0]).astype(int)
+    negative = -y_lags[y_lags < 0][::-1]
+    positive = y_lags[y_lags > 0]
+    np.testing.assert_array_equal(negative[negative < 32], positive)
+    assert negative[-1] == 32
@@ -0,0 +1,119 @@
+import itertools
+
+import numpy as np
+import pytest
+from fluidsf.calculate_advection_3d import calculate_advection_3d
+from fluidsf.calculate_structure_function_nd import calculate_structure_function_nd
+from fluidsf.generate_sf_maps_3d import generate_sf_maps_3d
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+@pytest.mark.parametrize("land", [False, True])
+def test_generate_sf_maps_3d(land):
+    """Test that the 3D maps match the direct calculation for every separation."""
+    rng = np.random.default_rng(0)
+    u, v, w, scalar = rng.standard_normal((4, 4, 5, 6))
+    if land:
+        for field in [u, v, w, scalar]:
+            field[1, 2, 3] = np.nan
+    x = 0.5 * np.arange(6)
+    y = np.arange(5)
+    z = 2 * np.arange(4)
+    sf_type = ["ASF_V", "ASF_S", "LL", "TT", "SS", "LLL", "LTT", "LSS"]
+
+    output_dict = generate_sf_maps_3d(u, v, w, x, y, z, sf_type, scalar)
+
+    adv_x, adv_y, adv_z = calculate_advection_3d(u, v, w, x, y, z)
+    fields = {
+        "u": u,
+        "v": v,
+        "w": w,
+        "scalar": scalar,
+        "adv_x": adv_x,
+        "adv_y": adv_y,
+        "adv_z": adv_z,
+        "adv_scalar": calculate_advection_3d(u, v, w, x, y, z, scalar),
+    }
+    assert output_dict["SF_LL_xyz"].shape == (3, 4, 4)
+    for index in np.ndindex(output_dict["SF_LL_xyz"].shape):
+        separation = tuple(
+            output_dict[axis + "_separations"][index] for axis in ["x", "y", "z"]
+        )
+        if not any(separation):
+            for key in get_sf_terms(sf_type, (1, 0, 0)):
+                assert output_dict[key + "_xyz"][index] == 0
+            continue
+        shift = (int(separation[2] / 2), int(separation[1]), int(separation[0] / 0.5))
+        expected = calculate_structure_function_nd(
+            fields, get_sf_terms(sf_type, separation), shift, (True, True, True)
+        )
+        for key, value in expected.items():
+            np.testing.assert_allclose(
+                output_dict[key + "_xyz"][index], value, atol=1e-12
+            )
+
+
+def test_generate_sf_maps_3d_cylindrical_bins():
+    """Test that cylindrical bins average over the nonzero separations in a bin."""
+    rng = np.random.default_rng(1)
+    u, v, w = rng.standard_normal((3, 4, 4, 4))
+    x = np.arange(4)
+    sf_type = ["LL", "LTT"]
+
+    output_dict = generate_sf_maps_3d(
+        u, v, w, x, x, x, sf_type, cylindrical_bins=(2, 2)
+    )
+    assert output_dict["SF_LL_hz"].shape == (2, 2)
+    assert output_dict["bin_counts"].sum() == 4**3 - 1
+
+    # Average the direct calculation over the separation vectors in each bin,
+    # which run from -2 to 1 along each axis
+    fields = {"u": u, "v": v, "w": w}
+    sums = {key: np.zeros((2, 2)) for key in get_sf_terms(sf_type, (1, 0, 0))}
+    counts = np.zeros((2, 2))
+    for shift in itertools.product(range(-2, 2), repeat=3):
+        horizontal_bin = int(np.hypot(shift[1], shift[2]) >= np.sqrt(8) / 2)
+        vertical_bin = int(abs(shift[0]) >= 1)
+        if not any(shift):
+            continue
+        counts[horizontal_bin, vertical_bin] += 1
+        expected = calculate_structure_function_nd(
+            fields, get_sf_terms(sf_type, shift[::-1]), shift, (True, True, True)
+        )
+        for key, value in expected.items():
+            sums[key][horizontal_bin, vertical_bin] += value
+
+    np.testing.assert_array_equal(output_dict["bin_counts"], counts)
+    for key, value in sums.items():
+        np.testing.assert_allclose(output_dict[key + "_hz"], value / counts)
+
+
+def test_generate_sf_maps_3d_max_separation():
+    """Test that the maps are trimmed and masked at the maximum separation."""
+    rng = np.random.default_rng(2)
+    u, v, w = rng.standard_normal((3, 6, 6, 6))
+    x = np.arange(6)
+
+    output_dict = generate_sf_maps_3d(u, v, w, x, x, x, ["LL"], max_separation=1.5)
+    assert output_dict["SF_LL_xyz"].shape == (2, 3, 3)
+    np.testing.assert_array_equal(
+        np.isnan(output_dict["SF_LL_xyz"]),
+        output_dict["separation_distances"] > 1.5,
+    )
+
+
+def test_generate_sf_maps_3d_axes():
+    """Test that arrays ordered (x, y, z) give the same maps."""
+    rng = np.random.default_rng(0)
+    u, v, w, scalar = rng.standard_normal((4, 4, 5, 6))
+    x = np.arange(6.0)
+    y = np.arange(5.0)
+    z = np.arange(4.0)
+    sf_type = ["ASF_V", "LL", "LSS"]
+
+    output_dict = generate_sf_maps_3d(u, v, w, x, y, z, sf_type, scalar)
+    transposed_dict = generate_sf_maps_3d(
+        u.T, v.T, w.T, x, y, z, sf_type, scalar.T, axes=(0, 1, 2)
+    )
+    for key in output_dict:
+        np.testing.assert_allclose(transposed_dict[key], output_dict[key])
@@ -215,3 +215,70 @@ def test_generate_structure_functions_1d_parameterized(
                     )
             else:
                 raise AssertionError(f"Output dict does not contain key '{key}'.")
+
+
+def test_generate_structure_functions_1d_log_separations():
+    """Test that log-spaced separations match the full calculation."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 64))
+    x = np.arange(64)
+
+    full = generate_structure_functions_1d(u, x, ["LL", "LTT"], v)
+    subset = generate_structure_functions_1d(
+        u, x, ["LL", "LTT"], v, separations=("log", 6)
+    )
+
+    lags = np.array([0, 1, 2, 4, 8, 16, 31])
+    np.testing.assert_allclose(subset["x-diffs"], lags)
+    np.testing.assert_allclose(subset["SF_LL"], full["SF_LL"][lags])
+    np.testing.assert_allclose(subset["SF_LTT"], full["SF_LTT"][lags])
+
+
+def test_generate_structure_functions_1d_max_separation_latlon():
+    """Test that max_separation is applied in meters for latlon grids."""
+    u = np.arange(10.0) ** 2
+    lat = np.arange(10.0)
+    lon = np.zeros(10)
+
+    output_dict = generate_structure_functions_1d(
+        u, lat, ["LL"], y=lon, boundary=None, grid_type="latlon", max_separation=3e5
+    )
+
+    np.testing.assert_allclose(
+        output_dict["x-diffs"], [0.0, 111195.08372419, 222390.16744838]
+    )
+    np.testing.assert_allclose(
+        output_dict["SF_LL"][1:],
+        [np.mean(np.diff(u) ** 2), np.mean((u[2:] - u[:-2]) ** 2)],
+    )
+
+
+@pytest.mark.parametrize(
+    "engine, boundary, nbins",
+    [
+        ("vectorized", "Periodic", None),
+        ("vectorized", None, 5),
+        ("fft", "Periodic", 5),
+        ("fft", None, None),
+        ("moments", "Periodic", None),
+        ("moments", None, 5),
+    ],
+)
+def test_generate_structure_functions_1d_engines(engine, boundary, nbins):
+    """Test that the other engines match the direct engine."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 40)) + 2
+    u[7] = np.nan
+    x = np.cumsum(rng.random(40))
+    sf_type = ["LL", "TT", "SS", "LLL", "LTT", "LSS"]
+
+    expected_dict = generate_structure_functions_1d(
+        u, x, sf_type, v, scalar=scalar, boundary=boundary, nbins=nbins
+    )
+    output_dict = generate_structure_functions_1d(
+        u, x, sf_type, v, scalar=scalar, boundary=boundary, nbins=nbins, engine=engine
+    )
+
+    assert output_dict.keys() == expected_dict.keys()
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value)
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from fluidsf.generate_structure_functions_1d import generate_structure_functions_1d
+from fluidsf.generate_structure_functions_1d_batch import (
+    generate_structure_functions_1d_batch,
+)
+
+SF_TYPES = ["LL", "TT", "SS", "LLL", "LTT", "LSS"]
+
+
+def make_tracks(lengths):
+    rng = np.random.default_rng(0)
+    tracks = {
+        key: [rng.standard_normal(n) + 2 for n in lengths]
+        for key in ["u", "v", "scalar"]
+    }
+    tracks["x"] = [np.cumsum(rng.random(n)) for n in lengths]
+    tracks["u"][1][3] = np.nan
+    return tracks
+
+
+@pytest.mark.parametrize("boundary", [None, "Periodic"])
+def test_generate_structure_functions_1d_batch_tracks(boundary):
+    """Test that the structure functions of each track match the 1D generator."""
+    lengths = [6, 13, 9, 20, 4]
+    tracks = make_tracks(lengths)
+
+    output_dict = generate_structure_functions_1d_batch(
+        tracks["u"],
+        tracks["x"],
+        sf_type=SF_TYPES,
+        v=tracks["v"],
+        scalar=tracks["scalar"],
+        boundary=boundary,
+    )
+
+    for index in range(len(lengths)):
+        expected_dict = generate_structure_functions_1d(
+            tracks["u"][index],
+            tracks["x"][index],
+            SF_TYPES,
+            tracks["v"][index],
+            scalar=tracks["scalar"][index],
+            boundary=boundary,
+        )
+        n_lags = len(expected_dict["x-diffs"])
+        for key, value in expected_dict.items():
+            np.testing.assert_allclose(output_dict[key][index, :n_lags], value)
+            assert np.all(np.isnan(output_dict[key][index, n_lags:]))
+
+
+@pytest.mark.parametrize("boundary", [None, "Periodic"])
+def test_generate_structure_functions_1d_batch_latlon(boundary):
+    """Test that latlon separation distances match the 1D generator."""
+    lengths = [6, 13, 9]
+    tracks = make_tracks(lengths)
+    rng = np.random.default_rng(1)
+    lats = [30 + 0.05 * np.cumsum(rng.random(n)) for n in lengths]
+    lons = [-120 + 0.05 * np.cumsum(rng.random(n)) for n in lengths]
+
+    output_dict = generate_structure_functions_1d_batch(
+        tracks["u"],
+        lats,
+        sf_type=["LL"],
+        y=lons,
+        boundary=boundary,
+        grid_type="latlon",
+    )
+
+    for index in range(len(lengths)):
+        expected_dict = generate_structure_functions_1d(
+            tracks["u"][index],
+            lats[index],
+            ["LL"],
+            y=lons[index],
+            boundary=boundary,
+            grid_type="latlon",
+        )
+        n_lags = len(expected_dict["x-diffs"])
+        for key, value in expected_dict.items():
+            np.testing.assert_allclose(output_dict[key][index, :n_lags], value)
+
+
+def test_generate_structure_functions_1d_batch_offsets_and_pooling():
+    """Test CSR offsets input and pooling of tracks by lag and by distance bin."""
+    lengths = [6, 13, 9]
+    tracks = make_tracks(lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    per_track = generate_structure_functions_1d_batch(
+        tracks["u"], tracks["x"], sf_type=["LL"]
+    )
+    pooled = generate_structure_functions_1d_batch(
+        np.concatenate(tracks["u"]),
+        np.concatenate(tracks["x"]),
+        offsets,
+        sf_type=["LL"],
+        pool=True,
+    )
+
+    # Pooling by lag weights each track by its number of pairs without NaNs
+    lag = 3
+    pair_sums = 0
+    pair_counts = 0
+    for u in tracks["u"]:
+        increments = u[lag:] - u[:-lag]
+        pair_sums += np.nansum(increments**2)
+        pair_counts += np.sum(~np.isnan(increments))
+    assert pooled["SF_LL"][lag] == pytest.approx(pair_sums / pair_counts)
+    assert pooled["pair-counts"][lag] == np.sum(per_track["pair-counts"][:, lag])
+    assert pooled["SF_LL"][0] == 0
+
+    binned = generate_structure_functions_1d_batch(
+        tracks["u"], tracks["x"], sf_type=["LL"], pool=True, bins=3
+    )
+    assert len(binned["SF_LL"]) == len(binned["x-diffs"]) <= 3
+    assert np.sum(binned["pair-counts"]) == np.sum(pooled["pair-counts"])
+
+
+@pytest.mark.parametrize(
+    "u, offsets, boundary",
+    [
+        # Test 1: missing offsets for concatenated input
+        (np.zeros(10), None, None),
+        # Test 2: offsets that do not cover the data
+        (np.zeros(10), [0, 4, 8], None),
+        # Test 3: unknown boundary
+        ([np.zeros(5)], None, "periodic-all"),
+    ],
+)
+def test_generate_structure_functions_1d_batch_errors(u, offsets, boundary):
+    """Test that invalid input raises ValueError."""
+    with pytest.raises(ValueError):
+        generate_structure_functions_1d_batch(
+            u, u, offsets, sf_type=["LL"], boundary=boundary
+        )
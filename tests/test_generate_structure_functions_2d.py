@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+from fluidsf.bin_data import bin_data
 from fluidsf.generate_structure_functions_2d import generate_structure_functions_2d
 from geopy.distance import great_circle
 
@@ -542,3 +543,310 @@ def test_generate_structure_functions_parameterized(
                     )
             else:
                 raise AssertionError(f"Output dict does not contain key '{key}'.")
+
+
+def test_generate_structure_functions_2d_separations():
+    """Test that a subset of separations matches the full calculation."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 16, 20))
+    x = np.arange(20)
+    y = np.arange(16)
+    sf_type = ["ASF_V", "LLL", "LL", "LTT", "SS"]
+
+    full = generate_structure_functions_2d(u, v, x, y, sf_type, scalar)
+    subset = generate_structure_functions_2d(
+        u, v, x, y, sf_type, scalar, separations=np.array([1, 3, 9])
+    )
+
+    np.testing.assert_allclose(subset["x-diffs"], [0, 1, 3, 9])
+    np.testing.assert_allclose(subset["y-diffs"], [0, 1, 3])
+    for key in full:
+        lags = [0, 1, 3, 9] if key.startswith("x") or key.endswith("x") else [0, 1, 3]
+        np.testing.assert_allclose(subset[key], full[key][lags])
+
+
+def test_generate_structure_functions_2d_max_separation():
+    """Test that separations beyond max_separation are skipped."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 16, 20))
+    x = 0.5 * np.arange(20)
+    y = 2.0 * np.arange(16)
+
+    full = generate_structure_functions_2d(u, v, x, y, ["LL"])
+    cut = generate_structure_functions_2d(u, v, x, y, ["LL"], max_separation=4)
+
+    np.testing.assert_allclose(cut["x-diffs"], 0.5 * np.arange(9))
+    np.testing.assert_allclose(cut["y-diffs"], [0, 2, 4])
+    np.testing.assert_allclose(cut["SF_LL_x"], full["SF_LL_x"][:9])
+    np.testing.assert_allclose(cut["SF_LL_y"], full["SF_LL_y"][:3])
+
+
+def test_generate_structure_functions_2d_montecarlo():
+    """Test the Monte Carlo estimator against the direct calculation."""
+    u = np.meshgrid(np.arange(10), np.arange(10))[0]
+    v = 0.5 * u
+    x = np.arange(10)
+    y = np.arange(10)
+    sf_type = ["ASF_V", "LLL", "LL", "LTT"]
+
+    direct = generate_structure_functions_2d(u, v, x, y, sf_type, boundary=None)
+    estimate = generate_structure_functions_2d(
+        u, v, x, y, sf_type, boundary=None, estimator="montecarlo", seed=0
+    )
+
+    for key, value in direct.items():
+        np.testing.assert_allclose(estimate[key], value, atol=1e-12)
+    np.testing.assert_allclose(estimate["SF_LL_x_stderr"], 0, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        generate_structure_functions_2d(u, v, x, y, sf_type, estimator="exact")
+
+
+def test_generate_structure_functions_2d_multiresolution():
+    """Test the multi-resolution estimator on linear fields."""
+    u = np.meshgrid(np.arange(32), np.arange(32))[0].astype(float)
+    v = 0.5 * u
+    x = np.arange(32)
+    y = np.arange(32)
+
+    output_dict = generate_structure_functions_2d(
+        u,
+        v,
+        x,
+        y,
+        ["LL", "LTT"],
+        boundary=None,
+        estimator="multiresolution",
+        native_lags=4,
+        coarsen="decimate",
+    )
+
+    lags = np.array([0, 1, 2, 3, 4, 6, 8, 12, 16])
+    np.testing.assert_allclose(output_dict["x-diffs"], lags)
+    np.testing.assert_allclose(output_dict["x-coarsening"], [1, 1, 1, 1, 1, 2, 2, 4, 4])
+    np.testing.assert_allclose(output_dict["SF_LL_x"], lags**2)
+    np.testing.assert_allclose(output_dict["SF_LTT_x"], 0.25 * lags**3)
+    np.testing.assert_allclose(output_dict["SF_LL_y"], 0)
+    np.testing.assert_allclose(output_dict["SF_LL_x_bias"], 0, atol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "boundary, engine",
+    [
+        ("periodic-all", "fft"),
+        ("periodic-x", "fft"),
+        ("periodic-y", "fft"),
+        (None, "fft"),
+        ("periodic-x", "moments"),
+        (None, "moments"),
+    ],
+)
+def test_generate_structure_functions_2d_engines(boundary, engine):
+    """Test that the FFT and moments engines match the direct engine with land."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 12, 16)) + 1
+    land = np.zeros((12, 16), dtype=bool)
+    land[3:6, 4:9] = True
+    land[:4, 0] = True
+    u[land] = np.nan
+    v[land] = np.nan
+    scalar[land] = np.nan
+    x = 0.5 * np.arange(16)
+    y = np.arange(12)
+    sf_type = ["ASF_V", "ASF_S", "LL", "TT", "SS", "LLL", "LTT", "LSS"]
+
+    expected_dict = generate_structure_functions_2d(
+        u, v, x, y, sf_type, scalar, boundary=boundary
+    )
+    output_dict = generate_structure_functions_2d(
+        u, v, x, y, sf_type, scalar, boundary=boundary, engine=engine
+    )
+
+    assert output_dict.keys() == expected_dict.keys()
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value, atol=1e-12)
+
+
+def test_generate_structure_functions_2d_directions():
+    """Test structure functions along lattice directions."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 12, 16))
+    x = np.arange(16)
+    y = np.arange(12)
+
+    expected_dict = generate_structure_functions_2d(u, v, x, y, ["LL", "LTT"])
+    output_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL", "LTT"], directions=[(1, 0), (0, 1)]
+    )
+    for key in ["SF_LL", "SF_LTT"]:
+        np.testing.assert_allclose(output_dict[key + "_1_0"], expected_dict[key + "_x"])
+        np.testing.assert_allclose(output_dict[key + "_0_1"], expected_dict[key + "_y"])
+    np.testing.assert_allclose(output_dict["1_0-diffs"], expected_dict["x-diffs"])
+    np.testing.assert_allclose(output_dict["0_1-diffs"], expected_dict["y-diffs"])
+
+    # Linear fields have known structure functions along the diagonal
+    u = np.meshgrid(x, y)[0].astype(float)
+    v = 0.5 * np.meshgrid(x, y)[1]
+    output_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL", "TT"], boundary=None, directions=[(1, 1)]
+    )
+    lags = np.arange(11)
+    np.testing.assert_allclose(output_dict["1_1-diffs"], np.sqrt(2) * lags)
+    np.testing.assert_allclose(output_dict["SF_LL_1_1"], 1.125 * lags**2)
+    np.testing.assert_allclose(output_dict["SF_TT_1_1"], 0.125 * lags**2)
+
+    with pytest.raises(ValueError):
+        generate_structure_functions_2d(
+            u, v, x, y, ["LL"], estimator="montecarlo", directions=[(1, 1)]
+        )
+    with pytest.raises(ValueError):
+        generate_structure_functions_2d(u, v, x, y, ["LL"], directions=[(1, 1, 1)])
+
+
+def test_generate_structure_functions_2d_uncertainty():
+    """Test that the uncertainty option adds variances and effective sample sizes."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 12, 16))
+    x = np.arange(16)
+    y = np.arange(12)
+
+    expected_dict = generate_structure_functions_2d(u, v, x, y, ["LL"], boundary=None)
+    output_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL"], boundary=None, uncertainty=True
+    )
+
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value, atol=1e-12)
+    variance = [np.var((u[:, s:] - u[:, :-s]) ** 2, ddof=1) for s in range(1, 15)]
+    np.testing.assert_allclose(output_dict["SF_LL_x_variance"][1:], variance)
+    counts = 12 * (16 - np.arange(1, 15))
+    assert np.all(output_dict["SF_LL_x_ess"][1:] <= counts)
+    assert np.all(output_dict["SF_LL_x_ess"][1:] >= 1)
+    np.testing.assert_allclose(
+        output_dict["SF_LL_x_stderr"],
+        np.sqrt(
+            output_dict["SF_LL_x_variance"] / np.maximum(output_dict["SF_LL_x_ess"], 1)
+        ),
+    )
+
+    with pytest.raises(ValueError):
+        generate_structure_functions_2d(
+            u, v, x, y, ["LL"], engine="fft", uncertainty=True
+        )
+
+
+def test_generate_structure_functions_2d_uncertainty_binned():
+    """Test that binned effective sample sizes are summed over each bin."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 12, 16))
+    x = np.arange(16)
+    y = np.arange(12)
+
+    expected_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL"], boundary=None, uncertainty=True
+    )
+    output_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL"], boundary=None, uncertainty=True, nbins=5
+    )
+
+    _, ess = bin_data(expected_dict["x-diffs"], expected_dict["SF_LL_x_ess"], 5, "sum")
+    _, variance = bin_data(
+        expected_dict["x-diffs"], expected_dict["SF_LL_x_variance"], 5
+    )
+    np.testing.assert_allclose(output_dict["SF_LL_x_ess"], ess)
+    np.testing.assert_allclose(output_dict["SF_LL_x_variance"], variance)
+    np.testing.assert_allclose(output_dict["SF_LL_x_stderr"], np.sqrt(variance / ess))
+
+
+@pytest.mark.parametrize("nbins", [None, 5])
+def test_generate_structure_functions_2d_bootstrap_tiles(nbins):
+    """Test that the tile bootstrap brackets the structure functions."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 16, 16))
+    x = np.arange(16)
+    y = np.arange(16)
+
+    expected_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL", "TT"], nbins=nbins
+    )
+    output_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL", "TT"], nbins=nbins, bootstrap_tiles=4, seed=0
+    )
+
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value, atol=1e-12)
+    for key in ["SF_LL_x", "SF_LL_y", "SF_TT_x", "SF_TT_y"]:
+        assert output_dict[key + "_ci_low"].shape == expected_dict[key].shape
+        assert np.all(output_dict[key + "_ci_low"] <= output_dict[key + "_ci_high"])
+        assert np.all(output_dict[key + "_ci_low"][1:] < expected_dict[key][1:])
+        assert np.all(output_dict[key + "_ci_high"][1:] > expected_dict[key][1:])
+        assert np.all(output_dict[key + "_bootstrap_stderr"][1:] > 0)
+
+    repeat_dict = generate_structure_functions_2d(
+        u, v, x, y, ["LL", "TT"], nbins=nbins, bootstrap_tiles=4, seed=0
+    )
+    np.testing.assert_array_equal(
+        repeat_dict["SF_LL_x_ci_low"], output_dict["SF_LL_x_ci_low"]
+    )
+
+    with pytest.raises(ValueError):
+        generate_structure_functions_2d(
+            u, v, x, y, ["LL"], engine="fft", bootstrap_tiles=4
+        )
+    with pytest.raises(ValueError):
+        generate_structure_functions_2d(u, v, x, y, ["LL"], bootstrap_tiles=1)
+    with pytest.raises(ValueError):
+        generate_structure_functions_2d(u, v, x, y, ["LL"], bootstrap_tiles=(2, 17))
+
+
+@pytest.mark.parametrize("boundary", [None, "periodic-all"])
+def test_generate_structure_functions_2d_staggered(boundary):
+    """Test that C-grid velocities give the structure functions of the centers."""
+    rng = np.random.default_rng(0)
+    x = np.arange(8.0)
+    y = np.arange(6.0)
+    # Velocities on the west and south faces, linear across the faces
+    u = 2 * (x - 0.5) + rng.standard_normal((6, 1))
+    v = -(y - 0.5)[:, None] + rng.standard_normal(8)
+    scalar = rng.standard_normal((6, 8))
+    sf_type = ["ASF_V", "ASF_S", "LL", "TT", "LLL", "LSS"]
+
+    sf_staggered = generate_structure_functions_2d(
+        u, v, x, y, sf_type, scalar, boundary=boundary, staggered=True
+    )
+    u_centers = u + 1
+    v_centers = v - 0.5
+    if boundary is not None:
+        # The east face of the last column wraps around to the first column
+        u_centers[:, -1] = 0.5 * (u[:, -1] + u[:, 0])
+        v_centers[-1] = 0.5 * (v[-1] + v[0])
+    sf = generate_structure_functions_2d(
+        u_centers, v_centers, x, y, sf_type, scalar, boundary=boundary
+    )
+
+    for key in sf:
+        if "advection" in key and boundary is not None:
+            continue
+        np.testing.assert_allclose(sf_staggered[key], sf[key], atol=1e-12)
+
+
+def test_generate_structure_functions_2d_axes():
+    """Test that arrays ordered (x, y) give the same structure functions."""
+    rng = np.random.default_rng(0)
+    u, v, scalar = rng.standard_normal((3, 6, 8))
+    x = np.arange(8.0)
+    y = np.arange(6.0)
+    sf_type = ["ASF_V", "ASF_S", "LL", "TT", "LSS"]
+
+    sf = generate_structure_functions_2d(u, v, x, y, sf_type, scalar)
+    sf_transposed = generate_structure_functions_2d(
+        np.asfortranarray(u.T),
+        np.asfortranarray(v.T),
+        x,
+        y,
+        sf_type,
+        np.asfortranarray(scalar.T),
+        axes=(0, 1),
+    )
+    for key in sf:
+        np.testing.assert_allclose(sf_transposed[key], sf[key])
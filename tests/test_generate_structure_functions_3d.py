@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 from fluidsf.generate_structure_functions_3d import generate_structure_functions_3d
+from fluidsf.sf_checkpoint import SFCheckpoint
 
 
 @pytest.mark.parametrize(
@@ -168,3 +169,249 @@ def test_generate_structure_functions_3d_parameterized(
                 )
         else:
             raise AssertionError(f"Output dict does not contain key '{key}'.")
+
+
+def test_generate_structure_functions_3d_montecarlo():
+    """Test that the Monte Carlo estimator is reproducible and within errors."""
+    rng = np.random.default_rng(0)
+    u, v, w = rng.standard_normal((3, 8, 10, 12))
+    x = np.arange(12)
+    y = np.arange(10)
+    z = np.arange(8)
+
+    direct = generate_structure_functions_3d(u, v, w, x, y, z, ["LL", "TT"])
+    estimate = generate_structure_functions_3d(
+        u, v, w, x, y, z, ["LL", "TT"], estimator="montecarlo", rtol=0.05, seed=1
+    )
+    repeat = generate_structure_functions_3d(
+        u, v, w, x, y, z, ["LL", "TT"], estimator="montecarlo", rtol=0.05, seed=1
+    )
+
+    for key in direct:
+        np.testing.assert_array_equal(estimate[key], repeat[key])
+        if key.startswith("SF"):
+            error = np.abs(estimate[key] - direct[key])[1:]
+            assert np.all(error <= 6 * estimate[key + "_stderr"][1:])
+
+
+def test_generate_structure_functions_3d_fft_engine():
+    """Test that the FFT engine matches the direct engine."""
+    rng = np.random.default_rng(0)
+    u, v, w, scalar = rng.standard_normal((4, 4, 5, 6))
+    u[1, 2, 3] = np.nan
+    x = np.arange(6)
+    y = np.arange(5)
+    z = np.arange(4)
+    sf_type = ["ASF_V", "LL", "TT", "SS", "LTT"]
+
+    expected_dict = generate_structure_functions_3d(
+        u, v, w, x, y, z, sf_type, scalar, boundary=["periodic-x"]
+    )
+    output_dict = generate_structure_functions_3d(
+        u, v, w, x, y, z, sf_type, scalar, boundary=["periodic-x"], engine="fft"
+    )
+
+    assert output_dict.keys() == expected_dict.keys()
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value, atol=1e-12)
+
+
+def test_generate_structure_functions_3d_directions():
+    """Test that axis-aligned lattice directions match the x, y and z results."""
+    rng = np.random.default_rng(0)
+    u, v, w = rng.standard_normal((3, 4, 5, 6))
+    x = np.arange(6)
+    y = np.arange(5)
+    z = np.arange(4)
+
+    expected_dict = generate_structure_functions_3d(
+        u, v, w, x, y, z, ["LL", "TT"], boundary=None
+    )
+    output_dict = generate_structure_functions_3d(
+        u,
+        v,
+        w,
+        x,
+        y,
+        z,
+        ["LL", "TT"],
+        boundary=None,
+        directions=[(1, 0, 0), (0, 0, 1), (1, 1, 1)],
+    )
+    for key in ["SF_LL", "SF_TT"]:
+        np.testing.assert_allclose(
+            output_dict[key + "_1_0_0"], expected_dict[key + "_x"]
+        )
+        np.testing.assert_allclose(
+            output_dict[key + "_0_0_1"], expected_dict[key + "_z"]
+        )
+    np.testing.assert_allclose(output_dict["1_1_1-diffs"], np.sqrt(3) * np.arange(3))
+
+
+def test_generate_structure_functions_3d_uncertainty():
+    """Test that the uncertainty option keeps the structure functions unchanged."""
+    rng = np.random.default_rng(0)
+    u, v, w = rng.standard_normal((3, 4, 5, 6))
+    x = np.arange(6)
+    y = np.arange(5)
+    z = np.arange(4)
+
+    expected_dict = generate_structure_functions_3d(u, v, w, x, y, z, ["LL", "TT"])
+    output_dict = generate_structure_functions_3d(
+        u, v, w, x, y, z, ["LL", "TT"], uncertainty=True
+    )
+
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value, atol=1e-12)
+    for key in ["SF_LL_x", "SF_TT_y", "SF_LL_z"]:
+        assert np.all(output_dict[key + "_variance"][1:] > 0)
+        assert np.all(output_dict[key + "_ess"][1:] >= 1)
+
+
+@pytest.mark.parametrize("estimator, engine", [("direct", "direct"), ("direct", "fft")])
+def test_generate_structure_functions_3d_checkpoint(
+    tmp_path, monkeypatch, estimator, engine
+):
+    """Test that an interrupted calculation resumes from its checkpoint."""
+    rng = np.random.default_rng(0)
+    u, v, w = rng.standard_normal((3, 6, 8, 10))
+    x = np.arange(10)
+    y = np.arange(8)
+    z = np.arange(6)
+    kwargs = {
+        "sf_type": ["LL", "TT"],
+        "boundary": None,
+        "estimator": estimator,
+        "engine": engine,
+        "directions": [(1, 1, 0)],
+    }
+    expected_dict = generate_structure_functions_3d(u, v, w, x, y, z, **kwargs)
+
+    # Interrupt the calculation along the y-direction
+    calls = []
+    interrupt = [True]
+    original_update = SFCheckpoint.update
+
+    def interrupted_update(self):
+        calls.append(1)
+        if interrupt[0] and len(calls) == 12:
+            raise RuntimeError("Preempted")
+        original_update(self)
+
+    monkeypatch.setattr(SFCheckpoint, "update", interrupted_update)
+    checkpoint = tmp_path / "checkpoint.npz"
+    with pytest.raises(RuntimeError):
+        generate_structure_functions_3d(
+            u, v, w, x, y, z, checkpoint=checkpoint, checkpoint_interval=0, **kwargs
+        )
+    assert checkpoint.exists()
+
+    # The resumed calculation only updates the remaining separations
+    calls.clear()
+    interrupt[0] = False
+    output_dict = generate_structure_functions_3d(
+        u, v, w, x, y, z, checkpoint=checkpoint, checkpoint_interval=0, **kwargs
+    )
+    n_separations = sum(len(expected_dict[d + "-diffs"]) - 1 for d in "xyz")
+    n_separations += len(expected_dict["1_1_0-diffs"]) - 1
+    assert len(calls) == n_separations - 11
+    assert not checkpoint.exists()
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value)
+
+    # A checkpoint of different data is not resumed
+    monkeypatch.setattr(SFCheckpoint, "update", original_update)
+    np.savez(checkpoint, digest=np.array("0"))
+    with pytest.raises(ValueError):
+        generate_structure_functions_3d(u, v, w, x, y, z, checkpoint=checkpoint)
+
+
+def test_generate_structure_functions_3d_checkpoint_montecarlo(tmp_path, monkeypatch):
+    """Test that a resumed seeded Monte Carlo run matches an uninterrupted one."""
+    rng = np.random.default_rng(0)
+    u, v, w = rng.standard_normal((3, 6, 8, 10))
+    x = np.arange(10)
+    y = np.arange(8)
+    z = np.arange(6)
+    kwargs = {
+        "sf_type": ["LL"],
+        "boundary": None,
+        "estimator": "montecarlo",
+        "max_samples": 64,
+        "seed": 3,
+    }
+    expected_dict = generate_structure_functions_3d(u, v, w, x, y, z, **kwargs)
+
+    calls = []
+    original_update = SFCheckpoint.update
+
+    def interrupted_update(self):
+        calls.append(1)
+        if len(calls) == 5:
+            raise RuntimeError("Preempted")
+        original_update(self)
+
+    monkeypatch.setattr(SFCheckpoint, "update", interrupted_update)
+    checkpoint = tmp_path / "checkpoint.npz"
+    with pytest.raises(RuntimeError):
+        generate_structure_functions_3d(
+            u, v, w, x, y, z, checkpoint=checkpoint, checkpoint_interval=0, **kwargs
+        )
+    monkeypatch.setattr(SFCheckpoint, "update", original_update)
+    output_dict = generate_structure_functions_3d(
+        u, v, w, x, y, z, checkpoint=checkpoint, checkpoint_interval=0, **kwargs
+    )
+    for key, value in expected_dict.items():
+        np.testing.assert_array_equal(output_dict[key], value)
+
+    # A checkpoint written with different staggering is not resumed
+    monkeypatch.setattr(SFCheckpoint, "update", interrupted_update)
+    calls.clear()
+    with pytest.raises(RuntimeError):
+        generate_structure_functions_3d(
+            u, v, w, x, y, z, checkpoint=checkpoint, checkpoint_interval=0, **kwargs
+        )
+    monkeypatch.setattr(SFCheckpoint, "update", original_update)
+    with pytest.raises(ValueError, match="different inputs"):
+        generate_structure_functions_3d(
+            u, v, w, x, y, z, checkpoint=checkpoint, staggered=True, **kwargs
+        )
+
+
+def test_generate_structure_functions_3d_staggered():
+    """Test that C-grid velocities give the structure functions of the centers."""
+    rng = np.random.default_rng(0)
+    x = np.arange(6.0)
+    y = np.arange(5.0)
+    z = np.arange(4.0)
+    # Velocities on the lower faces, linear across the faces
+    u = 2 * (x - 0.5) + rng.standard_normal((4, 5, 1))
+    v = -(y - 0.5)[:, None] + rng.standard_normal((4, 1, 6))
+    w = 0.5 * (z - 0.5)[:, None, None] + rng.standard_normal((5, 6))
+    sf_type = ["ASF_V", "LL", "TT", "LLL"]
+
+    sf_staggered = generate_structure_functions_3d(
+        u, v, w, x, y, z, sf_type, boundary=None, staggered=True
+    )
+    sf = generate_structure_functions_3d(
+        u + 1, v - 0.5, w + 0.25, x, y, z, sf_type, boundary=None
+    )
+    for key in sf:
+        np.testing.assert_allclose(sf_staggered[key], sf[key], atol=1e-12)
+
+
+def test_generate_structure_functions_3d_axes():
+    """Test that arrays ordered (x, y, z) give the same structure functions."""
+    rng = np.random.default_rng(0)
+    u, v, w = rng.standard_normal((3, 4, 5, 6))
+    x = np.arange(6.0)
+    y = np.arange(5.0)
+    z = np.arange(4.0)
+    sf_type = ["ASF_V", "LL", "TT", "LLL"]
+
+    sf = generate_structure_functions_3d(u, v, w, x, y, z, sf_type)
+    sf_transposed = generate_structure_functions_3d(
+        u.T, v.T, w.T, x, y, z, sf_type, axes=(0, 1, 2)
+    )
+    for key in sf:
+        np.testing.assert_allclose(sf_transposed[key], sf[key])
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from fluidsf.generate_structure_functions_2d import generate_structure_functions_2d
+from fluidsf.generate_structure_functions_3d import generate_structure_functions_3d
+from fluidsf.generate_structure_functions_xarray import (
+    generate_structure_functions_xarray,
+)
+
+xr = pytest.importorskip("xarray")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"sf_type": ["LL", "TT"]},
+        {"sf_type": ["LL"], "nbins": 5},
+        {"sf_type": ["ASF_V", "LLL"], "boundary": None},
+        {"sf_type": ["LL"], "directions": [(1, 1)], "uncertainty": True},
+    ],
+)
+def test_generate_structure_functions_xarray_2d(kwargs):
+    """Test that the xarray wrapper matches the 2D generator for every time."""
+    rng = np.random.default_rng(0)
+    x = np.arange(16) * 2.0
+    y = np.arange(12) * 0.5
+    u, v = (
+        xr.DataArray(
+            rng.standard_normal((3, 12, 16)),
+            dims=("time", "y", "x"),
+            coords={"time": [0, 1, 2], "x": x, "y": y},
+        )
+        for _ in range(2)
+    )
+
+    output = generate_structure_functions_xarray(u, v, **kwargs)
+
+    assert output.sizes["time"] == 3
+    for time in range(3):
+        expected_dict = generate_structure_functions_2d(
+            u[time].values, v[time].values, x, y, **kwargs
+        )
+        for key, value in expected_dict.items():
+            if key.endswith("-diffs"):
+                name = key.removesuffix("-diffs") + "_separation"
+                np.testing.assert_allclose(output[name], value)
+            else:
+                np.testing.assert_allclose(output[key][time], value)
+
+
+def test_generate_structure_functions_xarray_dims():
+    """Test 1D and 3D structure functions and dimensions in any order."""
+    rng = np.random.default_rng(0)
+    u, v, w = rng.standard_normal((3, 4, 6, 8, 2))
+    x = np.arange(4) * 3.0
+    data = [
+        xr.DataArray(values, dims=("x", "y", "z", "member"), coords={"x": x})
+        for values in (u, v, w)
+    ]
+
+    output = generate_structure_functions_xarray(
+        *data, dims=("x", "y", "z"), sf_type=["LL"], boundary=None
+    )
+    expected_dict = generate_structure_functions_3d(
+        u[..., 1].T,
+        v[..., 1].T,
+        w[..., 1].T,
+        x,
+        np.arange(6),
+        np.arange(8),
+        ["LL"],
+        boundary=None,
+    )
+    for key in ["SF_LL_x", "SF_LL_y", "SF_LL_z"]:
+        np.testing.assert_allclose(output[key].sel(member=1), expected_dict[key])
+    np.testing.assert_allclose(output["x_separation"], expected_dict["x-diffs"])
+
+    output = generate_structure_functions_xarray(
+        data[0], dims=("x",), sf_type=["LL"], boundary=None
+    )
+    assert output["SF_LL"].dims == ("y", "z", "member", "x_separation")
+
+    with pytest.raises(ValueError):
+        generate_structure_functions_xarray(data[0], dims=("x", "y"))
+    with pytest.raises(ValueError):
+        generate_structure_functions_xarray(data[0], data[1], dims=("x", "time"))
+
+
+def test_generate_structure_functions_xarray_dask():
+    """Test that dask arrays are calculated lazily and match numpy arrays."""
+    pytest.importorskip("dask")
+    rng = np.random.default_rng(0)
+    u, v = (
+        xr.DataArray(rng.standard_normal((4, 10, 10)), dims=("time", "y", "x"))
+        for _ in range(2)
+    )
+
+    expected = generate_structure_functions_xarray(u, v, sf_type=["LL"])
+    output = generate_structure_functions_xarray(
+        u.chunk(time=1), v.chunk(time=1), sf_type=["LL"]
+    )
+
+    assert output["SF_LL_x"].chunks is not None
+    xr.testing.assert_allclose(output.compute(), expected)
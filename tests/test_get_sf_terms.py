@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from fluidsf.get_sf_terms import get_sf_terms
+
+
+@pytest.mark.parametrize(
+    "sf_type, direction, expected_terms",
+    [
+        # Test 1: x direction in 2D
+        (
+            ["LL", "LTT"],
+            (1, 0),
+            {
+                "SF_LL": [(1.0, ((("u", 1.0),), (("u", 1.0),)))],
+                "SF_TT": [(1.0, ((("v", 1.0),), (("v", 1.0),)))],
+                "SF_LTT": [(1.0, ((("u", 1.0),), (("v", 1.0),), (("v", 1.0),)))],
+            },
+        ),
+        # Test 2: y direction in 2D, transverse increment is -u
+        (
+            ["TT"],
+            (0, 2),
+            {"SF_TT": [(1.0, ((("u", -1.0),), (("u", -1.0),)))]},
+        ),
+        # Test 3: advective structure functions in 3D
+        (
+            ["ASF_V", "ASF_S"],
+            (0, 0, 1),
+            {
+                "SF_advection_velocity": [
+                    (1.0, ((("adv_x", 1.0),), (("u", 1.0),))),
+                    (1.0, ((("adv_y", 1.0),), (("v", 1.0),))),
+                    (1.0, ((("adv_z", 1.0),), (("w", 1.0),))),
+                ],
+                "SF_advection_scalar": [
+                    (1.0, ((("adv_scalar", 1.0),), (("scalar", 1.0),)))
+                ],
+            },
+        ),
+        # Test 4: zero direction raises ValueError
+        (["LL"], (0, 0), ValueError),
+    ],
+)
+def test_get_sf_terms(sf_type, direction, expected_terms):
+    """Test that get_sf_terms produces the expected terms."""
+    if expected_terms is ValueError:
+        with pytest.raises(ValueError):
+            get_sf_terms(sf_type, direction)
+    else:
+        assert get_sf_terms(sf_type, direction) == expected_terms
+
+
+def test_get_sf_terms_3d_transverse():
+    """Test that 3D transverse terms use an orthonormal transverse basis."""
+    assert get_sf_terms(["TT"], (1, 0, 0))["SF_TT"] == [
+        (1.0, ((("w", 1.0),), (("w", 1.0),))),
+        (1.0, ((("v", -1.0),), (("v", -1.0),))),
+    ]
+
+    terms = get_sf_terms(["TT"], (1, 1, 1))["SF_TT"]
+    weights = np.array(
+        [[dict(t[1][0]).get(f, 0) for f in ["u", "v", "w"]] for t in terms]
+    )
+    np.testing.assert_allclose(weights @ np.ones(3), 0, atol=1e-12)
+    np.testing.assert_allclose(weights @ weights.T, np.eye(2), atol=1e-12)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from fluidsf.hash_inputs import hash_inputs
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        (np.arange(4.0), np.arange(4)),
+        (np.arange(4.0), np.arange(4.0).reshape(2, 2)),
+        (np.arange(4.0), np.arange(1.0, 5.0)),
+        ([1, 2], (1, 2)),
+        ({"a": 1, "b": 2}, {"a": 1, "b": 3}),
+        ("LL", ["LL"]),
+    ],
+)
+def test_hash_inputs_differ(first, second):
+    """Test that different inputs have different hashes."""
+    assert hash_inputs(first) != hash_inputs(second)
+
+
+def test_hash_inputs_equal():
+    """Test that equal inputs have equal hashes, independent of layout."""
+    u = np.arange(12.0).reshape(3, 4)
+    assert hash_inputs(u, {"b": 2, "a": [1]}) == hash_inputs(
+        np.asfortranarray(u), {"a": [1], "b": 2}
+    )
+    assert hash_inputs(u, 1) != hash_inputs(1, u)
+    assert len(hash_inputs(u)) == 40
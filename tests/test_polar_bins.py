@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from fluidsf.polar_bins import polar_bins
+
+
+@pytest.mark.parametrize(
+    "nbins, nangles, expected_radial, expected_angular",
+    [
+        # Test 1: distance bins only, zero separation excluded
+        (2, None, [-1, 0, 0, 1], [0, 0, 0, 0]),
+        # Test 2: distance bins and two sectors
+        (2, 2, [-1, 0, 0, 1], [1, 1, 0, 1]),
+        # Test 3: bin edges
+        (np.array([0.5, 1.5]), 2, [-1, 0, 0, -1], [1, 1, 0, 1]),
+    ],
+)
+def test_polar_bins(nbins, nangles, expected_radial, expected_angular):
+    """Test that map entries are assigned to distance bins and sectors."""
+    distances = np.array([[0.0, 1.0], [1.0, 2.0]])
+    angles = np.array([[0.0, 0.1], [-0.1, 0.2]])
+    bins = polar_bins(distances, angles, nbins, nangles)
+    np.testing.assert_array_equal(bins["radial_index"], expected_radial)
+    np.testing.assert_array_equal(bins["angular_index"], expected_angular)
+    assert bins["shape"] == (2, 2)
+    assert bins["nangles"] == nangles
+
+    with pytest.raises(ValueError):
+        polar_bins(distances, angles, nbins, 0)
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+from fluidsf.prefetch_snapshots import prefetch_snapshots
+from fluidsf.sf_plan import SFPlan
+
+
+def test_prefetch_snapshots():
+    """Test that snapshots are read ahead in order, at most prefetch at a time."""
+    read_ahead = []
+    processed = []
+    lock = threading.Lock()
+
+    def read(index):
+        with lock:
+            read_ahead.append(index - len(processed))
+        return np.full(3, index)
+
+    for index, snapshot in enumerate(prefetch_snapshots(range(10), 2, read)):
+        time.sleep(0.01)
+        np.testing.assert_array_equal(snapshot, index)
+        with lock:
+            processed.append(index)
+
+    assert processed == list(range(10))
+    # Snapshots are read at most two ahead of the one being processed
+    assert max(read_ahead) <= 3
+
+
+def test_prefetch_snapshots_default_read():
+    """Test that array-likes in tuples and dictionaries are read into arrays."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 4, 8, 8))
+    x = np.arange(8)
+    plan = SFPlan(x, x, sf_type=["LL"])
+
+    sfs = [
+        plan.execute(u_snapshot, v_snapshot)
+        for u_snapshot, v_snapshot in prefetch_snapshots(
+            (u[d].tolist(), v[d].tolist()) for d in range(4)
+        )
+    ]
+    for d, sf in enumerate(sfs):
+        np.testing.assert_allclose(sf["SF_LL_x"], plan.execute(u[d], v[d])["SF_LL_x"])
+
+    snapshot = next(iter(prefetch_snapshots([{"u": [1, 2]}])))
+    assert isinstance(snapshot["u"], np.ndarray)
+
+
+def test_prefetch_snapshots_errors():
+    """Test that read errors are raised and early exits stop the reader."""
+
+    def read(index):
+        if index == 3:
+            raise OSError("Unreadable snapshot")
+        return index
+
+    snapshots = prefetch_snapshots(range(5), 1, read)
+    assert [next(snapshots) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(OSError):
+        next(snapshots)
+
+    n_threads = threading.active_count()
+    snapshots = prefetch_snapshots(range(1000), 2, lambda index: index)
+    assert next(snapshots) == 0
+    snapshots.close()
+    assert threading.active_count() == n_threads
+
+    with pytest.raises(ValueError):
+        next(prefetch_snapshots(range(3), 0))
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from fluidsf.generate_structure_functions_2d import generate_structure_functions_2d
+from fluidsf.read_mds import read_mds
+
+
+def write_mds(path, data, names=None, precision="float32", dim_list=None):
+    """Write an array like MITgcm, with a .meta file and a big-endian .data file."""
+    shape = data.shape[1:] if names is not None else data.shape
+    if dim_list is None:
+        dim_list = [value for size in reversed(shape) for value in (size, 1, size)]
+    meta = [
+        f" nDims = [ {len(shape)} ];",
+        " dimList = [",
+        ",\n".join(
+            ", ".join(f"{value:5d}" for value in dim_list[i : i + 3])
+            for i in range(0, len(dim_list), 3)
+        ),
+        " ];",
+        f" dataprec = [ '{precision}' ];",
+        f" nrecords = [ {len(names) if names is not None else 1} ];",
+        " timeStepNumber = [ 100 ];",
+    ]
+    if names is not None:
+        meta.append(" fldList = {")
+        meta.append(" ".join(f"'{name:<8}'" for name in names))
+        meta.append(" };")
+    path.with_name(path.name + ".meta").write_text("\n".join(meta) + "\n")
+    dtype = ">f4" if precision == "float32" else ">f8"
+    data.astype(dtype).tofile(path.with_name(path.name + ".data"))
+
+
+@pytest.mark.parametrize(
+    "shape, precision",
+    [
+        ((8, 10), "float32"),
+        ((3, 8, 10), "float64"),
+    ],
+)
+def test_read_mds(tmp_path, shape, precision):
+    """Test that MDS files are read as memory maps with the shape of the file."""
+    rng = np.random.default_rng(0)
+    u, v, theta = rng.standard_normal((3, *shape))
+    write_mds(
+        tmp_path / "diags.0000000100",
+        np.stack([u, v, theta]),
+        names=["UVEL", "VVEL", "THETA"],
+        precision=precision,
+    )
+
+    arrays, locations = read_mds(tmp_path / "diags", iteration=100)
+    assert list(arrays) == ["UVEL", "VVEL", "THETA"]
+    assert locations == {"UVEL": "u", "VVEL": "v", "THETA": "center"}
+    for array, expected in zip(arrays.values(), [u, v, theta], strict=True):
+        assert isinstance(array, np.memmap)
+        assert array.shape == shape
+        assert array.dtype.byteorder == ">"
+        np.testing.assert_allclose(array, expected, rtol=1e-6)
+
+    arrays, locations = read_mds(
+        tmp_path / "diags.0000000100.data", fields=["VVEL"], locations={"VVEL": "u"}
+    )
+    assert list(arrays) == ["VVEL"]
+    assert locations == {"VVEL": "u"}
+
+
+def test_read_mds_generator(tmp_path):
+    """Test that memory-mapped fields give the same structure functions."""
+    rng = np.random.default_rng(1)
+    u, v = rng.standard_normal((2, 8, 10))
+    write_mds(tmp_path / "U.0000000000", u)
+    write_mds(tmp_path / "V.0000000000", v)
+    x = np.arange(10.0)
+    y = np.arange(8.0)
+
+    arrays, locations = read_mds(tmp_path / "U", iteration=0)
+    u_mds = arrays["U"]
+    v_mds = read_mds(tmp_path / "V", iteration=0)[0]["V"]
+    assert locations == {"U": "u"}
+
+    sf_mds = generate_structure_functions_2d(u_mds, v_mds, x, y, sf_type=["LL"])
+    sf = generate_structure_functions_2d(
+        u.astype(np.float32), v.astype(np.float32), x, y, sf_type=["LL"]
+    )
+    for key in sf:
+        np.testing.assert_allclose(sf_mds[key], sf[key], rtol=1e-6)
+
+
+def test_read_mds_errors(tmp_path):
+    """Test that tiles, unknown fields and byte orders raise errors."""
+    data = np.zeros((4, 5))
+    write_mds(tmp_path / "T", data, dim_list=[10, 1, 5, 8, 1, 4])
+    with pytest.raises(ValueError):
+        read_mds(tmp_path / "T")
+
+    write_mds(tmp_path / "S", data)
+    with pytest.raises(ValueError):
+        read_mds(tmp_path / "S", fields=["THETA"])
+    with pytest.raises(ValueError):
+        read_mds(tmp_path / "S", byteorder="=")
+    assert read_mds(tmp_path / "S", byteorder="<")[0]["S"].dtype == "<f4"
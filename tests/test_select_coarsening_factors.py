@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from fluidsf.select_coarsening_factors import select_coarsening_factors
+
+
+@pytest.mark.parametrize(
+    "separations, native_lags, length, periodic, expected_lags, expected_factors",
+    [
+        # Test 1: bands double in length and coarsening factor
+        (
+            np.arange(1, 32),
+            4,
+            64,
+            True,
+            np.array([1, 2, 3, 4, 6, 8, 12, 16, 24]),
+            np.array([1, 1, 1, 1, 2, 2, 4, 4, 8]),
+        ),
+        # Test 2: separations are rounded to multiples of their factor
+        (np.array([3, 9, 13]), 4, 64, False, np.array([3, 8, 12]), np.array([1, 4, 4])),
+        # Test 3: separations that do not fit the coarsened grid are dropped
+        (np.array([1, 10]), 2, 20, True, np.array([1]), np.array([1])),
+    ],
+)
+def test_select_coarsening_factors(
+    separations, native_lags, length, periodic, expected_lags, expected_factors
+):
+    """Test that select_coarsening_factors assigns the expected factors."""
+    lags, factors = select_coarsening_factors(
+        separations, native_lags, length, periodic
+    )
+    np.testing.assert_array_equal(lags, expected_lags)
+    np.testing.assert_array_equal(factors, expected_factors)
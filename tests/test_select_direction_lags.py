@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from fluidsf.select_direction_lags import select_direction_lags
+
+
+@pytest.mark.parametrize(
+    "direction, lengths, periodic, separations, expected_output",
+    [
+        # Test 1: axis-aligned direction matches select_separations
+        ((1, 0), (8, 6), (False, False), None, np.arange(1, 7)),
+        # Test 2: diagonal direction is limited by the shorter axis
+        ((1, 1), (8, 6), (False, False), None, np.arange(1, 5)),
+        # Test 3: longer lattice vectors take fewer lags
+        ((2, -1), (8, 6), (False, False), None, np.arange(1, 4)),
+        # Test 4: periodic axes are limited to half the number of points
+        ((1, 1), (8, 6), (True, True), None, np.arange(1, 3)),
+        # Test 5: explicit lags are clipped
+        ((1, 1, 1), (8, 8, 8), (False, False, False), np.array([2, 6, 9]), [2, 6]),
+        # Test 6: zero vector raises ValueError
+        ((0, 0), (8, 6), (False, False), None, ValueError),
+        # Test 7: non-integer components raise ValueError
+        ((1.5, 1), (8, 6), (False, False), None, ValueError),
+        # Test 8: wrong number of components raises ValueError
+        ((1, 1, 1), (8, 6), (False, False), None, ValueError),
+    ],
+)
+def test_select_direction_lags(
+    direction, lengths, periodic, separations, expected_output
+):
+    """Test that select_direction_lags works correctly for multiple cases."""
+    if expected_output is ValueError:
+        with pytest.raises(ValueError):
+            select_direction_lags(direction, lengths, periodic, separations)
+    else:
+        np.testing.assert_array_equal(
+            select_direction_lags(direction, lengths, periodic, separations),
+            expected_output,
+        )
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from fluidsf.select_separations import select_separations
+
+
+@pytest.mark.parametrize(
+    "max_shift, separations, expected_output",
+    [
+        # Test 1: default returns every lag
+        (5, None, np.array([1, 2, 3, 4])),
+        # Test 2: explicit lags are sorted, deduplicated and clipped
+        (5, np.array([4, 2, 2, 8]), np.array([2, 4])),
+        # Test 3: log-spaced lags
+        (1025, ("log", 11), 2 ** np.arange(11)),
+        # Test 4: log-spaced lags collapse duplicates at small separations
+        (5, ("log", 10), np.array([1, 2, 3, 4])),
+        # Test 5: unknown spacing raises ValueError
+        (5, ("linear", 3), ValueError),
+        # Test 6: non-positive lags raise ValueError
+        (5, np.array([0, 1]), ValueError),
+        # Test 7: non-integer lags raise ValueError
+        (5, np.array([1.5, 2]), ValueError),
+        # Test 8: tuples of two lags are explicit lags
+        (10, (4, 8), np.array([4, 8])),
+    ],
+)
+def test_select_separations(max_shift, separations, expected_output):
+    """Test that select_separations works correctly for multiple cases."""
+    if expected_output is ValueError:
+        with pytest.raises(ValueError):
+            select_separations(max_shift, separations)
+    else:
+        np.testing.assert_array_equal(
+            select_separations(max_shift, separations), expected_output
+        )
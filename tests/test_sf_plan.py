@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from fluidsf.generate_structure_functions_2d import generate_structure_functions_2d
+from fluidsf.generate_structure_functions_3d import generate_structure_functions_3d
+from fluidsf.sf_plan import SFPlan
+
+SF_TYPES = ["ASF_V", "ASF_S", "LL", "TT", "SS", "LLL", "LTT", "LSS"]
+
+
+@pytest.mark.parametrize(
+    "boundary, nbins, separations, engine",
+    [
+        ("periodic-all", None, None, "direct"),
+        ("periodic-x", 4, None, "direct"),
+        ("periodic-y", None, ("log", 4), "direct"),
+        (None, 4, None, "direct"),
+        ("periodic-x", None, None, "fft"),
+        (None, 4, ("log", 4), "fft"),
+        ("periodic-y", None, None, "moments"),
+    ],
+)
+def test_sf_plan_2d(boundary, nbins, separations, engine):
+    """Test that SFPlan.execute matches generate_structure_functions_2d."""
+    rng = np.random.default_rng(0)
+    x = 0.5 * np.arange(10)
+    y = np.arange(8)
+    plan = SFPlan(
+        x,
+        y,
+        sf_type=SF_TYPES,
+        boundary=boundary,
+        nbins=nbins,
+        separations=separations,
+        engine=engine,
+    )
+
+    for _ in range(2):
+        u, v, scalar = rng.standard_normal((3, 8, 10))
+        u[2, 3] = np.nan
+        output_dict = plan.execute(u, v, scalar=scalar)
+        expected_dict = generate_structure_functions_2d(
+            u,
+            v,
+            x,
+            y,
+            SF_TYPES,
+            scalar,
+            boundary=boundary,
+            nbins=nbins,
+            separations=separations,
+        )
+
+        assert output_dict.keys() == expected_dict.keys()
+        for key, value in expected_dict.items():
+            np.testing.assert_allclose(output_dict[key], value)
+
+
+@pytest.mark.parametrize("boundary", [["periodic-all"], ["periodic-z"], None])
+def test_sf_plan_3d(boundary):
+    """Test that SFPlan.execute matches generate_structure_functions_3d."""
+    rng = np.random.default_rng(1)
+    x = np.arange(6)
+    y = np.arange(5)
+    z = np.arange(4)
+    u, v, w, scalar = rng.standard_normal((4, 4, 5, 6))
+    plan = SFPlan(x, y, z, sf_type=SF_TYPES, boundary=boundary, max_separation=2)
+
+    output_dict = plan.execute(u, v, w, scalar)
+    expected_dict = generate_structure_functions_3d(
+        u, v, w, x, y, z, SF_TYPES, scalar, boundary=boundary, max_separation=2
+    )
+
+    assert output_dict.keys() == expected_dict.keys()
+    for key, value in expected_dict.items():
+        np.testing.assert_allclose(output_dict[key], value)
+
+
+@pytest.mark.parametrize(
+    "plan_kwargs, execute_args",
+    [
+        # Test 1: unknown engine
+        ({"engine": "spectral"}, None),
+        # Test 2: unknown boundary
+        ({"boundary": "periodic-z"}, None),
+        # Test 3: snapshot with the wrong shape
+        ({}, (np.zeros((3, 3)), np.zeros((3, 3)))),
+        # Test 4: missing scalar
+        ({"sf_type": ["SS"]}, (np.zeros((4, 5)), np.zeros((4, 5)))),
+    ],
+)
+def test_sf_plan_errors(plan_kwargs, execute_args):
+    """Test that SFPlan raises ValueError for invalid input."""
+    with pytest.raises(ValueError):
+        plan = SFPlan(np.arange(5), np.arange(4), **plan_kwargs)
+        plan.execute(*execute_args)
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from fluidsf.generate_structure_functions_1d import generate_structure_functions_1d
+from fluidsf.generate_structure_functions_1d_batch import (
+    generate_structure_functions_1d_batch,
+)
+from fluidsf.generate_structure_functions_2d import generate_structure_functions_2d
+from fluidsf.sf_result import SFResult
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"sf_type": ["LL", "TT", "LLL"]},
+        {"sf_type": ["LL"], "boundary": None, "directions": [(1, 1), (1, -1)]},
+        {"sf_type": ["LL", "ASF_V"], "uncertainty": True},
+        {"sf_type": ["LL"], "estimator": "multiresolution", "native_lags": 2},
+    ],
+)
+def test_sf_result_2d(kwargs):
+    """Test that SFResult stores, bins and returns the generator output."""
+    rng = np.random.default_rng(0)
+    u, v = rng.standard_normal((2, 16, 20))
+    u[3, 4] = np.nan
+    x = np.arange(20) * 0.5
+    y = np.arange(16)
+
+    output_dict = generate_structure_functions_2d(u, v, x, y, **kwargs)
+    result = SFResult.from_dict(output_dict)
+
+    assert list(result) == list(result.to_dict())
+    assert set(result) == set(output_dict)
+    for key, value in output_dict.items():
+        np.testing.assert_array_equal(result[key], value)
+    assert np.shares_memory(result[next(iter(output_dict))], result.values["x"])
+
+    binned_dict = generate_structure_functions_2d(u, v, x, y, nbins=5, **kwargs)
+    binned = result.binned(5)
+    for key in ["SF_LL_x", "SF_LL_y", "x-diffs", "y-diffs"]:
+        np.testing.assert_allclose(binned[key], binned_dict[key])
+    assert binned.get_counts("x").sum() == len(output_dict["x-diffs"])
+
+
+def test_sf_result_1d():
+    """Test SFResult with the output of the 1D generator."""
+    rng = np.random.default_rng(0)
+    u = rng.standard_normal(32)
+    output_dict = generate_structure_functions_1d(u, np.arange(32), ["LL", "LLL"])
+
+    result = SFResult.from_dict(output_dict, nbins=4)
+
+    expected_dict = generate_structure_functions_1d(
+        u, np.arange(32), ["LL", "LLL"], nbins=4
+    )
+    for key, value in expected_dict.items():
+        if value is not None:
+            np.testing.assert_allclose(result[key], value)
+    with pytest.raises(KeyError):
+        result["SF_TT"]
+
+
+def test_sf_result_counts():
+    """Test that from_dict stores the pair counts of the generator output."""
+    rng = np.random.default_rng(0)
+    u = [rng.standard_normal(n) for n in [32, 20, 9]]
+    x = [np.arange(n, dtype=float) for n in [32, 20, 9]]
+    output_dict = generate_structure_functions_1d_batch(u, x, sf_type=["LL"], pool=True)
+
+    result = SFResult.from_dict(output_dict, nbins=4)
+
+    assert "pair-counts" not in result
+    np.testing.assert_array_equal(
+        result.binned(None).get_counts("x"), output_dict["pair-counts"]
+    )
+    assert result.get_counts("x").sum() == output_dict["pair-counts"].sum()
+
+    counts = {"x": np.arange(len(output_dict["x-diffs"]))}
+    result = SFResult.from_dict(output_dict, counts=counts)
+    np.testing.assert_array_equal(result.get_counts("x"), counts["x"])
+    with pytest.raises(ValueError):
+        SFResult.from_dict(output_dict, counts={"x": np.ones(3)})
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".h5"])
+def test_sf_result_save_load(tmp_path, suffix):
+    """Test that saved containers load with the same arrays and binning."""
+    if suffix == ".h5":
+        pytest.importorskip("h5py")
+    rng = np.random.default_rng(0)
+    result = SFResult(
+        {"x": rng.standard_normal((2, 6)), "1_1": rng.standard_normal((1, 4))},
+        {"x": ["SF_LL_x", "SF_TT_x"], "1_1": ["SF_LL_1_1"]},
+        {"x": np.arange(6.0), "1_1": np.sqrt(2) * np.arange(4)},
+        counts={"x": np.arange(6.0), "1_1": np.ones(4)},
+        nbins=3,
+    )
+
+    result.save(tmp_path / ("result" + suffix))
+    loaded = SFResult.load(tmp_path / ("result" + suffix))
+
+    assert loaded.nbins == 3
+    assert loaded.keys_by_direction == result.keys_by_direction
+    for direction in result.values:
+        np.testing.assert_array_equal(
+            loaded.values[direction], result.values[direction]
+        )
+        np.testing.assert_array_equal(
+            loaded.get_counts(direction), result.get_counts(direction)
+        )
+    for key in result:
+        np.testing.assert_array_equal(loaded[key], result[key])
+
+
+def test_sf_result_errors():
+    """Test that inconsistent arrays raise errors."""
+    with pytest.raises(ValueError):
+        SFResult({"x": np.zeros((2, 3))}, {"x": ["SF_LL_x"]}, {"x": np.arange(3)})
+    with pytest.raises(ValueError):
+        SFResult({"x": np.zeros((1, 3))}, {"y": ["SF_LL_x"]}, {"x": np.arange(3)})
+    with pytest.raises(ValueError):
+        SFResult.from_dict({"SF_LL_x": np.zeros(3)})
+    with pytest.raises(ValueError):
+        SFResult.from_dict({"SF_LL_x": np.zeros(3), "x-diffs": np.arange(4)})
@@ -87,3 +87,18 @@ def test_shift_array_2d(
 
     np.testing.assert_allclose(shifted_left_array, expected_shifted_left_array)
     np.testing.assert_allclose(shifted_down_array, expected_shifted_down_array)
+
+
+@pytest.mark.parametrize("boundary", ["periodic-all", "periodic-x", None])
+def test_shift_array_2d_axes(boundary):
+    """Test that arrays ordered (x, y) are shifted in their own layout."""
+    input_array = np.arange(20.0).reshape(4, 5)
+    # Fortran-ordered (x, y) array with the same values as input_array
+    transposed = np.asfortranarray(input_array.T)
+
+    shifted = shift_array_2d(transposed, 2, 1, boundary, axes=(0, 1))
+    expected = shift_array_2d(input_array, 2, 1, boundary)
+    for shifted_array, expected_array in zip(shifted, expected, strict=True):
+        assert shifted_array.shape == (5, 4)
+        assert shifted_array.flags.f_contiguous
+        np.testing.assert_array_equal(shifted_array, expected_array.T)
@@ -750,3 +750,18 @@ def test_shift_array_3d(
     np.testing.assert_allclose(shifted_x_array, expected_shifted_x_array)
     np.testing.assert_allclose(shifted_y_array, expected_shifted_y_array)
     np.testing.assert_allclose(shifted_z_array, expected_shifted_z_array)
+
+
+@pytest.mark.parametrize("boundary", [["periodic-all"], ["periodic-y"], None])
+def test_shift_array_3d_axes(boundary):
+    """Test that arrays ordered (x, y, z) are shifted in their own layout."""
+    input_array = np.arange(60.0).reshape(3, 4, 5)
+    # Fortran-ordered (x, y, z) array with the same values as input_array
+    transposed = np.asfortranarray(input_array.T)
+
+    shifted = shift_array_3d(transposed, 2, 1, 1, boundary, axes=(0, 1, 2))
+    expected = shift_array_3d(input_array, 2, 1, 1, boundary)
+    for shifted_array, expected_array in zip(shifted, expected, strict=True):
+        assert shifted_array.shape == (5, 4, 3)
+        assert shifted_array.flags.f_contiguous
+        np.testing.assert_array_equal(shifted_array, expected_array.T)